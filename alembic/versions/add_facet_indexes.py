@@ -0,0 +1,34 @@
+"""Add composite indexes for the incident and member list filters
+
+Revision ID: add_facet_indexes
+Revises: add_fuzzy_date_sort_keys
+Create Date: 2026-02-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'add_facet_indexes'
+down_revision: Union[str, None] = 'add_fuzzy_date_sort_keys'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_incidents_type_date_year', 'incidents', ['type', 'date_year']),
+    ('ix_incident_participants_role_outcome', 'incident_participants', ['role', 'outcome', 'incident_id']),
+    ('ix_members_status_affiliation_type', 'members', ['status', 'affiliation_type']),
+]
+
+
+def upgrade() -> None:
+    # Databases created by the app's startup create_all may already have them
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
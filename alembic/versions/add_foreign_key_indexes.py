@@ -0,0 +1,42 @@
+"""Add indexes on foreign keys and association tables
+
+Revision ID: add_foreign_key_indexes
+Revises: add_fulltext_search
+Create Date: 2026-02-14
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'add_foreign_key_indexes'
+down_revision: Union[str, None] = 'add_fulltext_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_members_set_id', 'members', ['set_id']),
+    ('ix_members_alliance_id', 'members', ['alliance_id']),
+    ('ix_sets_alliance_id', 'sets', ['alliance_id']),
+    ('ix_incident_participants_incident_id_role', 'incident_participants', ['incident_id', 'role']),
+    ('ix_incident_participants_member_id_role', 'incident_participants', ['member_id', 'role']),
+    ('ix_set_allies_set_b_id', 'set_allies', ['set_b_id', 'set_a_id']),
+    ('ix_set_enemies_set_b_id', 'set_enemies', ['set_b_id', 'set_a_id']),
+    ('ix_member_sources_source_id', 'member_sources', ['source_id', 'member_id']),
+    ('ix_set_sources_source_id', 'set_sources', ['source_id', 'set_id']),
+    ('ix_alliance_sources_source_id', 'alliance_sources', ['source_id', 'alliance_id']),
+    ('ix_incident_sources_source_id', 'incident_sources', ['source_id', 'incident_id']),
+]
+
+
+def upgrade() -> None:
+    # Databases created by the app's startup create_all may already have them
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,36 @@
+"""Add full-text search index
+
+Revision ID: add_fulltext_search
+Revises: add_table_versions
+Create Date: 2026-02-14
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'add_fulltext_search'
+down_revision: Union[str, None] = 'add_table_versions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Shares its DDL with app startup, which creates the index if missing
+    from app.crud.fulltext import create_search_index
+    create_search_index(op.get_bind())
+
+
+def downgrade() -> None:
+    from app.crud.fulltext import SEARCH_COLUMNS
+    bind = op.get_bind()
+    for table in SEARCH_COLUMNS:
+        if bind.dialect.name == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
+        elif bind.dialect.name == 'postgresql':
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
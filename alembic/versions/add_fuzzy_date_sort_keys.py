@@ -0,0 +1,57 @@
+"""Add generated sort key and precision columns for FuzzyDates
+
+Revision ID: add_fuzzy_date_sort_keys
+Revises: add_table_version_timestamps
+Create Date: 2026-02-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'add_fuzzy_date_sort_keys'
+down_revision: Union[str, None] = 'add_table_version_timestamps'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, FuzzyDate column prefix)
+FUZZY_DATES = [
+    ('incidents', 'date'),
+    ('sources', 'date'),
+    ('sets', 'founded'),
+    ('alliances', 'founded'),
+    ('members', 'dob'),
+    ('members', 'dod'),
+    ('members', 'release'),
+]
+
+
+def _sort_key(prefix: str) -> sa.Computed:
+    return sa.Computed(f"{prefix}_year * 10000 + coalesce({prefix}_month, 0) * 100 + coalesce({prefix}_day, 0)")
+
+
+def _precision(prefix: str) -> sa.Computed:
+    return sa.Computed(
+        f"CASE WHEN {prefix}_day IS NOT NULL THEN 3 WHEN {prefix}_month IS NOT NULL THEN 2 "
+        f"WHEN {prefix}_year IS NOT NULL THEN 1 END"
+    )
+
+
+def upgrade() -> None:
+    # Generated columns: SQLite adds them as VIRTUAL, PostgreSQL as STORED, and
+    # both fill them for existing rows
+    for table, prefix in FUZZY_DATES:
+        op.add_column(table, sa.Column(f'{prefix}_sort', sa.Integer(), _sort_key(prefix), nullable=True))
+        op.add_column(table, sa.Column(f'{prefix}_precision', sa.Integer(), _precision(prefix), nullable=True))
+        op.create_index(f'ix_{table}_{prefix}_sort', table, [f'{prefix}_sort', 'id'])
+
+
+def downgrade() -> None:
+    for table, prefix in reversed(FUZZY_DATES):
+        op.drop_index(f'ix_{table}_{prefix}_sort', table_name=table)
+        # Plain DROP COLUMN (SQLite 3.35+): a batch rebuild cannot reflect the generated expressions
+        op.drop_column(table, f'{prefix}_precision')
+        op.drop_column(table, f'{prefix}_sort')
@@ -0,0 +1,47 @@
+"""Add incident_rollups table
+
+Revision ID: add_incident_rollups
+Revises: add_facet_indexes
+Create Date: 2026-02-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'add_incident_rollups'
+down_revision: Union[str, None] = 'add_facet_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('incident_rollups',
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('type', sa.Enum('SHOOTING', 'MURDER', 'STABBING', 'BEATING', 'OTHER', name='incidenttype'), nullable=False),
+    sa.Column('fatal', sa.Boolean(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('year', 'month', 'type', 'fatal')
+    )
+    # Backfill from existing incidents; year 0 and month 0 stand for unknown
+    op.execute("""
+        INSERT INTO incident_rollups (year, month, type, fatal, count)
+        SELECT COALESCE(i.date_year, 0),
+               CASE WHEN i.date_year IS NULL THEN 0 ELSE COALESCE(i.date_month, 0) END,
+               i.type,
+               f.incident_id IS NOT NULL,
+               COUNT(*)
+        FROM incidents i
+        LEFT JOIN (
+            SELECT DISTINCT incident_id FROM incident_participants
+            WHERE role = 'VICTIM' AND outcome = 'KILLED'
+        ) f ON f.incident_id = i.id
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('incident_rollups')
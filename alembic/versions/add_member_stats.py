@@ -0,0 +1,48 @@
+"""Add member_stats table
+
+Revision ID: add_member_stats
+Revises: add_summary_counters
+Create Date: 2026-02-12
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'add_member_stats'
+down_revision: Union[str, None] = 'add_summary_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('member_stats',
+    sa.Column('member_id', sa.String(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('assists', sa.Integer(), nullable=False),
+    sa.Column('shootings_committed', sa.Integer(), nullable=False),
+    sa.Column('times_shot', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.PrimaryKeyConstraint('member_id')
+    )
+    # Backfill from existing incident participations
+    op.execute("""
+        INSERT INTO member_stats (member_id, kills, assists, shootings_committed, times_shot)
+        SELECT p.member_id,
+               SUM(CASE WHEN p.role = 'PERPETRATOR' AND f.incident_id IS NOT NULL THEN 1 ELSE 0 END),
+               SUM(CASE WHEN p.role = 'ACCOMPLICE' AND f.incident_id IS NOT NULL THEN 1 ELSE 0 END),
+               SUM(CASE WHEN p.role = 'PERPETRATOR' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN p.role = 'VICTIM' THEN 1 ELSE 0 END)
+        FROM incident_participants p
+        LEFT JOIN (
+            SELECT DISTINCT incident_id FROM incident_participants
+            WHERE role = 'VICTIM' AND outcome = 'KILLED'
+        ) f ON f.incident_id = p.incident_id
+        GROUP BY p.member_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('member_stats')
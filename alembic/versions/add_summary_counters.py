@@ -0,0 +1,36 @@
+"""Add summary_counters table
+
+Revision ID: add_summary_counters
+Revises: add_murder_incident_type
+Create Date: 2026-02-12
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'add_summary_counters'
+down_revision: Union[str, None] = 'add_murder_incident_type'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTED_TABLES = ['members', 'sets', 'alliances', 'incidents', 'sources']
+
+
+def upgrade() -> None:
+    op.create_table('summary_counters',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # Backfill from the existing rows
+    for table in COUNTED_TABLES:
+        op.execute(
+            f"INSERT INTO summary_counters (name, value) SELECT '{table}', COUNT(*) FROM {table}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('summary_counters')
@@ -0,0 +1,27 @@
+"""Add updated_at to table_versions
+
+Revision ID: add_table_version_timestamps
+Revises: add_foreign_key_indexes
+Create Date: 2026-02-15
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'add_table_version_timestamps'
+down_revision: Union[str, None] = 'add_foreign_key_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('table_versions') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('table_versions') as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,29 @@
+"""Add table_versions table
+
+Revision ID: add_table_versions
+Revises: add_member_stats
+Create Date: 2026-02-13
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'add_table_versions'
+down_revision: Union[str, None] = 'add_member_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('table_versions',
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
@@ -1,25 +1,48 @@
 """Authentication system - simple password gate."""
 from fastapi import Request, HTTPException, status
 from fastapi.responses import RedirectResponse
-from passlib.context import CryptContext
-from itsdangerous import URLSafeTimedSerializer, BadSignature
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
+from itsdangerous import URLSafeTimedSerializer, BadData
+from collections import OrderedDict
+from functools import lru_cache
+import bcrypt
+import threading
+import time
 from app.config import settings
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Session cookie lifetime
+SESSION_MAX_AGE = 86400 * 30  # 30 days
+
+# Verified session tokens remembered per process, so the HMAC check runs
+# once per token rather than once per request
+TOKEN_CACHE_SIZE = 1024
+
+# Paths reachable without logging in, matched exactly
+PUBLIC_PATHS = frozenset(("/login", "/logout", "/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json"))
+
+# Path prefixes the middleware does not redirect. Static files are public;
+# every /api/ router depends on require_auth and answers 401 instead of a
+# redirect to the login page.
+UNREDIRECTED_PREFIXES = ("/static/", "/api/")
 
 # Session serializer
 serializer = URLSafeTimedSerializer(settings.SECRET_KEY)
 
 
+def _password_bytes(password: str) -> bytes:
+    # bcrypt only looks at the first 72 bytes; newer releases refuse longer input
+    return password.encode("utf-8")[:72]
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against a hash, in constant time."""
+    return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode("utf-8"))
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(_password_bytes(password), bcrypt.gensalt()).decode("utf-8")
 
 
 def create_session_token() -> str:
@@ -27,21 +50,57 @@ def create_session_token() -> str:
     return serializer.dumps("authenticated")
 
 
+class TokenCache:
+    """Small LRU of verified session tokens and when each one expires."""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._expiry: "OrderedDict[str, float]" = OrderedDict()
+    
+    def valid(self, token: str) -> bool:
+        """Whether the token was verified before and has not expired since."""
+        with self._lock:
+            expires = self._expiry.get(token)
+            if expires is None:
+                return False
+            if expires <= time.time():
+                del self._expiry[token]
+                return False
+            self._expiry.move_to_end(token)
+            return True
+    
+    def add(self, token: str, expires: float) -> None:
+        """Remember a verified token until it expires."""
+        with self._lock:
+            self._expiry[token] = expires
+            self._expiry.move_to_end(token)
+            while len(self._expiry) > self.max_entries:
+                self._expiry.popitem(last=False)
+
+
+verified_tokens = TokenCache(TOKEN_CACHE_SIZE)
+
+
 def verify_session_token(token: str) -> bool:
-    """Verify a session token."""
-    try:
-        serializer.loads(token, max_age=86400 * 30)  # 30 days
+    """Verify a session token, using the cache of recently verified ones."""
+    if verified_tokens.valid(token):
         return True
-    except (BadSignature, Exception):
+    try:
+        _, signed_at = serializer.loads(token, max_age=SESSION_MAX_AGE, return_timestamp=True)
+    except BadData:
         return False
+    verified_tokens.add(token, signed_at.timestamp() + SESSION_MAX_AGE)
+    return True
 
 
 def check_auth(request: Request) -> bool:
-    """Check if request is authenticated."""
-    token = request.cookies.get("session")
-    if not token:
-        return False
-    return verify_session_token(token)
+    """Check if request is authenticated (set once per request by SessionAuthMiddleware)."""
+    authenticated = getattr(request.state, "authenticated", None)
+    if authenticated is None:
+        token = request.cookies.get("session")
+        authenticated = bool(token) and verify_session_token(token)
+    return authenticated
 
 
 def require_auth(request: Request):
@@ -53,6 +112,41 @@ def require_auth(request: Request):
         )
 
 
+@lru_cache(maxsize=None)
 def get_hashed_admin_password() -> str:
-    """Get the hashed admin password (hash it once on startup)."""
+    """Get the hashed admin password (hashed once, at startup)."""
     return get_password_hash(settings.ADMIN_PASSWORD)
+
+
+def verify_admin_password(password: str) -> bool:
+    """Check a login attempt against the admin password hash, in constant time."""
+    return verify_password(password, get_hashed_admin_password())
+
+
+class SessionAuthMiddleware:
+    """
+    Check the session cookie once per request, before routing.
+    
+    Sets request.state.authenticated for check_auth and require_auth, and
+    redirects unauthenticated page requests to /login before any handler
+    or database dependency runs.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        connection = HTTPConnection(scope)
+        token = connection.cookies.get("session")
+        authenticated = bool(token) and verify_session_token(token)
+        connection.state.authenticated = authenticated
+        
+        path = scope["path"]
+        if not authenticated and path not in PUBLIC_PATHS and not path.startswith(UNREDIRECTED_PREFIXES):
+            await RedirectResponse(url="/login", status_code=302)(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
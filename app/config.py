@@ -9,6 +9,29 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "change-this-secret-key-in-production"
     ADMIN_PASSWORD: str = "admin"
     
+    # Database performance profile. The SQLITE_* PRAGMAs are applied to every
+    # SQLite connection unless SQLITE_PERFORMANCE_PROFILE is false.
+    DATABASE_ECHO: bool = False  # Log every SQL statement
+    DATABASE_READ_ONLY_GETS: bool = True  # Serve GET requests from query_only connections
+    DATABASE_REPLICA_URL: str = ""  # Read replica for GET requests; empty = read from the primary
+    DATABASE_REPLICA_LAG_SECONDS: float = 5  # Primary reads after a client writes (read-your-writes)
+    SQLITE_PERFORMANCE_PROFILE: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # bytes
+    SQLITE_CACHE_SIZE: int = -64000  # negative = KiB, i.e. ~64 MB
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT: int = 5000  # ms to wait on a locked database
+    
+    # Cache of entity read DTOs: "memory" (per process), "redis" (shared, needs
+    # the redis package and ENTITY_CACHE_URL) or "none"
+    ENTITY_CACHE_BACKEND: str = "memory"
+    ENTITY_CACHE_URL: str = ""
+    ENTITY_CACHE_MAX_ENTRIES: int = 10000
+    ENTITY_CACHE_TTL: float = 300  # seconds
+    # Rendered HTMX list partials, in the same backend (0 turns it off)
+    FRAGMENT_CACHE_MAX_ENTRIES: int = 1000
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -7,22 +7,28 @@ from app.crud.alliance import (
 )
 from app.crud.set import (
     create_set, get_set, get_sets, update_set, delete_set, search_sets,
-    add_ally, remove_ally, add_enemy, remove_enemy
+    add_ally, remove_ally, add_enemy, remove_enemy, load_set_relations
 )
 from app.crud.member import (
     create_member, get_member, get_members, update_member, delete_member, search_members,
-    get_member_stats
+    get_member_stats, get_member_stats_bulk, rebuild_member_stats
 )
 from app.crud.incident import (
     create_incident, get_incident, get_incidents, update_incident, delete_incident, search_incidents
 )
+from app.crud.summary import get_summary_counts, rebuild_summary_counts
+from app.crud.rollup import get_incident_rollup, rebuild_incident_rollups
+from app.crud.bulk import import_chunk, finish_import
 
 __all__ = [
     "create_source", "get_source", "get_sources", "update_source", "delete_source", "search_sources",
     "create_alliance", "get_alliance", "get_alliances", "update_alliance", "delete_alliance", "search_alliances",
     "create_set", "get_set", "get_sets", "update_set", "delete_set", "search_sets",
-    "add_ally", "remove_ally", "add_enemy", "remove_enemy",
+    "add_ally", "remove_ally", "add_enemy", "remove_enemy", "load_set_relations",
     "create_member", "get_member", "get_members", "update_member", "delete_member", "search_members",
-    "get_member_stats",
+    "get_member_stats", "get_member_stats_bulk", "rebuild_member_stats",
     "create_incident", "get_incident", "get_incidents", "update_incident", "delete_incident", "search_incidents",
+    "get_summary_counts", "rebuild_summary_counts",
+    "get_incident_rollup", "rebuild_incident_rollups",
+    "import_chunk", "finish_import",
 ]
@@ -0,0 +1,115 @@
+"""
+Per-set and per-alliance scoreboards computed with grouped SQL.
+
+Each scoreboard is a few GROUP BY queries over members and
+incident_participants rather than a walk over Set.members and their
+participations. Results are kept in aggregate_cache, stamped with the
+versions of the tables they read, so any write to those tables recomputes
+them on the next request.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import case, distinct, func
+from typing import Dict, List
+from app.models.member import Member
+from app.models.set import Set
+from app.models.alliance import Alliance
+from app.models.incident import IncidentParticipant, ParticipantRole, VictimOutcome
+from app.crud.cache import aggregate_cache
+from app.crud.version import get_versions
+
+
+# Tables each scoreboard is computed from, for cache invalidation and ETags
+SET_AGGREGATE_TABLES = ("sets", "members", "incident_participants")
+ALLIANCE_AGGREGATE_TABLES = ("alliances", "sets", "members", "incident_participants")
+
+AGGREGATE_FIELDS = ("members", "incidents", "fatalities_attributed", "victims_lost")
+
+
+def _aggregate_counts(db: Session, membership) -> Dict[str, Dict[str, int]]:
+    """
+    Count AGGREGATE_FIELDS per group, given a (member_id, group_id) subquery.
+    
+    fatalities_attributed is the number of victims killed in incidents where
+    a group member was a perpetrator or accomplice; victims_lost counts the
+    group's own members killed.
+    """
+    counts: Dict[str, Dict[str, int]] = {}
+    
+    def add(field, rows):
+        for group_id, value in rows:
+            counts.setdefault(group_id, dict.fromkeys(AGGREGATE_FIELDS, 0))[field] = value or 0
+    
+    add("members", db.query(membership.c.group_id, func.count()).group_by(membership.c.group_id))
+    
+    killed = (IncidentParticipant.role == ParticipantRole.VICTIM) & (
+        IncidentParticipant.outcome == VictimOutcome.KILLED
+    )
+    rows = db.query(
+        membership.c.group_id,
+        func.count(distinct(IncidentParticipant.incident_id)),
+        func.sum(case((killed, 1), else_=0)),
+    ).join(membership, membership.c.member_id == IncidentParticipant.member_id).group_by(
+        membership.c.group_id
+    ).all()
+    add("incidents", [(group_id, incidents) for group_id, incidents, _ in rows])
+    add("victims_lost", [(group_id, lost) for group_id, _, lost in rows])
+    
+    attributed = db.query(membership.c.group_id, IncidentParticipant.incident_id).join(
+        membership, membership.c.member_id == IncidentParticipant.member_id
+    ).filter(
+        IncidentParticipant.role.in_([ParticipantRole.PERPETRATOR, ParticipantRole.ACCOMPLICE])
+    ).distinct().subquery()
+    deaths = db.query(
+        IncidentParticipant.incident_id, func.count().label("killed")
+    ).filter(killed).group_by(IncidentParticipant.incident_id).subquery()
+    add("fatalities_attributed", db.query(attributed.c.group_id, func.sum(deaths.c.killed)).join(
+        deaths, deaths.c.incident_id == attributed.c.incident_id
+    ).group_by(attributed.c.group_id))
+    return counts
+
+
+def _scoreboard(db: Session, groups, membership) -> List[Dict]:
+    counts = _aggregate_counts(db, membership)
+    empty = dict.fromkeys(AGGREGATE_FIELDS, 0)
+    return [
+        {"id": group_id, "name": name, **counts.get(group_id, empty)}
+        for group_id, name in groups
+    ]
+
+
+def _cached(db: Session, key: str, tables, compute) -> List[Dict]:
+    # Read before the data, so a result is never stored under versions newer than it
+    versions = get_versions(db, *tables)
+    result = aggregate_cache.lookup(key, versions)
+    if result is None:
+        result = compute()
+        aggregate_cache.store(key, versions, result)
+    return result
+
+
+def get_set_aggregates(db: Session) -> List[Dict]:
+    """Member, incident and fatality totals for every set, by name."""
+    def compute():
+        membership = db.query(
+            Member.id.label("member_id"), Member.set_id.label("group_id")
+        ).filter(Member.set_id.isnot(None)).subquery()
+        groups = db.query(Set.id, Set.primary_name).order_by(Set.primary_name, Set.id).all()
+        return _scoreboard(db, groups, membership)
+    return _cached(db, "sets", SET_AGGREGATE_TABLES, compute)
+
+
+def get_alliance_aggregates(db: Session) -> List[Dict]:
+    """
+    Member, incident and fatality totals for every alliance, by name.
+    
+    An alliance's members are its direct members plus the members of its
+    sets; a member's direct alliance wins if they name both.
+    """
+    def compute():
+        group_id = func.coalesce(Member.alliance_id, Set.alliance_id)
+        membership = db.query(
+            Member.id.label("member_id"), group_id.label("group_id")
+        ).outerjoin(Set, Set.id == Member.set_id).filter(group_id.isnot(None)).subquery()
+        groups = db.query(Alliance.id, Alliance.name).order_by(Alliance.name).all()
+        return _scoreboard(db, groups, membership)
+    return _cached(db, "alliances", ALLIANCE_AGGREGATE_TABLES, compute)
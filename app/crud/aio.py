@@ -0,0 +1,67 @@
+"""
+Async variants of the CRUD functions, for use from async request handlers.
+
+Each crud module is mirrored here with the same function names and
+signatures, taking an AsyncSession instead of a Session:
+    
+    from app.crud.aio import member as member_crud
+    members = await member_crud.get_members(db, limit=100, profile="list")
+
+The wrappers run the sync implementation through AsyncSession.run_sync, so
+all database I/O goes through the async driver and the event loop keeps
+serving other requests while a query runs. Objects come back fully loaded
+per the loader profile; lazy loads outside the wrapper are not possible
+on an async session, which is what the profiles are for.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from types import ModuleType, SimpleNamespace
+import functools
+import inspect
+from app.crud import (
+    aggregates as _aggregates, alliance as _alliance, bulk as _bulk, cache as _cache, facets as _facets,
+    fulltext as _fulltext, graph as _graph, incident as _incident, member as _member,
+    projections as _projections, rollup as _rollup, set as _set, source as _source, summary as _summary,
+    typeahead as _typeahead, version as _version,
+)
+
+
+def async_variant(func):
+    """Wrap a function whose first argument is a Session so it takes an AsyncSession."""
+    @functools.wraps(func)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(func, *args, **kwargs)
+    return wrapper
+
+
+def _takes_session(func) -> bool:
+    params = list(inspect.signature(func).parameters.values())
+    return bool(params) and params[0].annotation is Session
+
+
+def async_module(module: ModuleType) -> SimpleNamespace:
+    """Async variants of every public function in module that takes a Session first."""
+    return SimpleNamespace(**{
+        name: async_variant(func)
+        for name, func in inspect.getmembers(module, inspect.isfunction)
+        if not name.startswith("_") and func.__module__ == module.__name__
+        and _takes_session(func) and not inspect.isgeneratorfunction(func)
+    })
+
+
+aggregates = async_module(_aggregates)
+alliance = async_module(_alliance)
+bulk = async_module(_bulk)
+cache = async_module(_cache)
+facets = async_module(_facets)
+fulltext = async_module(_fulltext)
+graph = async_module(_graph)
+incident = async_module(_incident)
+member = async_module(_member)
+projections = async_module(_projections)
+rollup = async_module(_rollup)
+set = async_module(_set)
+source = async_module(_source)
+summary = async_module(_summary)
+typeahead = async_module(_typeahead)
+version = async_module(_version)
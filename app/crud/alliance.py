@@ -1,28 +1,43 @@
 """CRUD operations for alliances."""
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, update
 from typing import Optional, List
 from app.models.alliance import Alliance
+from app.models.set import Set
+from app.models.member import Member
+from app.models.base import validate_dates
 from app.schemas.alliance import AllianceCreate, AllianceUpdate
+from app.crud.summary import adjust_counter
+from app.crud.fulltext import fulltext_ids, load_in_order
+from app.crud.typeahead import typeahead_index
+from app.crud.cache import entity_cache
+from app.crud.pagination import keyset
+from app.crud.loaders import with_profile
+from app.crud.version import bump_version
 
 
 def create_alliance(db: Session, alliance: AllianceCreate) -> Alliance:
     """Create a new alliance."""
     db_alliance = Alliance(**alliance.model_dump())
     db.add(db_alliance)
+    adjust_counter(db, "alliances", 1)
+    versions = bump_version(db, "alliances")
     db.commit()
     db.refresh(db_alliance)
+    typeahead_index.update_entry(db_alliance, versions)
     return db_alliance
 
 
-def get_alliance(db: Session, alliance_id: str) -> Optional[Alliance]:
-    """Get an alliance by ID."""
-    return db.query(Alliance).filter(Alliance.id == alliance_id).first()
+def get_alliance(db: Session, alliance_id: str, profile: Optional[str] = None) -> Optional[Alliance]:
+    """Get an alliance by ID, eager-loading per the given loader profile."""
+    return with_profile(db.query(Alliance), Alliance, profile).filter(Alliance.id == alliance_id).first()
 
 
-def get_alliances(db: Session, skip: int = 0, limit: int = 100) -> List[Alliance]:
-    """Get all alliances with pagination."""
-    return db.query(Alliance).offset(skip).limit(limit).all()
+def get_alliances(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None,
+                  profile: Optional[str] = None) -> List[Alliance]:
+    """Get all alliances in ID order, starting after the given ID."""
+    query = with_profile(db.query(Alliance), Alliance, profile)
+    return keyset(query, Alliance.id, after).offset(skip).limit(limit).all()
 
 
 def update_alliance(db: Session, alliance_id: str, alliance: AllianceUpdate) -> Optional[Alliance]:
@@ -33,9 +48,13 @@ def update_alliance(db: Session, alliance_id: str, alliance: AllianceUpdate) ->
     
     for key, value in alliance.model_dump(exclude_unset=True).items():
         setattr(db_alliance, key, value)
+    validate_dates(db_alliance)
     
+    versions = bump_version(db, "alliances")
     db.commit()
     db.refresh(db_alliance)
+    typeahead_index.update_entry(db_alliance, versions)
+    entity_cache.invalidate("alliance", alliance_id)
     return db_alliance
 
 
@@ -45,15 +64,35 @@ def delete_alliance(db: Session, alliance_id: str) -> bool:
     if not db_alliance:
         return False
     
+    # Detach sets and direct members explicitly, so their cached DTOs can be dropped too
+    set_ids = db.execute(
+        update(Set).where(Set.alliance_id == alliance_id).values(alliance_id=None).returning(Set.id)
+    ).scalars().all()
+    member_ids = db.execute(
+        update(Member).where(Member.alliance_id == alliance_id).values(alliance_id=None).returning(Member.id)
+    ).scalars().all()
     db.delete(db_alliance)
+    adjust_counter(db, "alliances", -1)
+    versions = bump_version(db, "alliances", "sets", "members")
     db.commit()
+    typeahead_index.remove_entry("alliance", alliance_id, versions)
+    entity_cache.invalidate("alliance", alliance_id)
+    for set_id in set_ids:
+        entity_cache.invalidate("set", set_id)
+    for member_id in member_ids:
+        entity_cache.invalidate("member", member_id)
     return True
 
 
-def search_alliances(db: Session, query: str, skip: int = 0, limit: int = 100) -> List[Alliance]:
-    """Search alliances by name or bio."""
+def search_alliances(db: Session, query: str, skip: int = 0, limit: int = 100,
+                     profile: Optional[str] = None) -> List[Alliance]:
+    """Search alliances by name or bio, best match first."""
+    ids = fulltext_ids(db, "alliances", query, skip, limit)
+    if ids is not None:
+        return load_in_order(db, Alliance, ids, profile)
+    
     search_pattern = f"%{query}%"
-    return db.query(Alliance).filter(
+    return with_profile(db.query(Alliance), Alliance, profile).filter(
         or_(
             Alliance.name.like(search_pattern),
             Alliance.bio.like(search_pattern)
@@ -0,0 +1,224 @@
+"""
+Bulk NDJSON import.
+
+Rows are validated and inserted a chunk at a time with executemany, all
+inside the caller's transaction. A row that fails validation or points at
+a missing entity is reported by line number and skipped; the rest of the
+batch still goes in. Each row is the entity's create schema plus two
+optional keys:
+    
+    id          keep an upstream ID instead of generating one
+    source_ids  IDs of existing sources to link the new row to
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import Table, insert
+from pydantic import BaseModel, ValidationError
+from typing import Dict, List, NamedTuple, Optional, Tuple, Type
+from collections import Counter, defaultdict
+import json
+import uuid
+from app.models.member import Member
+from app.models.set import Set
+from app.models.alliance import Alliance
+from app.models.incident import Incident, IncidentParticipant
+from app.models.source import Source
+from app.models.associations import member_sources, set_sources, alliance_sources, incident_sources
+from app.schemas.member import MemberCreate
+from app.schemas.set import SetCreate
+from app.schemas.alliance import AllianceCreate
+from app.schemas.incident import IncidentCreate
+from app.schemas.source import SourceCreate
+from app.crud.summary import adjust_counter
+from app.crud.typeahead import typeahead_index
+from app.crud.cache import entity_cache
+from app.crud.version import bump_version
+from app.crud.member import add_member_stats, participant_stat_deltas
+from app.crud.rollup import add_rollup_counts, rollup_key
+
+
+# Lines validated and inserted per executemany round
+BULK_CHUNK_SIZE = 1000
+
+
+class BulkEntity(NamedTuple):
+    """How rows of one entity are validated, checked and linked."""
+    model: type
+    schema: Type[BaseModel]
+    references: Dict[str, type]  # Field -> model its value must be an ID of
+    source_links: Optional[Table]  # <entity>_sources association table
+    owner_column: Optional[str]  # Column of source_links pointing at the new row
+
+
+BULK_ENTITIES: Dict[str, BulkEntity] = {
+    "sources": BulkEntity(Source, SourceCreate, {}, None, None),
+    "alliances": BulkEntity(Alliance, AllianceCreate, {}, alliance_sources, "alliance_id"),
+    "sets": BulkEntity(Set, SetCreate, {"alliance_id": Alliance}, set_sources, "set_id"),
+    "members": BulkEntity(Member, MemberCreate, {"set_id": Set, "alliance_id": Alliance},
+                          member_sources, "member_id"),
+    "incidents": BulkEntity(Incident, IncidentCreate, {}, incident_sources, "incident_id"),
+}
+
+
+# Tables each import writes to, for their version counters
+BULK_TABLES: Dict[str, Tuple[str, ...]] = {
+    "sources": ("sources",),
+    "alliances": ("alliances", "alliance_sources"),
+    "sets": ("sets", "set_sources"),
+    "members": ("members", "member_sources"),
+    "incidents": ("incidents", "incident_participants", "member_stats", "incident_rollups", "incident_sources"),
+}
+
+
+class _Row(NamedTuple):
+    line: int
+    id: str
+    record: BaseModel
+    source_ids: List[str]
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def _parse_line(spec: BulkEntity, line: int, text: str) -> _Row:
+    """Parse and validate one NDJSON line; raises ValueError with a readable message."""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Invalid JSON: {exc.msg}")
+    if not isinstance(data, dict):
+        raise ValueError("Each line must be a JSON object")
+    
+    row_id = data.pop("id", None) or str(uuid.uuid4())
+    source_ids = data.pop("source_ids", None) or []
+    if not isinstance(row_id, str):
+        raise ValueError("id: must be a string")
+    if not isinstance(source_ids, list) or not all(isinstance(source_id, str) for source_id in source_ids):
+        raise ValueError("source_ids: must be a list of strings")
+    if source_ids and spec.source_links is None:
+        raise ValueError(f"source_ids: {spec.model.__tablename__} cannot be linked to sources")
+    try:
+        record = spec.schema.model_validate(data)
+    except ValidationError as exc:
+        raise ValueError(_format_validation_error(exc))
+    return _Row(line, row_id, record, list(dict.fromkeys(source_ids)))
+
+
+def _existing_ids(db: Session, model, ids) -> set:
+    ids = list(ids)
+    if not ids:
+        return set()
+    return {row_id for row_id, in db.query(model.id).filter(model.id.in_(ids))}
+
+
+def _check_references(db: Session, spec: BulkEntity, rows: List[_Row]) -> Dict[int, str]:
+    """Find rows that reuse an ID or point at missing entities, with one IN query per referenced table."""
+    wanted = defaultdict(set)  # model -> IDs the chunk refers to
+    for row in rows:
+        for field, model in spec.references.items():
+            if getattr(row.record, field):
+                wanted[model].add(getattr(row.record, field))
+        if isinstance(row.record, IncidentCreate):
+            wanted[Member].update(participant.member_id for participant in row.record.participants)
+        wanted[Source].update(row.source_ids)
+    found = {model: _existing_ids(db, model, ids) for model, ids in wanted.items()}
+    taken = _existing_ids(db, spec.model, (row.id for row in rows))
+    
+    errors = {}
+    seen = set()
+    for row in rows:
+        problems = []
+        if row.id in taken or row.id in seen:
+            problems.append(f"id: {row.id} already exists")
+        for field, model in spec.references.items():
+            value = getattr(row.record, field)
+            if value and value not in found[model]:
+                problems.append(f"{field}: {model.__name__.lower()} {value} not found")
+        if isinstance(row.record, IncidentCreate):
+            problems.extend(
+                f"participants.{index}.member_id: member {participant.member_id} not found"
+                for index, participant in enumerate(row.record.participants)
+                if participant.member_id not in found[Member]
+            )
+        problems.extend(
+            f"source_ids: source {source_id} not found"
+            for source_id in row.source_ids if source_id not in found[Source]
+        )
+        if problems:
+            errors[row.line] = "; ".join(problems)
+        else:
+            seen.add(row.id)
+    return errors
+
+
+def _insert_rows(db: Session, entity: str, spec: BulkEntity, rows: List[_Row]) -> None:
+    """Insert a chunk of checked rows with executemany, along with their participants and source links."""
+    exclude = {"participants"} if spec.model is Incident else None
+    db.execute(insert(spec.model), [{"id": row.id, **row.record.model_dump(exclude=exclude)} for row in rows])
+    
+    if spec.source_links is not None:
+        links = [{spec.owner_column: row.id, "source_id": source_id}
+                 for row in rows for source_id in row.source_ids]
+        if links:
+            db.execute(insert(spec.source_links), links)
+    
+    if spec.model is Incident:
+        participants = [
+            {"id": str(uuid.uuid4()), "incident_id": row.id, **participant.model_dump()}
+            for row in rows for participant in row.record.participants
+        ]
+        if participants:
+            db.execute(insert(IncidentParticipant), participants)
+        
+        totals: Dict[str, Dict[str, int]] = {}
+        for row in rows:
+            for member_id, delta in participant_stat_deltas(row.record.participants).items():
+                total = totals.setdefault(member_id, dict.fromkeys(delta, 0))
+                for field, value in delta.items():
+                    total[field] += value
+        add_member_stats(db, totals)
+        add_rollup_counts(db, Counter(rollup_key(row.record, row.record.participants) for row in rows))
+    
+    adjust_counter(db, entity, len(rows))
+
+
+def import_chunk(db: Session, entity: str, lines: List[Tuple[int, str]]) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Validate and insert one chunk of (line number, NDJSON text) pairs
+    without committing. Returns the number of rows created and the
+    (line number, error) of every row that was skipped.
+    """
+    spec = BULK_ENTITIES[entity]
+    rows, errors = [], []
+    for line, text in lines:
+        try:
+            rows.append(_parse_line(spec, line, text))
+        except ValueError as exc:
+            errors.append((line, str(exc)))
+    
+    reference_errors = _check_references(db, spec, rows)
+    rows = [row for row in rows if row.line not in reference_errors]
+    if rows:
+        _insert_rows(db, entity, spec, rows)
+    errors.extend(reference_errors.items())
+    errors.sort()
+    return len(rows), errors
+
+
+def finish_import(db: Session, entity: str, created: int) -> None:
+    """
+    Commit a bulk import and invalidate what depends on the entity's table.
+    
+    Incident imports write participants and member_stats for existing
+    members behind the per-entity invalidation in the CRUD functions, so
+    the entity cache is cleared outright.
+    """
+    if created:
+        bump_version(db, *BULK_TABLES[entity])
+    db.commit()
+    if created:
+        typeahead_index.invalidate()
+        entity_cache.clear()
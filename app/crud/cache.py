@@ -0,0 +1,374 @@
+"""
+Cache of read-side DTOs (the *Read schemas) keyed by entity type and ID.
+
+get_entity serves API lookups from the cache and fills it on a miss; the
+CRUD update and delete functions call entity_cache.invalidate after they
+commit. Storage sits behind CacheBackend: an in-process LRU with a TTL by
+default, or Redis (ENTITY_CACHE_BACKEND=redis) so several workers share one
+cache and see each other's invalidations.
+
+VersionedCache stamps each value with the versions of the tables it was
+computed from. FragmentCache uses it for rendered HTMX list partials and
+aggregate_cache for the set and alliance scoreboards, each in a backend of
+its own.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import pickle
+import threading
+import time
+from app.config import settings
+from app.models.member import Member
+from app.models.set import Set
+from app.models.alliance import Alliance
+from app.models.incident import Incident
+from app.models.source import Source
+from app.schemas.member import MemberRead
+from app.schemas.set import SetRead
+from app.schemas.alliance import AllianceRead
+from app.schemas.incident import IncidentRead
+from app.schemas.source import SourceRead
+from app.crud.projections import get_row
+
+
+# Model and DTO for each cached entity type
+CACHED_ENTITIES = {
+    "member": (Member, MemberRead),
+    "set": (Set, SetRead),
+    "alliance": (Alliance, AllianceRead),
+    "incident": (Incident, IncidentRead),
+    "source": (Source, SourceRead),
+}
+
+
+class CacheBackend(ABC):
+    """Storage for cached values. Implementations must be thread-safe."""
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+    
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        ...
+    
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+    
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU with a per-entry TTL; each worker process has its own."""
+    
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend(CacheBackend):
+    """Shared cache in Redis; entries expire after the TTL and Redis' own eviction policy bounds the size."""
+    
+    def __init__(self, url: str, ttl: float, prefix: str = "squiidwiki:entity:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("ENTITY_CACHE_BACKEND=redis requires the redis package (pip install redis)")
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+    
+    def get(self, key: str) -> Optional[Any]:
+        data = self._client.get(self.prefix + key)
+        return pickle.loads(data) if data is not None else None
+    
+    def set(self, key: str, value: Any) -> None:
+        self._client.set(self.prefix + key, pickle.dumps(value), px=int(self.ttl * 1000))
+    
+    def delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+    
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(match=self.prefix + "*", count=1000))
+        if keys:
+            self._client.delete(*keys)
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(match=self.prefix + "*", count=1000))
+
+
+class EntityCache:
+    """
+    DTO cache with hit/miss counters.
+    
+    Every invalidation advances a generation counter. A loader passes the
+    generation it saw before reading the row, and set refuses to store the
+    DTO if the entity was invalidated since, as the row may predate that
+    write. With a read replica, a read that misses right after an
+    invalidation may still see the old row, so entries invalidated within
+    the replica lag window are not refilled until it has passed.
+    """
+    
+    # Invalidations remembered per key; older ones are folded into _forgotten
+    MAX_TRACKED_INVALIDATIONS = 10000
+    
+    def __init__(self, backend: Optional[CacheBackend], fence_seconds: float = 0):
+        self.backend = backend
+        self.fence_seconds = fence_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        self._fenced: Dict[str, float] = {}
+        self._generation = 0
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._forgotten = 0
+    
+    @property
+    def generation(self) -> int:
+        """Number of invalidations so far; read it before loading a row to cache."""
+        return self._generation
+    
+    @staticmethod
+    def key(entity_type: str, entity_id: str) -> str:
+        return f"{entity_type}:{entity_id}"
+    
+    def get(self, entity_type: str, entity_id: str) -> Optional[BaseModel]:
+        """Look up a DTO, counting the hit or miss."""
+        if self.backend is None:
+            return None
+        value = self.backend.get(self.key(entity_type, entity_id))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+    
+    def set(self, entity_type: str, entity_id: str, value: BaseModel,
+            generation: Optional[int] = None) -> None:
+        """
+        Store a DTO unless the entity was invalidated after `generation`
+        (when given) or within the fence window.
+        """
+        if self.backend is None:
+            return
+        key = self.key(entity_type, entity_id)
+        if generation is not None:
+            with self._lock:
+                if self._invalidated.get(key, self._forgotten) > generation:
+                    return
+        if self._fenced:
+            with self._lock:
+                now = time.monotonic()
+                self._fenced = {k: until for k, until in self._fenced.items() if until > now}
+                if key in self._fenced:
+                    return
+        self.backend.set(key, value)
+    
+    def invalidate(self, entity_type: str, entity_id: str) -> None:
+        """Drop an entity's DTO after it was updated or deleted."""
+        if self.backend is None:
+            return
+        key = self.key(entity_type, entity_id)
+        self.backend.delete(key)
+        with self._lock:
+            self.invalidations += 1
+            self._generation += 1
+            self._invalidated[key] = self._generation
+            self._invalidated.move_to_end(key)
+            if len(self._invalidated) > self.MAX_TRACKED_INVALIDATIONS:
+                _, self._forgotten = self._invalidated.popitem(last=False)
+            if self.fence_seconds:
+                self._fenced[key] = time.monotonic() + self.fence_seconds
+    
+    def clear(self) -> None:
+        """Drop every cached DTO, e.g. after a bulk change outside the CRUD layer."""
+        if self.backend is None:
+            return
+        self.backend.clear()
+        with self._lock:
+            # Loads already in flight may hold rows from before the change
+            self._generation += 1
+            self._forgotten = self._generation
+            self._invalidated.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "backend": settings.ENTITY_CACHE_BACKEND,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+        if isinstance(self.backend, MemoryBackend):
+            stats.update(size=len(self.backend), max_entries=self.backend.max_entries,
+                         evictions=self.backend.evictions)
+        return stats
+
+
+class VersionedCache:
+    """
+    Values stamped with the versions of the tables they were computed from.
+    
+    A lookup with different versions drops the entry and misses, so a write
+    to any of those tables invalidates every value built on it.
+    """
+    
+    def __init__(self, backend: Optional[CacheBackend]):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+    
+    def lookup(self, key: str, versions: Dict[str, int]) -> Optional[Any]:
+        """Look up a value computed at exactly these table versions."""
+        if self.backend is None:
+            return None
+        entry = self.backend.get(key)
+        stale = entry is not None and entry[0] != versions
+        if stale:
+            self.backend.delete(key)
+        with self._lock:
+            if entry is None or stale:
+                self.misses += 1
+                self.invalidations += stale
+                return None
+            self.hits += 1
+        return entry[1]
+    
+    def store(self, key: str, versions: Dict[str, int], value: Any) -> None:
+        """Store a value with the table versions it was computed from."""
+        if self.backend is not None:
+            self.backend.set(key, (versions, value))
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+        if isinstance(self.backend, MemoryBackend):
+            stats.update(size=len(self.backend), max_entries=self.backend.max_entries,
+                         evictions=self.backend.evictions)
+        return stats
+
+
+class FragmentCache(VersionedCache):
+    """Rendered HTML fragments keyed by (template, search term, page)."""
+    
+    @staticmethod
+    def key(template: str, search: Optional[str], page: Optional[str]) -> str:
+        return f"{template}|{search or ''}|{page or ''}"
+    
+    def get(self, template: str, search: Optional[str], page: Optional[str],
+            versions: Dict[str, int]) -> Optional[str]:
+        """Look up a fragment rendered at exactly these table versions."""
+        return self.lookup(self.key(template, search, page), versions)
+    
+    def set(self, template: str, search: Optional[str], page: Optional[str],
+            versions: Dict[str, int], html: str) -> None:
+        """Store a fragment with the table versions it was rendered from."""
+        self.store(self.key(template, search, page), versions, html)
+
+
+def create_backend(max_entries: int = None, prefix: str = "squiidwiki:entity:") -> Optional[CacheBackend]:
+    """Build the backend selected by ENTITY_CACHE_BACKEND (memory, redis or none)."""
+    name = settings.ENTITY_CACHE_BACKEND
+    if name == "none":
+        return None
+    if name == "memory":
+        return MemoryBackend(max_entries or settings.ENTITY_CACHE_MAX_ENTRIES, settings.ENTITY_CACHE_TTL)
+    if name == "redis":
+        return RedisBackend(settings.ENTITY_CACHE_URL, settings.ENTITY_CACHE_TTL, prefix=prefix)
+    raise ValueError(f"Unknown ENTITY_CACHE_BACKEND {name!r}; expected memory, redis or none")
+
+
+entity_cache = EntityCache(
+    create_backend(),
+    fence_seconds=settings.DATABASE_REPLICA_LAG_SECONDS if settings.DATABASE_REPLICA_URL else 0
+)
+
+fragment_cache = FragmentCache(
+    create_backend(settings.FRAGMENT_CACHE_MAX_ENTRIES, prefix="squiidwiki:fragment:")
+    if settings.FRAGMENT_CACHE_MAX_ENTRIES else None
+)
+
+# Only a handful of keys (one per scoreboard), so no size setting of its own
+aggregate_cache = VersionedCache(create_backend(16, prefix="squiidwiki:aggregate:"))
+
+
+@event.listens_for(Session, "after_begin")
+def _note_cache_generation(session, transaction, connection):
+    # The transaction's snapshot is taken after this, so a row it reads is
+    # at least as new as every invalidation counted here
+    session.info["entity_cache_generation"] = entity_cache.generation
+
+
+def get_entity(db: Session, entity_type: str, entity_id: str) -> Optional[BaseModel]:
+    """Get an entity's read DTO (e.g. MemberRead) by ID, from the cache when possible."""
+    cached = entity_cache.get(entity_type, entity_id)
+    if cached is not None:
+        return cached
+    model, schema = CACHED_ENTITIES[entity_type]
+    row = get_row(db, model, entity_id)
+    if row is None:
+        return None
+    dto = schema.model_validate(row)
+    # Stamped when the transaction that read the row began
+    entity_cache.set(entity_type, entity_id, dto, db.info.get("entity_cache_generation", 0))
+    return dto
+
@@ -0,0 +1,125 @@
+"""
+Streaming export of whole tables as NDJSON or CSV.
+
+Rows are read with Core selects and yield_per, so no ORM objects or
+relationships are built, and written out in buffered chunks (optionally
+gzipped on the fly). Memory use stays flat however many rows there are.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import Table, select
+from typing import Dict, Iterator, List
+import csv
+import enum
+import io
+import json
+import zlib
+from app.database import ReadSessionLocal
+from app.models.member import Member
+from app.models.set import Set
+from app.models.alliance import Alliance
+from app.models.incident import Incident, IncidentParticipant
+from app.models.source import Source
+from app.models.associations import (
+    set_allies, set_enemies, member_sources, set_sources, alliance_sources, incident_sources
+)
+
+
+# Exportable tables, in an order that keeps references pointing backwards.
+# Derived tables (member_stats, summary_counters, ...) are rebuilt from these.
+EXPORT_TABLES: Dict[str, Table] = {
+    "sources": Source.__table__,
+    "alliances": Alliance.__table__,
+    "sets": Set.__table__,
+    "members": Member.__table__,
+    "incidents": Incident.__table__,
+    "incident_participants": IncidentParticipant.__table__,
+    "set_allies": set_allies,
+    "set_enemies": set_enemies,
+    "member_sources": member_sources,
+    "set_sources": set_sources,
+    "alliance_sources": alliance_sources,
+    "incident_sources": incident_sources,
+}
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+# Rows fetched per round trip
+EXPORT_BATCH_SIZE = 2000
+
+# Output is flushed to the client in chunks of about this many bytes
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def _plain(value):
+    """Enum members as their value, so JSON and CSV get "ACTIVE" rather than the repr."""
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def iter_rows(db: Session, table: Table) -> Iterator[dict]:
+    """Yield every row of a table as a dict, streamed from the database in batches."""
+    columns = [column.name for column in table.columns]
+    result = db.execute(select(table).execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for row in result:
+        yield {name: _plain(value) for name, value in zip(columns, row)}
+
+
+def iter_ndjson(db: Session, entities: List[str]) -> Iterator[str]:
+    """
+    Yield NDJSON lines. A single entity gives bare rows (the shape the bulk
+    import accepts); several are wrapped as {"entity": ..., "row": ...}.
+    """
+    for entity in entities:
+        for row in iter_rows(db, EXPORT_TABLES[entity]):
+            if len(entities) > 1:
+                row = {"entity": entity, "row": row}
+            yield json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def iter_csv(db: Session, entity: str) -> Iterator[str]:
+    """Yield one entity as CSV with a header row; JSON columns are written as JSON text."""
+    table = EXPORT_TABLES[entity]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in table.columns])
+    for row in iter_rows(db, table):
+        writer.writerow([
+            json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+            for value in row.values()
+        ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_export(format: str, entities: List[str], compress: bool = False) -> Iterator[bytes]:
+    """
+    Stream an export as bytes for a StreamingResponse.
+    
+    Uses its own read session because the response outlives the request's
+    session.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip container
+    pending: List[bytes] = []
+    size = 0
+    
+    def emit(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+    
+    with ReadSessionLocal() as db:
+        pieces = iter_ndjson(db, entities) if format == "ndjson" else iter_csv(db, entities[0])
+        for piece in pieces:
+            data = piece.encode("utf-8")
+            pending.append(data)
+            size += len(data)
+            if size >= EXPORT_CHUNK_BYTES:
+                chunk = emit(b"".join(pending))
+                pending, size = [], 0
+                if chunk:
+                    yield chunk
+    
+    tail = emit(b"".join(pending))
+    if compressor:
+        tail += compressor.flush()
+    if tail:
+        yield tail
@@ -0,0 +1,105 @@
+"""
+Structured filters and facet counts for the incident and member lists.
+
+The *_filters functions turn query parameters into WHERE criteria for the
+list queries. get_*_facets count, for every filter dimension, how many
+matching rows have each value. They do it in one grouped query: the
+matching rows are crossed with the list of dimension names and grouped by
+(dimension, value), which stands in for GROUPING SETS (SQLite has none).
+"""
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import String, case, cast, distinct, func, literal, select, true, union_all
+from typing import Dict, List, Optional, Sequence
+from app.models.member import Member, MemberStatus, AffiliationType
+from app.models.incident import Incident, IncidentParticipant, IncidentType, ParticipantRole, VictimOutcome
+
+
+# Facet name -> column whose values it counts
+INCIDENT_FACETS = {
+    "type": Incident.type,
+    "year": Incident.date_year,
+    "set_id": Member.set_id,  # Sets of the incident's participants
+    "role": IncidentParticipant.role,
+    "outcome": IncidentParticipant.outcome,
+}
+
+MEMBER_FACETS = {
+    "status": Member.status,
+    "affiliation_type": Member.affiliation_type,
+    "set_id": Member.set_id,
+    "alliance_id": Member.alliance_id,
+}
+
+
+def incident_filters(types: Optional[Sequence[IncidentType]] = None, years: Optional[Sequence[int]] = None,
+                     set_ids: Optional[Sequence[str]] = None, roles: Optional[Sequence[ParticipantRole]] = None,
+                     outcomes: Optional[Sequence[VictimOutcome]] = None) -> list:
+    """
+    WHERE criteria for the incident list. Values of one parameter are ORed;
+    parameters are ANDed. set_ids, roles and outcomes must all hold for the
+    same participant: set_ids=X&roles=VICTIM means someone from set X was a
+    victim.
+    """
+    criteria = []
+    if types:
+        criteria.append(Incident.type.in_(types))
+    if years:
+        criteria.append(Incident.date_year.in_(years))
+    if set_ids or roles or outcomes:
+        # Aliased so the subquery does not correlate with the facet query's own participant join.
+        # An uncorrelated IN lets SQLite drive from the participant indexes instead of
+        # testing EXISTS against every incident.
+        participant, member = aliased(IncidentParticipant), aliased(Member)
+        matches = select(participant.incident_id)
+        if roles:
+            matches = matches.where(participant.role.in_(roles))
+        if outcomes:
+            matches = matches.where(participant.outcome.in_(outcomes))
+        if set_ids:
+            matches = matches.where(participant.member_id.in_(select(member.id).where(member.set_id.in_(set_ids))))
+        criteria.append(Incident.id.in_(matches))
+    return criteria
+
+
+def member_filters(statuses: Optional[Sequence[MemberStatus]] = None,
+                   affiliation_types: Optional[Sequence[AffiliationType]] = None,
+                   set_ids: Optional[Sequence[str]] = None, alliance_ids: Optional[Sequence[str]] = None) -> list:
+    """WHERE criteria for the member list. Values of one parameter are ORed; parameters are ANDed."""
+    criteria = []
+    for column, values in ((Member.status, statuses), (Member.affiliation_type, affiliation_types),
+                           (Member.set_id, set_ids), (Member.alliance_id, alliance_ids)):
+        if values:
+            criteria.append(column.in_(values))
+    return criteria
+
+
+def _facet_counts(db: Session, rows, row_id, facets: Dict[str, object]) -> Dict[str, Dict[str, int]]:
+    """Count distinct row_id per (facet, value) over rows in a single GROUP BY."""
+    names = union_all(*(select(literal(name).label("name")) for name in facets)).subquery("facets")
+    value = case({name: cast(column, String) for name, column in facets.items()}, value=names.c.name)
+    query = (
+        rows.join(names, true())
+        .with_only_columns(names.c.name, value, func.count(distinct(row_id)))
+        .group_by(names.c.name, value)
+    )
+    counts: Dict[str, Dict[str, int]] = {name: {} for name in facets}
+    for name, facet_value, count in db.execute(query):
+        if facet_value is not None:
+            counts[name][facet_value] = count
+    return counts
+
+
+def get_incident_facets(db: Session, criteria: List = ()) -> Dict[str, Dict[str, int]]:
+    """Per-value counts of incidents matching criteria, for every incident facet."""
+    rows = (
+        select(Incident.id)
+        .outerjoin(IncidentParticipant, IncidentParticipant.incident_id == Incident.id)
+        .outerjoin(Member, Member.id == IncidentParticipant.member_id)
+        .where(*criteria)
+    )
+    return _facet_counts(db, rows, Incident.id, INCIDENT_FACETS)
+
+
+def get_member_facets(db: Session, criteria: List = ()) -> Dict[str, Dict[str, int]]:
+    """Per-value counts of members matching criteria, for every member facet."""
+    return _facet_counts(db, select(Member.id).where(*criteria), Member.id, MEMBER_FACETS)
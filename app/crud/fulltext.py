@@ -0,0 +1,231 @@
+"""
+Full-text search index shared by the search_* CRUD functions.
+
+SQLite uses FTS5 virtual tables (``<table>_fts``) with the entity table as
+external content, kept in sync by insert/update/delete triggers. PostgreSQL
+uses a generated ``search_vector`` tsvector column with a GIN index. Both
+rank with BM25-style weighting and can return highlighted snippets.
+
+Query words match whole index tokens by prefix ("mile" finds "7 Mile",
+"ile" does not), unlike the LIKE substring matching the search functions
+fall back to without an index.
+
+FTS5 addresses rows by the content table's rowid, which VACUUM may
+renumber; run rebuild_search_index after a VACUUM.
+"""
+from sqlalchemy import text, inspect
+from sqlalchemy.engine import Engine, Connection
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, NamedTuple, Union
+from markupsafe import Markup, escape
+from app.crud.loaders import with_profile
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+
+# Indexed columns per table with their weight class (A highest, D lowest)
+SEARCH_COLUMNS: Dict[str, Dict[str, str]] = {
+    "members": {"nicknames": "A", "first_name": "A", "last_name": "A", "bio": "D"},
+    "sets": {"primary_name": "A", "names": "A", "territory": "B", "bio": "D"},
+    "alliances": {"name": "A", "bio": "D"},
+    "incidents": {"location": "B", "description": "D"},
+    "sources": {"title": "A", "url": "C", "notes": "D"},
+}
+
+# BM25 column weights used by SQLite for each weight class
+BM25_WEIGHTS = {"A": 10.0, "B": 5.0, "C": 2.0, "D": 1.0}
+
+# Columns stored as JSON; their text form is indexed
+JSON_COLUMNS = {"nicknames", "names"}
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+
+# Delimiters the database puts around matches, swapped for the tags once the text is escaped
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+
+# Whether the index exists, keyed by database URL
+_available: Dict[str, bool] = {}
+
+
+class SearchHit(NamedTuple):
+    """A ranked full-text match."""
+    id: str
+    score: float
+    snippet: str  # HTML: escaped text with matches in SNIPPET_START/SNIPPET_END
+
+
+def _sqlite_statements(table: str, columns: List[str]) -> List[str]:
+    fts = f"{table}_fts"
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='rowid', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values}); END",
+    ]
+
+
+def _postgres_document(columns: Dict[str, str]) -> str:
+    parts = []
+    for column, weight in columns.items():
+        value = f"{column}::text" if column in JSON_COLUMNS else column
+        parts.append(f"setweight(to_tsvector('simple', coalesce({value}, '')), '{weight}')")
+    return " || ".join(parts)
+
+
+def _create_index(conn: Connection) -> bool:
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        existing = set(inspect(conn).get_table_names())
+        for table, columns in SEARCH_COLUMNS.items():
+            for statement in _sqlite_statements(table, list(columns)):
+                conn.exec_driver_sql(statement)
+            if f"{table}_fts" not in existing:
+                conn.exec_driver_sql(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+        return True
+    if dialect == "postgresql":
+        for table, columns in SEARCH_COLUMNS.items():
+            conn.exec_driver_sql(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS ({_postgres_document(columns)}) STORED"
+            )
+            conn.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING GIN (search_vector)"
+            )
+        return True
+    return False
+
+
+def create_search_index(bind: Union[Engine, Connection]) -> bool:
+    """
+    Create the full-text index for every searchable table if it is missing.
+    
+    Safe to call on every startup. Returns whether full-text search is
+    available; on other databases (or SQLite builds without FTS5) the
+    search functions fall back to LIKE matching.
+    """
+    key = str(bind.engine.url)
+    try:
+        if isinstance(bind, Engine):
+            with bind.begin() as conn:
+                _available[key] = _create_index(conn)
+        else:
+            _available[key] = _create_index(bind)
+    except Exception:
+        logger.exception("Full-text index unavailable, falling back to LIKE search")
+        _available[key] = False
+    return _available[key]
+
+
+def rebuild_search_index(engine: Engine) -> None:
+    """Rebuild the SQLite FTS5 tables from their content tables."""
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        for table in SEARCH_COLUMNS:
+            conn.exec_driver_sql(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+
+
+def fulltext_available(db: Session) -> bool:
+    """Whether the full-text index exists for this session's database."""
+    engine = db.get_bind()
+    key = str(engine.url)
+    if key not in _available:
+        dialect = engine.dialect.name
+        if dialect == "sqlite":
+            _available[key] = "members_fts" in inspect(engine).get_table_names()
+        elif dialect == "postgresql":
+            columns = {column["name"] for column in inspect(engine).get_columns("members")}
+            _available[key] = "search_vector" in columns
+        else:
+            _available[key] = False
+    return _available[key]
+
+
+def _terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+def _highlight(snippet: str) -> str:
+    """Escape a raw snippet and wrap its delimited matches in <mark> tags."""
+    head, *matches = snippet.split(_MATCH_START)
+    html = escape(head)
+    for part in matches:
+        matched, _, rest = part.partition(_MATCH_END)
+        html += Markup(SNIPPET_START) + escape(matched) + Markup(SNIPPET_END) + escape(rest)
+    return str(html)
+
+
+def fulltext_search(db: Session, table: str, query: str, skip: int = 0, limit: int = 100,
+                    snippets: bool = False) -> Optional[List[SearchHit]]:
+    """
+    Rank rows of a table against a query, best match first.
+    
+    Each word in the query is matched as a token prefix and all words must
+    match. Returns None when no full-text index is available.
+    """
+    if not fulltext_available(db):
+        return None
+    terms = _terms(query)
+    if not terms:
+        return []
+    
+    if db.get_bind().dialect.name == "sqlite":
+        fts = f"{table}_fts"
+        weights = ", ".join(str(BM25_WEIGHTS[weight]) for weight in SEARCH_COLUMNS[table].values())
+        snippet = (f"snippet({fts}, -1, '{_MATCH_START}', '{_MATCH_END}', '…', 12)"
+                   if snippets else "''")
+        statement = text(
+            f"SELECT t.id, -bm25({fts}, {weights}) AS score, {snippet} "
+            f"FROM {fts} JOIN {table} t ON t.rowid = {fts}.rowid "
+            f"WHERE {fts} MATCH :match ORDER BY bm25({fts}, {weights}) "
+            f"LIMIT :limit OFFSET :skip"
+        )
+        match = " ".join(f'"{term}"*' for term in terms)
+    else:
+        document = " || ' ' || ".join(
+            f"coalesce({column}{'::text' if column in JSON_COLUMNS else ''}, '')"
+            for column in SEARCH_COLUMNS[table]
+        )
+        snippet = (f"ts_headline('simple', {document}, q, "
+                   f"'StartSel={_MATCH_START}, StopSel={_MATCH_END}, MaxWords=24, MinWords=8')"
+                   if snippets else "''")
+        statement = text(
+            f"SELECT id, ts_rank_cd(search_vector, q) AS score, {snippet} "
+            f"FROM {table}, to_tsquery('simple', :match) q "
+            f"WHERE search_vector @@ q ORDER BY score DESC, id "
+            f"LIMIT :limit OFFSET :skip"
+        )
+        match = " & ".join(f"{term}:*" for term in terms)
+    
+    rows = db.execute(statement, {"match": match, "limit": limit, "skip": skip}).all()
+    return [SearchHit(row[0], row[1], _highlight(row[2])) for row in rows]
+
+
+def fulltext_ids(db: Session, table: str, query: str, skip: int = 0, limit: int = 100) -> Optional[List[str]]:
+    """IDs of the best matches for a query, or None when no index is available."""
+    hits = fulltext_search(db, table, query, skip, limit)
+    if hits is None:
+        return None
+    return [hit.id for hit in hits]
+
+
+def load_in_order(db: Session, model, ids: List[str], profile: Optional[str] = None) -> list:
+    """Load model instances by ID, preserving the order of ids."""
+    if not ids:
+        return []
+    query = with_profile(db.query(model), model, profile)
+    by_id = {obj.id: obj for obj in query.filter(model.id.in_(ids))}
+    return [by_id[obj_id] for obj_id in ids if obj_id in by_id]
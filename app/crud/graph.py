@@ -0,0 +1,339 @@
+"""Graph snapshot building and caching."""
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import FrozenSet, Iterator, Optional, Dict, List, Tuple
+from collections import defaultdict
+from dataclasses import dataclass
+import json
+import threading
+from app.database import SessionLocal
+from app.models.member import Member
+from app.models.set import Set, SetStatus
+from app.models.associations import set_allies, set_enemies
+from app.crud.version import get_versions
+
+
+# Tables whose contents appear in the graph; a write to any of them
+# produces a new snapshot version
+GRAPH_TABLES = ("sets", "members", "set_allies", "set_enemies")
+
+# Member nodes are capped to avoid clutter
+MEMBER_NODE_LIMIT = 100
+
+
+def _dumps(item: dict) -> str:
+    return json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+
+
+def _graph_versions(db: Session) -> Tuple[int, ...]:
+    versions = get_versions(db, *GRAPH_TABLES)
+    return tuple(versions[table] for table in GRAPH_TABLES)
+
+
+def get_graph_etag(db: Session) -> str:
+    """Strong ETag for the graph derived from the versions of its tables."""
+    return '"graph-' + "-".join(map(str, _graph_versions(db))) + '"'
+
+
+def iter_graph_json(db: Session) -> Iterator[str]:
+    """Yield the graph as JSON text piece by piece, one node or edge at a time."""
+    # Member edges are buffered so nodes and edges stay in separate arrays;
+    # there are at most MEMBER_NODE_LIMIT of them
+    member_edges = []
+    separator = ""
+    
+    yield '{"nodes":['
+    for set_id, primary_name in db.query(Set.id, Set.primary_name).yield_per(1000):
+        yield separator + _dumps({
+            "id": f"set-{set_id}",
+            "label": primary_name,
+            "type": "set",
+            "group": "set",
+            "size": 20
+        })
+        separator = ","
+    
+    members = db.query(Member).limit(MEMBER_NODE_LIMIT)
+    for member in members:
+        yield separator + _dumps({
+            "id": f"member-{member.id}",
+            "label": member.display_name,
+            "type": "member",
+            "group": "member",
+            "size": 10
+        })
+        separator = ","
+        if member.set_id:
+            member_edges.append({
+                "from": f"member-{member.id}",
+                "to": f"set-{member.set_id}",
+                "type": "member_of",
+                "color": {"color": "#6b7280"}
+            })
+    
+    yield '],"edges":['
+    separator = ""
+    # Each ally/enemy pair is stored once, so there are no duplicates
+    ally_rows = db.execute(select(set_allies.c.set_a_id, set_allies.c.set_b_id)).yield_per(1000)
+    for set_a_id, set_b_id in ally_rows:
+        yield separator + _dumps({
+            "from": f"set-{set_a_id}",
+            "to": f"set-{set_b_id}",
+            "type": "ally",
+            "color": {"color": "#22c55e"}
+        })
+        separator = ","
+    
+    enemy_rows = db.execute(select(set_enemies.c.set_a_id, set_enemies.c.set_b_id)).yield_per(1000)
+    for set_a_id, set_b_id in enemy_rows:
+        yield separator + _dumps({
+            "from": f"set-{set_a_id}",
+            "to": f"set-{set_b_id}",
+            "type": "enemy",
+            "color": {"color": "#ef4444"},
+            "dashes": True
+        })
+        separator = ","
+    
+    for edge in member_edges:
+        yield separator + _dumps(edge)
+        separator = ","
+    yield "]}"
+
+
+class GraphSnapshotCache:
+    """Holds the most recent serialized graph together with its ETag."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._etag: Optional[str] = None
+        self._body: Optional[bytes] = None
+    
+    def get(self, etag: str) -> Optional[bytes]:
+        """Return the cached body if it was built for this ETag."""
+        with self._lock:
+            return self._body if self._etag == etag else None
+    
+    def store(self, etag: str, body: bytes) -> None:
+        """Replace the cached snapshot."""
+        with self._lock:
+            self._etag = etag
+            self._body = body
+    
+    def clear(self) -> None:
+        """Drop the cached snapshot."""
+        with self._lock:
+            self._etag = None
+            self._body = None
+
+
+graph_snapshot = GraphSnapshotCache()
+
+
+def stream_graph_snapshot(etag: str) -> Iterator[bytes]:
+    """
+    Stream a freshly built graph and cache it once it is complete.
+    
+    Uses its own session because the response outlives the request's
+    session. The result is only cached if no graph table changed between
+    computing the ETag and reading the data.
+    """
+    chunks = []
+    with SessionLocal() as db:
+        cacheable = get_graph_etag(db) == etag
+        for piece in iter_graph_json(db):
+            chunk = piece.encode("utf-8")
+            chunks.append(chunk)
+            yield chunk
+    if cacheable:
+        graph_snapshot.store(etag, b"".join(chunks))
+
+
+@dataclass
+class SetNode:
+    """Set attributes kept in the adjacency index."""
+    primary_name: str
+    status: SetStatus
+    alliance_id: Optional[str]
+
+
+@dataclass(frozen=True)
+class GraphSnapshot:
+    """
+    One build of the adjacency maps over set_allies, set_enemies and
+    members.set_id. Never modified after it is built; a rebuild replaces
+    the whole snapshot.
+    """
+    versions: Tuple[int, ...]  # of GRAPH_TABLES when it was built
+    sets: Dict[str, SetNode]
+    allies: Dict[str, FrozenSet[str]]
+    enemies: Dict[str, FrozenSet[str]]
+    members: Dict[str, Tuple[str, ...]]
+    
+    def neighborhood(self, set_id: str, hops: int, max_nodes: int,
+                     edge_types: List[str], status: Optional[SetStatus] = None,
+                     alliance_id: Optional[str] = None) -> tuple:
+        """
+        Breadth-first walk from set_id over the allowed edge types.
+        
+        Sets that fail the status/alliance filters are neither included nor
+        walked through (the starting set is always included). Returns the
+        included set IDs in BFS order and whether the node budget cut the
+        walk short.
+        """
+        adjacency = [self.allies if edge_type == "ally" else self.enemies for edge_type in edge_types]
+        
+        def allowed(candidate: str) -> bool:
+            node = self.sets.get(candidate)
+            if node is None:
+                return False
+            if status is not None and node.status != status:
+                return False
+            if alliance_id is not None and node.alliance_id != alliance_id:
+                return False
+            return True
+        
+        included = [set_id]
+        seen = {set_id}
+        frontier = [set_id]
+        for _ in range(hops):
+            next_frontier = []
+            for current in frontier:
+                for links in adjacency:
+                    for neighbour in sorted(links.get(current, ())):
+                        if neighbour in seen or not allowed(neighbour):
+                            continue
+                        if len(included) >= max_nodes:
+                            return included, True
+                        seen.add(neighbour)
+                        included.append(neighbour)
+                        next_frontier.append(neighbour)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return included, False
+
+
+class GraphIndex:
+    """
+    Holds the current GraphSnapshot.
+    
+    Rebuilt lazily whenever the graph tables' versions change, so
+    neighbourhood queries never touch the link tables. Readers take
+    `snapshot` once and use that object throughout.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.snapshot = GraphSnapshot((), {}, {}, {}, {})
+    
+    def ensure_current(self, db: Session) -> GraphSnapshot:
+        """
+        Rebuild the snapshot if any graph table changed since it was built, and return it.
+        
+        The build runs outside the lock: through the async CRUD wrappers its
+        queries yield to the event loop, and another request on the same
+        thread would block on a held lock forever. Concurrent callers may
+        each build; the lock only guards the swap, where the newest wins.
+        """
+        versions = _graph_versions(db)
+        snapshot = self.snapshot
+        if versions == snapshot.versions:
+            return snapshot
+        snapshot = self._build(db, versions)
+        with self._lock:
+            if all(new >= old for new, old in zip(versions, self.snapshot.versions)):
+                self.snapshot = snapshot
+        return snapshot
+    
+    @staticmethod
+    def _build(db: Session, versions: Tuple[int, ...]) -> GraphSnapshot:
+        sets = {
+            set_id: SetNode(primary_name, status, alliance_id)
+            for set_id, primary_name, status, alliance_id in db.query(
+                Set.id, Set.primary_name, Set.status, Set.alliance_id
+            )
+        }
+        allies = defaultdict(set)
+        for set_a_id, set_b_id in db.execute(select(set_allies.c.set_a_id, set_allies.c.set_b_id)):
+            allies[set_a_id].add(set_b_id)
+            allies[set_b_id].add(set_a_id)
+        enemies = defaultdict(set)
+        for set_a_id, set_b_id in db.execute(select(set_enemies.c.set_a_id, set_enemies.c.set_b_id)):
+            enemies[set_a_id].add(set_b_id)
+            enemies[set_b_id].add(set_a_id)
+        members = defaultdict(list)
+        for member_id, set_id in db.query(Member.id, Member.set_id).filter(Member.set_id.isnot(None)):
+            members[set_id].append(member_id)
+        
+        return GraphSnapshot(
+            versions, sets,
+            {set_id: frozenset(links) for set_id, links in allies.items()},
+            {set_id: frozenset(links) for set_id, links in enemies.items()},
+            {set_id: tuple(member_ids) for set_id, member_ids in members.items()},
+        )
+
+
+graph_index = GraphIndex()
+
+
+def get_neighborhood(db: Session, set_id: str, hops: int = 1, max_nodes: int = 200,
+                     edge_types: Optional[List[str]] = None, status: Optional[SetStatus] = None,
+                     alliance_id: Optional[str] = None, include_members: bool = False) -> Optional[dict]:
+    """
+    Get the k-hop subgraph around a set, in the same format as /api/graph.
+    
+    Returns None if the set does not exist.
+    """
+    snapshot = graph_index.ensure_current(db)
+    if set_id not in snapshot.sets:
+        return None
+    edge_types = edge_types or ["ally", "enemy"]
+    
+    set_ids, truncated = snapshot.neighborhood(
+        set_id, hops, max_nodes, edge_types, status=status, alliance_id=alliance_id
+    )
+    included = set(set_ids)
+    
+    nodes = [{
+        "id": f"set-{included_id}",
+        "label": snapshot.sets[included_id].primary_name,
+        "type": "set",
+        "group": "set",
+        "size": 20
+    } for included_id in set_ids]
+    edges = []
+    
+    for edge_type, links, extra in (("ally", snapshot.allies, {"color": {"color": "#22c55e"}}),
+                                    ("enemy", snapshot.enemies, {"color": {"color": "#ef4444"}, "dashes": True})):
+        if edge_type not in edge_types:
+            continue
+        for set_a_id in set_ids:
+            for set_b_id in sorted(links.get(set_a_id, ())):
+                if set_a_id < set_b_id and set_b_id in included:
+                    edges.append({"from": f"set-{set_a_id}", "to": f"set-{set_b_id}", "type": edge_type, **extra})
+    
+    if include_members:
+        budget = max_nodes - len(nodes)
+        member_ids = [member_id for included_id in set_ids for member_id in snapshot.members.get(included_id, ())]
+        if len(member_ids) > budget:
+            member_ids = member_ids[:budget]
+            truncated = True
+        if member_ids:
+            members = db.query(Member).filter(Member.id.in_(member_ids)).all()
+            for member in members:
+                nodes.append({
+                    "id": f"member-{member.id}",
+                    "label": member.display_name,
+                    "type": "member",
+                    "group": "member",
+                    "size": 10
+                })
+                edges.append({
+                    "from": f"member-{member.id}",
+                    "to": f"set-{member.set_id}",
+                    "type": "member_of",
+                    "color": {"color": "#6b7280"}
+                })
+    
+    return {"nodes": nodes, "edges": edges, "truncated": truncated}
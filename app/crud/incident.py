@@ -3,7 +3,17 @@ from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from typing import Optional, List
 from app.models.incident import Incident, IncidentParticipant
+from app.models.base import validate_dates
 from app.schemas.incident import IncidentCreate, IncidentUpdate
+from app.crud.summary import adjust_counter
+from app.crud.fulltext import fulltext_ids, load_in_order
+from app.crud.typeahead import typeahead_index
+from app.crud.cache import entity_cache
+from app.crud.pagination import keyset
+from app.crud.loaders import with_profile
+from app.crud.member import apply_participant_stats
+from app.crud.version import bump_version
+from app.crud.rollup import add_rollup_counts, move_incident, rollup_key
 
 
 def create_incident(db: Session, incident: IncidentCreate) -> Incident:
@@ -21,32 +31,57 @@ def create_incident(db: Session, incident: IncidentCreate) -> Incident:
         )
         db.add(db_participant)
     
+    apply_participant_stats(db, incident.participants)
+    add_rollup_counts(db, {rollup_key(incident, incident.participants): 1})
+    adjust_counter(db, "incidents", 1)
+    versions = bump_version(db, "incidents", "incident_participants", "member_stats", "incident_rollups")
     db.commit()
     db.refresh(db_incident)
+    typeahead_index.update_entry(db_incident, versions)
     return db_incident
 
 
-def get_incident(db: Session, incident_id: str) -> Optional[Incident]:
-    """Get an incident by ID."""
-    return db.query(Incident).filter(Incident.id == incident_id).first()
+def get_incident(db: Session, incident_id: str, profile: Optional[str] = None) -> Optional[Incident]:
+    """Get an incident by ID, eager-loading per the given loader profile."""
+    return with_profile(db.query(Incident), Incident, profile).filter(Incident.id == incident_id).first()
 
 
-def get_incidents(db: Session, skip: int = 0, limit: int = 100) -> List[Incident]:
-    """Get all incidents with pagination."""
-    return db.query(Incident).offset(skip).limit(limit).all()
+def get_incidents(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None,
+                  profile: Optional[str] = None) -> List[Incident]:
+    """Get all incidents in ID order, starting after the given ID."""
+    query = with_profile(db.query(Incident), Incident, profile)
+    return keyset(query, Incident.id, after).offset(skip).limit(limit).all()
 
 
 def update_incident(db: Session, incident_id: str, incident: IncidentUpdate) -> Optional[Incident]:
-    """Update an incident."""
+    """Update an incident, replacing its participants when they are given."""
     db_incident = get_incident(db, incident_id)
     if not db_incident:
         return None
     
-    for key, value in incident.model_dump(exclude_unset=True).items():
+    old_key = rollup_key(db_incident, db_incident.participants)
+    for key, value in incident.model_dump(exclude_unset=True, exclude={'participants'}).items():
         setattr(db_incident, key, value)
+    validate_dates(db_incident)
     
+    if incident.participants is not None:
+        apply_participant_stats(db, db_incident.participants, sign=-1)
+        db_incident.participants.clear()
+        db.flush()
+        for participant in incident.participants:
+            db_incident.participants.append(IncidentParticipant(**participant.model_dump()))
+        apply_participant_stats(db, incident.participants)
+        bump_version(db, "incident_participants", "member_stats")
+    
+    new_key = rollup_key(db_incident, db_incident.participants)
+    if new_key != old_key:
+        move_incident(db, old_key, new_key)
+        bump_version(db, "incident_rollups")
+    versions = bump_version(db, "incidents")
     db.commit()
     db.refresh(db_incident)
+    typeahead_index.update_entry(db_incident, versions)
+    entity_cache.invalidate("incident", incident_id)
     return db_incident
 
 
@@ -56,15 +91,26 @@ def delete_incident(db: Session, incident_id: str) -> bool:
     if not db_incident:
         return False
     
+    apply_participant_stats(db, db_incident.participants, sign=-1)
+    add_rollup_counts(db, {rollup_key(db_incident, db_incident.participants): -1})
     db.delete(db_incident)
+    adjust_counter(db, "incidents", -1)
+    versions = bump_version(db, "incidents", "incident_participants", "member_stats", "incident_rollups")
     db.commit()
+    typeahead_index.remove_entry("incident", incident_id, versions)
+    entity_cache.invalidate("incident", incident_id)
     return True
 
 
-def search_incidents(db: Session, query: str, skip: int = 0, limit: int = 100) -> List[Incident]:
-    """Search incidents by location or description."""
+def search_incidents(db: Session, query: str, skip: int = 0, limit: int = 100,
+                     profile: Optional[str] = None) -> List[Incident]:
+    """Search incidents by location or description, best match first."""
+    ids = fulltext_ids(db, "incidents", query, skip, limit)
+    if ids is not None:
+        return load_in_order(db, Incident, ids, profile)
+    
     search_pattern = f"%{query}%"
-    return db.query(Incident).filter(
+    return with_profile(db.query(Incident), Incident, profile).filter(
         or_(
             Incident.location.like(search_pattern),
             Incident.description.like(search_pattern)
@@ -0,0 +1,108 @@
+"""
+Loader profiles: what each kind of view eager-loads.
+
+Relationships are lazy by default, so a query loads only the columns and
+relationships named by the profile passed to the crud read functions:
+
+- "list": only the columns a table row shows, with to-one relations joined
+  in and collection sizes computed by COUNT subqueries, so a page is one
+  query no matter how many rows it has.
+- "detail": everything the detail template touches, in a fixed number of
+  SELECT ... IN queries.
+- "api": columns only; the Read schemas never touch relationships, and
+  raiseload makes any accidental lazy load fail loudly instead of firing
+  one query per row.
+"""
+from sqlalchemy import func, select
+from sqlalchemy.orm import (
+    joinedload, load_only, raiseload, selectinload, with_expression
+)
+from typing import Optional
+from app.models.member import Member
+from app.models.set import Set
+from app.models.alliance import Alliance
+from app.models.incident import Incident, IncidentParticipant
+from app.models.source import Source
+
+
+def _count(column, key):
+    """Correlated COUNT(*) of rows whose column equals the outer row's key."""
+    return select(func.count()).where(column == key).scalar_subquery()
+
+
+set_member_count = with_expression(Set.member_count, _count(Member.set_id, Set.id))
+
+LOADER_PROFILES = {
+    Member: {
+        "list": (
+            load_only(Member.first_name, Member.last_name, Member.nicknames, Member.nickname_unknown,
+                      Member.status, Member.affiliation_type, Member.set_id, Member.alliance_id),
+            joinedload(Member.set).load_only(Set.primary_name),
+            joinedload(Member.alliance_direct).load_only(Alliance.name),
+        ),
+        "detail": (
+            joinedload(Member.set),
+            joinedload(Member.alliance_direct),
+            selectinload(Member.sources),
+            selectinload(Member.incident_participations)
+            .joinedload(IncidentParticipant.incident)
+            .selectinload(Incident.participants)
+            .joinedload(IncidentParticipant.member),
+        ),
+        "api": (raiseload("*"),),
+    },
+    Set: {
+        "list": (
+            load_only(Set.primary_name, Set.names, Set.status, Set.territory, Set.alliance_id),
+            joinedload(Set.alliance).load_only(Alliance.name),
+            set_member_count,
+        ),
+        "detail": (
+            joinedload(Set.alliance),
+            selectinload(Set.members),
+            selectinload(Set.sources),
+        ),
+        "api": (raiseload("*"),),
+    },
+    Alliance: {
+        "list": (
+            load_only(Alliance.name, Alliance.status),
+            with_expression(Alliance.set_count, _count(Set.alliance_id, Alliance.id)),
+            with_expression(Alliance.direct_member_count, _count(Member.alliance_id, Alliance.id)),
+        ),
+        "detail": (
+            selectinload(Alliance.sets).options(set_member_count),
+            selectinload(Alliance.direct_members),
+            selectinload(Alliance.sources),
+        ),
+        "api": (raiseload("*"),),
+    },
+    Incident: {
+        "list": (
+            load_only(Incident.type, Incident.location,
+                      Incident.date_year, Incident.date_month, Incident.date_day),
+            with_expression(Incident.participant_count,
+                            _count(IncidentParticipant.incident_id, Incident.id)),
+        ),
+        "detail": (
+            selectinload(Incident.participants).joinedload(IncidentParticipant.member),
+            selectinload(Incident.sources),
+        ),
+        "api": (raiseload("*"),),
+    },
+    Source: {
+        "list": (
+            load_only(Source.type, Source.title, Source.url,
+                      Source.date_year, Source.date_month, Source.date_day),
+        ),
+        "detail": (),
+        "api": (),
+    },
+}
+
+
+def with_profile(query, model, profile: Optional[str] = None):
+    """Apply a model's named loader profile to a query (no-op when profile is None)."""
+    if profile is None:
+        return query
+    return query.options(*LOADER_PROFILES[model][profile])
@@ -1,29 +1,44 @@
 """CRUD operations for members."""
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func, String
-from typing import Optional, List, Dict
+from sqlalchemy import or_, and_, case, func, String
+from typing import Optional, List, Dict, Iterable
+from app.database import upsert
 from app.models.member import Member
+from app.models.member_stats import MemberStats
 from app.models.incident import IncidentParticipant, ParticipantRole, VictimOutcome
+from app.models.base import validate_dates
 from app.schemas.member import MemberCreate, MemberUpdate
+from app.crud.summary import adjust_counter
+from app.crud.fulltext import fulltext_ids, load_in_order
+from app.crud.typeahead import typeahead_index
+from app.crud.cache import entity_cache
+from app.crud.pagination import keyset
+from app.crud.loaders import with_profile
+from app.crud.version import bump_version
 
 
 def create_member(db: Session, member: MemberCreate) -> Member:
     """Create a new member."""
     db_member = Member(**member.model_dump())
     db.add(db_member)
+    adjust_counter(db, "members", 1)
+    versions = bump_version(db, "members")
     db.commit()
     db.refresh(db_member)
+    typeahead_index.update_entry(db_member, versions)
     return db_member
 
 
-def get_member(db: Session, member_id: str) -> Optional[Member]:
-    """Get a member by ID."""
-    return db.query(Member).filter(Member.id == member_id).first()
+def get_member(db: Session, member_id: str, profile: Optional[str] = None) -> Optional[Member]:
+    """Get a member by ID, eager-loading per the given loader profile."""
+    return with_profile(db.query(Member), Member, profile).filter(Member.id == member_id).first()
 
 
-def get_members(db: Session, skip: int = 0, limit: int = 100) -> List[Member]:
-    """Get all members with pagination."""
-    return db.query(Member).offset(skip).limit(limit).all()
+def get_members(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None,
+                profile: Optional[str] = None) -> List[Member]:
+    """Get all members in ID order, starting after the given ID."""
+    query = with_profile(db.query(Member), Member, profile)
+    return keyset(query, Member.id, after).offset(skip).limit(limit).all()
 
 
 def update_member(db: Session, member_id: str, member: MemberUpdate) -> Optional[Member]:
@@ -34,9 +49,13 @@ def update_member(db: Session, member_id: str, member: MemberUpdate) -> Optional
     
     for key, value in member.model_dump(exclude_unset=True).items():
         setattr(db_member, key, value)
+    validate_dates(db_member)
     
+    versions = bump_version(db, "members")
     db.commit()
     db.refresh(db_member)
+    typeahead_index.update_entry(db_member, versions)
+    entity_cache.invalidate("member", member_id)
     return db_member
 
 
@@ -46,16 +65,26 @@ def delete_member(db: Session, member_id: str) -> bool:
     if not db_member:
         return False
     
+    db.query(MemberStats).filter(MemberStats.member_id == member_id).delete(synchronize_session=False)
     db.delete(db_member)
+    adjust_counter(db, "members", -1)
+    versions = bump_version(db, "members", "member_stats")
     db.commit()
+    typeahead_index.remove_entry("member", member_id, versions)
+    entity_cache.invalidate("member", member_id)
     return True
 
 
-def search_members(db: Session, query: str, skip: int = 0, limit: int = 100) -> List[Member]:
-    """Search members by name, nickname, or bio."""
+def search_members(db: Session, query: str, skip: int = 0, limit: int = 100,
+                   profile: Optional[str] = None) -> List[Member]:
+    """Search members by name, nickname, or bio, best match first."""
+    ids = fulltext_ids(db, "members", query, skip, limit)
+    if ids is not None:
+        return load_in_order(db, Member, ids, profile)
+    
     search_pattern = f"%{query.lower()}%"
     # nicknames is stored as JSON array, cast to text for searching
-    return db.query(Member).filter(
+    return with_profile(db.query(Member), Member, profile).filter(
         or_(
             func.lower(Member.first_name).like(search_pattern),
             func.lower(Member.last_name).like(search_pattern),
@@ -65,47 +94,120 @@ def search_members(db: Session, query: str, skip: int = 0, limit: int = 100) ->
     ).offset(skip).limit(limit).all()
 
 
-def get_member_stats(db: Session, member_id: str) -> Dict[str, int]:
-    """Get computed stats for a member."""
-    # Kills: incidents where member is PERPETRATOR and victim outcome is KILLED
-    kills = db.query(func.count(IncidentParticipant.id)).filter(
-        IncidentParticipant.member_id == member_id,
-        IncidentParticipant.role == ParticipantRole.PERPETRATOR,
-        IncidentParticipant.incident_id.in_(
-            db.query(IncidentParticipant.incident_id).filter(
-                IncidentParticipant.role == ParticipantRole.VICTIM,
-                IncidentParticipant.outcome == VictimOutcome.KILLED
-            )
-        )
-    ).scalar() or 0
-    
-    # Assists: incidents where member is ACCOMPLICE and victim outcome is KILLED
-    assists = db.query(func.count(IncidentParticipant.id)).filter(
-        IncidentParticipant.member_id == member_id,
-        IncidentParticipant.role == ParticipantRole.ACCOMPLICE,
-        IncidentParticipant.incident_id.in_(
-            db.query(IncidentParticipant.incident_id).filter(
-                IncidentParticipant.role == ParticipantRole.VICTIM,
-                IncidentParticipant.outcome == VictimOutcome.KILLED
-            )
-        )
-    ).scalar() or 0
-    
-    # Shootings committed: count of participations as PERPETRATOR
-    shootings_committed = db.query(func.count(IncidentParticipant.id)).filter(
-        IncidentParticipant.member_id == member_id,
-        IncidentParticipant.role == ParticipantRole.PERPETRATOR
-    ).scalar() or 0
+STAT_FIELDS = ("kills", "assists", "shootings_committed", "times_shot")
+
+
+def _empty_stats() -> Dict[str, int]:
+    return {field: 0 for field in STAT_FIELDS}
+
+
+def participant_stat_deltas(participants: Iterable) -> Dict[str, Dict[str, int]]:
+    """
+    Compute per-member stat contributions of one incident's participants.
     
-    # Times shot: count of participations as VICTIM
-    times_shot = db.query(func.count(IncidentParticipant.id)).filter(
-        IncidentParticipant.member_id == member_id,
-        IncidentParticipant.role == ParticipantRole.VICTIM
-    ).scalar() or 0
+    Works on ORM participants and participant schemas alike (anything with
+    member_id, role and outcome).
+    """
+    participants = list(participants)
+    fatal = any(
+        p.role == ParticipantRole.VICTIM and p.outcome == VictimOutcome.KILLED
+        for p in participants
+    )
     
+    deltas: Dict[str, Dict[str, int]] = {}
+    for p in participants:
+        delta = deltas.setdefault(p.member_id, _empty_stats())
+        if p.role == ParticipantRole.PERPETRATOR:
+            delta["shootings_committed"] += 1
+            if fatal:
+                delta["kills"] += 1
+        elif p.role == ParticipantRole.ACCOMPLICE:
+            if fatal:
+                delta["assists"] += 1
+        elif p.role == ParticipantRole.VICTIM:
+            delta["times_shot"] += 1
+    return deltas
+
+
+def apply_participant_stats(db: Session, participants: Iterable, sign: int = 1) -> None:
+    """Add (sign=1) or remove (sign=-1) an incident's participants from member_stats."""
+    add_member_stats(db, {
+        member_id: {field: sign * value for field, value in delta.items()}
+        for member_id, delta in participant_stat_deltas(participants).items()
+    })
+
+
+def add_member_stats(db: Session, deltas: Dict[str, Dict[str, int]]) -> None:
+    """
+    Add many members' stat deltas at once, e.g. for a bulk incident import,
+    with one executemany upsert so concurrent writers can both create a
+    member's row.
+    """
+    rows = [
+        {"member_id": member_id, **{field: delta.get(field, 0) for field in STAT_FIELDS}}
+        for member_id, delta in deltas.items() if any(delta.values())
+    ]
+    if not rows:
+        return
+    table = MemberStats.__table__
+    statement = upsert(db, table)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.member_id],
+        set_={field: table.c[field] + statement.excluded[field] for field in STAT_FIELDS}
+    ), rows)
+
+
+def get_member_stats(db: Session, member_id: str) -> Dict[str, int]:
+    """Get precomputed stats for a member."""
+    row = db.query(*[getattr(MemberStats, field) for field in STAT_FIELDS]).filter(
+        MemberStats.member_id == member_id
+    ).first()
+    if not row:
+        return _empty_stats()
+    return dict(zip(STAT_FIELDS, row))
+
+
+def get_member_stats_bulk(db: Session, member_ids: List[str]) -> Dict[str, Dict[str, int]]:
+    """Get precomputed stats for many members in one query, keyed by member ID."""
+    if not member_ids:
+        return {}
+    rows = db.query(
+        Member.id, *[getattr(MemberStats, field) for field in STAT_FIELDS]
+    ).outerjoin(MemberStats, MemberStats.member_id == Member.id).filter(
+        Member.id.in_(member_ids)
+    ).all()
     return {
-        "kills": kills,
-        "assists": assists,
-        "shootings_committed": shootings_committed,
-        "times_shot": times_shot
+        row[0]: {field: value or 0 for field, value in zip(STAT_FIELDS, row[1:])}
+        for row in rows
     }
+
+
+def rebuild_member_stats(db: Session) -> int:
+    """Recompute member_stats from incident_participants; returns rows written."""
+    fatal = db.query(IncidentParticipant.incident_id).filter(
+        IncidentParticipant.role == ParticipantRole.VICTIM,
+        IncidentParticipant.outcome == VictimOutcome.KILLED
+    ).distinct().subquery()
+    is_fatal = fatal.c.incident_id.isnot(None)
+    
+    def count_if(*conditions):
+        return func.sum(case((and_(*conditions), 1), else_=0))
+    
+    rows = db.query(
+        IncidentParticipant.member_id,
+        count_if(IncidentParticipant.role == ParticipantRole.PERPETRATOR, is_fatal),
+        count_if(IncidentParticipant.role == ParticipantRole.ACCOMPLICE, is_fatal),
+        count_if(IncidentParticipant.role == ParticipantRole.PERPETRATOR),
+        count_if(IncidentParticipant.role == ParticipantRole.VICTIM),
+    ).outerjoin(fatal, fatal.c.incident_id == IncidentParticipant.incident_id).group_by(
+        IncidentParticipant.member_id
+    ).all()
+    
+    db.query(MemberStats).delete(synchronize_session=False)
+    db.add_all([
+        MemberStats(member_id=row[0], **dict(zip(STAT_FIELDS, row[1:])))
+        for row in rows
+    ])
+    bump_version(db, "member_stats")
+    db.commit()
+    return len(rows)
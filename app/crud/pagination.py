@@ -0,0 +1,58 @@
+"""Keyset (cursor) pagination helpers for list queries."""
+from base64 import b64decode, urlsafe_b64encode
+from sqlalchemy import tuple_
+from typing import Optional, Sequence, Tuple
+import binascii
+from app.models.base import fuzzy_sort_key
+
+
+def encode_cursor(key: str) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    return urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Decode a cursor back to its sort key; raises ValueError if malformed."""
+    try:
+        return b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def next_cursor(items: Sequence, limit: int) -> Optional[str]:
+    """Cursor for the page after items (ORM objects or row dicts), or None when this was the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last["id"] if isinstance(last, dict) else last.id)
+
+
+def keyset(query, key_column, after: Optional[str] = None):
+    """Order a query by an indexed unique column, starting after the given key."""
+    if after is not None:
+        query = query.filter(key_column > after)
+    return query.order_by(key_column)
+
+
+def next_date_cursor(items: Sequence[dict], limit: int, field: str) -> Optional[str]:
+    """Cursor for the page after newest-first rows ordered by the <field> FuzzyDate, or None on the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    sort_key = fuzzy_sort_key(last[f"{field}_year"], last[f"{field}_month"], last[f"{field}_day"])
+    return encode_cursor(f"{sort_key}:{last['id']}")
+
+
+def decode_date_cursor(cursor: str) -> Tuple[int, str]:
+    """Decode a next_date_cursor value to (sort key, ID); raises ValueError if malformed."""
+    sort_key, _, key = decode_cursor(cursor).partition(":")
+    if not sort_key.isdigit() or not key:
+        raise ValueError("Invalid cursor")
+    return int(sort_key), key
+
+
+def date_keyset(query, sort_column, key_column, after: Optional[Tuple[int, str]] = None):
+    """Order a query newest first by a FuzzyDate sort key (ties by key), starting after (sort key, key)."""
+    if after is not None:
+        query = query.filter(tuple_(sort_column, key_column) < after)
+    return query.order_by(sort_column.desc(), key_column.desc())
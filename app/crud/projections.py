@@ -0,0 +1,116 @@
+"""
+Column projections for the JSON API.
+
+The API read paths select exactly the columns of an entity's Read schema
+and build plain dicts from the result rows, so no ORM instances, identity
+map entries or per-row schema validation are involved. Computed fields
+(Member.display_name) are filled in with the model's own property code.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_
+from types import SimpleNamespace
+from typing import List, Optional, Sequence, Tuple
+from app.models.member import Member
+from app.models.set import Set
+from app.models.alliance import Alliance
+from app.models.incident import Incident
+from app.models.source import Source
+from app.models.base import DatePrecision, FuzzyDate
+from app.schemas.member import MemberRead
+from app.schemas.set import SetRead
+from app.schemas.alliance import AllianceRead
+from app.schemas.incident import IncidentRead
+from app.schemas.source import SourceRead
+from app.crud.pagination import date_keyset, keyset
+
+
+READ_SCHEMAS = {
+    Member: MemberRead,
+    Set: SetRead,
+    Alliance: AllianceRead,
+    Incident: IncidentRead,
+    Source: SourceRead,
+}
+
+# FuzzyDate fields each list can be filtered and ordered by, default first
+DATE_FIELDS = {
+    Member: ("dob", "dod", "release"),
+    Set: ("founded",),
+    Alliance: ("founded",),
+    Incident: ("date",),
+    Source: ("date",),
+}
+
+# Read schema fields that are model properties rather than columns
+COMPUTED_FIELDS = {
+    Member: {"display_name": Member.display_name.fget},
+}
+
+
+def read_columns(model) -> list:
+    """The model's columns that its Read schema exposes, in schema order."""
+    columns = model.__table__.c
+    return [columns[name] for name in READ_SCHEMAS[model].model_fields if name in columns]
+
+
+_READ_COLUMNS = {model: read_columns(model) for model in READ_SCHEMAS}
+
+
+def _to_dicts(model, rows) -> List[dict]:
+    computed = COMPUTED_FIELDS.get(model)
+    items = [row._asdict() for row in rows]
+    if computed:
+        for item in items:
+            view = SimpleNamespace(**item)
+            for name, getter in computed.items():
+                item[name] = getter(view)
+    return items
+
+
+def get_rows(db: Session, model, skip: int = 0, limit: int = 100, after: Optional[str] = None,
+             criteria: Sequence = ()) -> List[dict]:
+    """A page of Read-schema dicts matching criteria in ID order, starting after the given ID."""
+    query = keyset(db.query(*_READ_COLUMNS[model]).filter(*criteria), model.id, after)
+    return _to_dicts(model, query.offset(skip).limit(limit).all())
+
+
+def get_row(db: Session, model, entity_id: str) -> Optional[dict]:
+    """One entity as a Read-schema dict, or None if it does not exist."""
+    rows = db.query(*_READ_COLUMNS[model]).filter(model.id == entity_id).all()
+    return _to_dicts(model, rows)[0] if rows else None
+
+
+
+def date_range_criteria(model, field: str, start: Optional[FuzzyDate], end: Optional[FuzzyDate]) -> list:
+    """
+    WHERE criteria for rows whose <field> FuzzyDate could fall between start and end.
+    
+    Dates are compared at their common precision, as FuzzyDate's own
+    comparisons do: "2019" is within from=2019-03, and "March 2019" is
+    within from=2019-03-15. Rows without the date never match.
+    """
+    sort = getattr(model, f"{field}_sort")
+    criteria = []
+    if end is not None:
+        criteria.append(sort <= end.end_key)
+    if start is not None:
+        # Index range from the start of start's year; the residual filter then
+        # drops earlier dates that are at least as precise as the month or day
+        criteria.append(sort >= FuzzyDate(start.year).sort_key)
+        if start.precision > DatePrecision.YEAR:
+            precision = getattr(model, f"{field}_precision")
+            criteria.append(or_(
+                sort >= start.sort_key,
+                precision == DatePrecision.YEAR,
+                and_(precision == DatePrecision.MONTH, sort >= FuzzyDate(start.year, start.month).sort_key),
+            ))
+    return criteria
+
+
+def get_rows_in_range(db: Session, model, field: str, start: Optional[FuzzyDate] = None,
+                      end: Optional[FuzzyDate] = None, skip: int = 0, limit: int = 100,
+                      after: Optional[Tuple[int, str]] = None, criteria: Sequence = ()) -> List[dict]:
+    """A page of Read-schema dicts dated between start and end and matching criteria, newest first."""
+    query = db.query(*_READ_COLUMNS[model]).filter(*criteria, *date_range_criteria(model, field, start, end))
+    query = date_keyset(query, getattr(model, f"{field}_sort"), model.id, after)
+    return _to_dicts(model, query.offset(skip).limit(limit).all())
@@ -0,0 +1,124 @@
+"""
+Incident counts per month, type and fatality, backed by the incident_rollups table.
+
+The incident CRUD functions and the bulk import move an incident between
+buckets as it is created, edited or deleted, so reading a time series costs
+one row per bucket rather than one per incident. Incidents dated only to a
+year are counted in month 0 of that year, undated incidents in year 0; the
+API reports both as null. Year totals fold the month rows at read time.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import case, func
+from typing import Dict, Iterable, List, NamedTuple
+from collections import Counter
+from app.database import upsert
+from app.models.incident import Incident, IncidentParticipant, IncidentType, ParticipantRole, VictimOutcome
+from app.models.incident_rollup import IncidentRollup
+from app.crud.version import bump_version
+
+
+GRANULARITIES = ("month", "year")
+
+
+class RollupKey(NamedTuple):
+    """The bucket an incident is counted in."""
+    year: int
+    month: int
+    type: IncidentType
+    fatal: bool
+
+
+def is_fatal(participants: Iterable) -> bool:
+    """Whether any participant is a killed victim (ORM participants or participant schemas)."""
+    return any(
+        p.role == ParticipantRole.VICTIM and p.outcome == VictimOutcome.KILLED
+        for p in participants
+    )
+
+
+def rollup_key(incident, participants: Iterable) -> RollupKey:
+    """Bucket for an incident (ORM object or create schema) with the given participants."""
+    year = incident.date_year or 0
+    month = (incident.date_month or 0) if year else 0
+    return RollupKey(year, month, IncidentType(incident.type), is_fatal(participants))
+
+
+def add_rollup_counts(db: Session, deltas: Dict[RollupKey, int]) -> None:
+    """
+    Add count deltas to their buckets inside the caller's transaction,
+    upserting so concurrent writers can both create a new bucket.
+    """
+    rows = [{**key._asdict(), "count": delta} for key, delta in deltas.items() if delta]
+    if not rows:
+        return
+    table = IncidentRollup.__table__
+    statement = upsert(db, table).values(rows)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.year, table.c.month, table.c.type, table.c.fatal],
+        set_={"count": table.c.count + statement.excluded["count"]}
+    ))
+
+
+def move_incident(db: Session, old: RollupKey, new: RollupKey) -> None:
+    """Move an edited incident from its old bucket to its new one."""
+    add_rollup_counts(db, Counter({old: -1, new: 1}))
+
+
+def get_incident_rollup(db: Session, granularity: str = "month") -> List[Dict]:
+    """Get incident counts per month (or year), type and fatality, oldest first."""
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+    
+    if granularity == "month":
+        rows = db.query(
+            IncidentRollup.year, IncidentRollup.month, IncidentRollup.type, IncidentRollup.fatal,
+            IncidentRollup.count
+        ).filter(IncidentRollup.count > 0).order_by(
+            IncidentRollup.year, IncidentRollup.month, IncidentRollup.type, IncidentRollup.fatal
+        ).all()
+        return [
+            {"year": year or None, "month": month or None, "type": type_, "fatal": fatal, "count": count}
+            for year, month, type_, fatal, count in rows
+        ]
+    
+    total = func.sum(IncidentRollup.count)
+    rows = db.query(IncidentRollup.year, IncidentRollup.type, IncidentRollup.fatal, total).group_by(
+        IncidentRollup.year, IncidentRollup.type, IncidentRollup.fatal
+    ).having(total > 0).order_by(IncidentRollup.year, IncidentRollup.type, IncidentRollup.fatal).all()
+    return [
+        {"year": year or None, "type": type_, "fatal": fatal, "count": count}
+        for year, type_, fatal, count in rows
+    ]
+
+
+def _rollup_rows(db: Session):
+    """Bucket counts computed from the incidents and participants tables."""
+    fatal = db.query(IncidentParticipant.incident_id).filter(
+        IncidentParticipant.role == ParticipantRole.VICTIM,
+        IncidentParticipant.outcome == VictimOutcome.KILLED
+    ).distinct().subquery()
+    year = func.coalesce(Incident.date_year, 0)
+    month = case((Incident.date_year.is_(None), 0), else_=func.coalesce(Incident.date_month, 0))
+    is_fatal_incident = fatal.c.incident_id.isnot(None)
+    return db.query(year, month, Incident.type, is_fatal_incident, func.count(Incident.id)).outerjoin(
+        fatal, fatal.c.incident_id == Incident.id
+    ).group_by(year, month, Incident.type, is_fatal_incident).all()
+
+
+def rebuild_incident_rollups(db: Session) -> int:
+    """Recompute incident_rollups from the incidents table, e.g. for a backfill; returns buckets written."""
+    rows = _rollup_rows(db)
+    db.query(IncidentRollup).delete(synchronize_session=False)
+    db.add_all([
+        IncidentRollup(year=year, month=month, type=type_, fatal=bool(fatal), count=count)
+        for year, month, type_, fatal, count in rows
+    ])
+    bump_version(db, "incident_rollups")
+    db.commit()
+    return len(rows)
+
+
+def ensure_incident_rollups(db: Session) -> None:
+    """Backfill the rollups if incidents exist but no bucket does, e.g. after create_all on an old database."""
+    if db.query(IncidentRollup.year).first() is None and db.query(Incident.id).first() is not None:
+        rebuild_incident_rollups(db)
@@ -1,29 +1,44 @@
 """CRUD operations for sets."""
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, insert, delete as sql_delete
-from typing import Optional, List
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import or_, and_, insert, select, literal, union_all, update, delete as sql_delete
+from typing import Optional, List, Iterable
 from app.models.set import Set
+from app.models.member import Member
 from app.models.associations import set_allies, set_enemies
+from app.models.base import validate_dates
 from app.schemas.set import SetCreate, SetUpdate
+from app.crud.summary import adjust_counter
+from app.crud.fulltext import fulltext_ids, load_in_order
+from app.crud.typeahead import typeahead_index
+from app.crud.cache import entity_cache
+from app.crud.pagination import keyset
+from app.crud.loaders import with_profile
+from app.crud.version import bump_version
 
 
 def create_set(db: Session, set_data: SetCreate) -> Set:
     """Create a new set."""
     db_set = Set(**set_data.model_dump())
     db.add(db_set)
+    adjust_counter(db, "sets", 1)
+    versions = bump_version(db, "sets")
     db.commit()
     db.refresh(db_set)
+    typeahead_index.update_entry(db_set, versions)
     return db_set
 
 
-def get_set(db: Session, set_id: str) -> Optional[Set]:
-    """Get a set by ID."""
-    return db.query(Set).filter(Set.id == set_id).first()
+def get_set(db: Session, set_id: str, profile: Optional[str] = None) -> Optional[Set]:
+    """Get a set by ID, eager-loading per the given loader profile."""
+    return with_profile(db.query(Set), Set, profile).filter(Set.id == set_id).first()
 
 
-def get_sets(db: Session, skip: int = 0, limit: int = 100) -> List[Set]:
-    """Get all sets with pagination."""
-    return db.query(Set).offset(skip).limit(limit).all()
+def get_sets(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None,
+             profile: Optional[str] = None) -> List[Set]:
+    """Get all sets in ID order, starting after the given ID."""
+    query = with_profile(db.query(Set), Set, profile)
+    return keyset(query, Set.id, after).offset(skip).limit(limit).all()
 
 
 def update_set(db: Session, set_id: str, set_data: SetUpdate) -> Optional[Set]:
@@ -34,9 +49,13 @@ def update_set(db: Session, set_id: str, set_data: SetUpdate) -> Optional[Set]:
     
     for key, value in set_data.model_dump(exclude_unset=True).items():
         setattr(db_set, key, value)
+    validate_dates(db_set)
     
+    versions = bump_version(db, "sets")
     db.commit()
     db.refresh(db_set)
+    typeahead_index.update_entry(db_set, versions)
+    entity_cache.invalidate("set", set_id)
     return db_set
 
 
@@ -46,15 +65,30 @@ def delete_set(db: Session, set_id: str) -> bool:
     if not db_set:
         return False
     
+    # Detach members explicitly, so their cached DTOs can be dropped too
+    member_ids = db.execute(
+        update(Member).where(Member.set_id == set_id).values(set_id=None).returning(Member.id)
+    ).scalars().all()
     db.delete(db_set)
+    adjust_counter(db, "sets", -1)
+    versions = bump_version(db, "sets", "set_allies", "set_enemies", "members")
     db.commit()
+    typeahead_index.remove_entry("set", set_id, versions)
+    entity_cache.invalidate("set", set_id)
+    for member_id in member_ids:
+        entity_cache.invalidate("member", member_id)
     return True
 
 
-def search_sets(db: Session, query: str, skip: int = 0, limit: int = 100) -> List[Set]:
-    """Search sets by name, territory, or bio."""
+def search_sets(db: Session, query: str, skip: int = 0, limit: int = 100,
+                profile: Optional[str] = None) -> List[Set]:
+    """Search sets by name, alias, territory, or bio, best match first."""
+    ids = fulltext_ids(db, "sets", query, skip, limit)
+    if ids is not None:
+        return load_in_order(db, Set, ids, profile)
+    
     search_pattern = f"%{query}%"
-    return db.query(Set).filter(
+    return with_profile(db.query(Set), Set, profile).filter(
         or_(
             Set.primary_name.like(search_pattern),
             Set.territory.like(search_pattern),
@@ -63,6 +97,51 @@ def search_sets(db: Session, query: str, skip: int = 0, limit: int = 100) -> Lis
     ).offset(skip).limit(limit).all()
 
 
+def load_set_relations(db: Session, sets: Iterable[Set], profile: Optional[str] = None) -> None:
+    """
+    Populate allies and enemies for a collection of sets.
+    
+    Fetches the ally and enemy edges touching any of the sets in one query,
+    plus one query for neighbouring sets not already in the collection
+    (loaded with the given loader profile), so the cost does not grow with
+    the number of sets.
+    """
+    sets = list(sets)
+    if not sets:
+        return
+    set_ids = [s.id for s in sets]
+    
+    edges = union_all(
+        select(set_allies.c.set_a_id, set_allies.c.set_b_id, literal("allies")).where(
+            or_(set_allies.c.set_a_id.in_(set_ids), set_allies.c.set_b_id.in_(set_ids))
+        ),
+        select(set_enemies.c.set_a_id, set_enemies.c.set_b_id, literal("enemies")).where(
+            or_(set_enemies.c.set_a_id.in_(set_ids), set_enemies.c.set_b_id.in_(set_ids))
+        ),
+    )
+    rows = db.execute(edges).all()
+    
+    by_id = {s.id: s for s in sets}
+    missing = {set_id for set_a, set_b, _ in rows for set_id in (set_a, set_b)} - by_id.keys()
+    if missing:
+        neighbours = with_profile(db.query(Set), Set, profile).filter(Set.id.in_(missing))
+        by_id.update({s.id: s for s in neighbours})
+    
+    links = {
+        s.id: {"_allies_via_a": [], "_allies_via_b": [], "_enemies_via_a": [], "_enemies_via_b": []}
+        for s in sets
+    }
+    for set_a, set_b, kind in rows:
+        if set_a in links:
+            links[set_a][f"_{kind}_via_a"].append(by_id[set_b])
+        if set_b in links:
+            links[set_b][f"_{kind}_via_b"].append(by_id[set_a])
+    
+    for s in sets:
+        for key, related in links[s.id].items():
+            set_committed_value(s, key, related)
+
+
 def add_ally(db: Session, set_id: str, ally_id: str) -> bool:
     """Add an ally relationship (symmetric, checks for enemy conflict)."""
     if set_id == ally_id:
@@ -93,6 +172,7 @@ def add_ally(db: Session, set_id: str, ally_id: str) -> bool:
     db.execute(
         insert(set_allies).values(set_a_id=set_a, set_b_id=set_b)
     )
+    bump_version(db, "set_allies")
     db.commit()
     return True
 
@@ -106,6 +186,8 @@ def remove_ally(db: Session, set_id: str, ally_id: str) -> bool:
             and_(set_allies.c.set_a_id == set_a, set_allies.c.set_b_id == set_b)
         )
     )
+    if result.rowcount:
+        bump_version(db, "set_allies")
     db.commit()
     return result.rowcount > 0
 
@@ -140,6 +222,7 @@ def add_enemy(db: Session, set_id: str, enemy_id: str) -> bool:
     db.execute(
         insert(set_enemies).values(set_a_id=set_a, set_b_id=set_b)
     )
+    bump_version(db, "set_enemies")
     db.commit()
     return True
 
@@ -153,5 +236,7 @@ def remove_enemy(db: Session, set_id: str, enemy_id: str) -> bool:
             and_(set_enemies.c.set_a_id == set_a, set_enemies.c.set_b_id == set_b)
         )
     )
+    if result.rowcount:
+        bump_version(db, "set_enemies")
     db.commit()
     return result.rowcount > 0
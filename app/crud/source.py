@@ -3,26 +3,39 @@ from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from typing import Optional, List
 from app.models.source import Source
+from app.models.base import validate_dates
 from app.schemas.source import SourceCreate, SourceUpdate
+from app.crud.summary import adjust_counter
+from app.crud.fulltext import fulltext_ids, load_in_order
+from app.crud.typeahead import typeahead_index
+from app.crud.cache import entity_cache
+from app.crud.pagination import keyset
+from app.crud.loaders import with_profile
+from app.crud.version import bump_version
 
 
 def create_source(db: Session, source: SourceCreate) -> Source:
     """Create a new source."""
     db_source = Source(**source.model_dump())
     db.add(db_source)
+    adjust_counter(db, "sources", 1)
+    versions = bump_version(db, "sources")
     db.commit()
     db.refresh(db_source)
+    typeahead_index.update_entry(db_source, versions)
     return db_source
 
 
-def get_source(db: Session, source_id: str) -> Optional[Source]:
-    """Get a source by ID."""
-    return db.query(Source).filter(Source.id == source_id).first()
+def get_source(db: Session, source_id: str, profile: Optional[str] = None) -> Optional[Source]:
+    """Get a source by ID, eager-loading per the given loader profile."""
+    return with_profile(db.query(Source), Source, profile).filter(Source.id == source_id).first()
 
 
-def get_sources(db: Session, skip: int = 0, limit: int = 100) -> List[Source]:
-    """Get all sources with pagination."""
-    return db.query(Source).offset(skip).limit(limit).all()
+def get_sources(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None,
+                profile: Optional[str] = None) -> List[Source]:
+    """Get all sources in ID order, starting after the given ID."""
+    query = with_profile(db.query(Source), Source, profile)
+    return keyset(query, Source.id, after).offset(skip).limit(limit).all()
 
 
 def update_source(db: Session, source_id: str, source: SourceUpdate) -> Optional[Source]:
@@ -33,9 +46,13 @@ def update_source(db: Session, source_id: str, source: SourceUpdate) -> Optional
     
     for key, value in source.model_dump(exclude_unset=True).items():
         setattr(db_source, key, value)
+    validate_dates(db_source)
     
+    versions = bump_version(db, "sources")
     db.commit()
     db.refresh(db_source)
+    typeahead_index.update_entry(db_source, versions)
+    entity_cache.invalidate("source", source_id)
     return db_source
 
 
@@ -46,14 +63,23 @@ def delete_source(db: Session, source_id: str) -> bool:
         return False
     
     db.delete(db_source)
+    adjust_counter(db, "sources", -1)
+    versions = bump_version(db, "sources")
     db.commit()
+    typeahead_index.remove_entry("source", source_id, versions)
+    entity_cache.invalidate("source", source_id)
     return True
 
 
-def search_sources(db: Session, query: str, skip: int = 0, limit: int = 100) -> List[Source]:
-    """Search sources by title, url, or notes."""
+def search_sources(db: Session, query: str, skip: int = 0, limit: int = 100,
+                   profile: Optional[str] = None) -> List[Source]:
+    """Search sources by title, url, or notes, best match first."""
+    ids = fulltext_ids(db, "sources", query, skip, limit)
+    if ids is not None:
+        return load_in_order(db, Source, ids, profile)
+    
     search_pattern = f"%{query}%"
-    return db.query(Source).filter(
+    return with_profile(db.query(Source), Source, profile).filter(
         or_(
             Source.title.like(search_pattern),
             Source.url.like(search_pattern),
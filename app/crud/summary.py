@@ -0,0 +1,73 @@
+"""Summary statistics backed by the summary_counters table."""
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError, InternalError, OperationalError
+from typing import Dict
+from app.models.summary import SummaryCounter
+from app.models.member import Member
+from app.models.set import Set
+from app.models.alliance import Alliance
+from app.models.incident import Incident
+from app.models.source import Source
+
+
+# Entities whose totals are tracked, keyed by counter name
+COUNTED_MODELS = {
+    "members": Member,
+    "sets": Set,
+    "alliances": Alliance,
+    "incidents": Incident,
+    "sources": Source,
+}
+
+
+def adjust_counter(db: Session, name: str, delta: int) -> None:
+    """
+    Add delta to a counter inside the caller's transaction.
+    
+    A counter that has not been initialised yet is left alone; it is
+    computed from COUNT(*) the first time it is read.
+    """
+    db.query(SummaryCounter).filter(SummaryCounter.name == name).update(
+        {SummaryCounter.value: SummaryCounter.value + delta},
+        synchronize_session=False
+    )
+
+
+def count_rows(db: Session, name: str) -> int:
+    """Count rows for a tracked entity with a single COUNT query."""
+    model = COUNTED_MODELS[name]
+    return db.query(func.count(model.id)).scalar() or 0
+
+
+def get_summary_counts(db: Session) -> Dict[str, int]:
+    """Get totals for every tracked entity, initialising missing counters."""
+    counts = dict(db.query(SummaryCounter.name, SummaryCounter.value).all())
+    missing = [name for name in COUNTED_MODELS if name not in counts]
+    if not missing:
+        return counts
+    
+    for name in missing:
+        counts[name] = count_rows(db, name)
+        db.add(SummaryCounter(name=name, value=counts[name]))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request initialised the counters first; use its values
+        db.rollback()
+        counts = dict(db.query(SummaryCounter.name, SummaryCounter.value).all())
+    except (OperationalError, InternalError):
+        # Read-only connection or replica: serve the computed totals and leave the
+        # counters to be initialised at startup
+        db.rollback()
+    return counts
+
+
+def rebuild_summary_counts(db: Session) -> Dict[str, int]:
+    """Recompute every counter from COUNT(*), e.g. after a manual data import."""
+    counts = {}
+    for name in COUNTED_MODELS:
+        counts[name] = count_rows(db, name)
+        db.merge(SummaryCounter(name=name, value=counts[name]))
+    db.commit()
+    return counts
@@ -0,0 +1,286 @@
+"""
+In-memory typeahead index across members, sets, alliances, incidents and sources.
+
+Names are indexed by word prefix (for short queries) and by trigram (for
+substring matches), so a lookup touches only matching entries. The index is
+built lazily on first use and the CRUD write paths keep it current by
+calling update_entry/remove_entry after they commit. Each worker process
+holds its own copy, stamped with the versions of the entity tables it
+reflects; a write it did not see (another worker, a bulk import,
+rebuild.py, raw SQL) shows up as a version change and the next search
+rebuilds it.
+"""
+from sqlalchemy.orm import Session, load_only
+from typing import Dict, List, Optional, Tuple, NamedTuple
+from collections import defaultdict
+import heapq
+import re
+import threading
+import unicodedata
+from app.models.member import Member
+from app.models.set import Set
+from app.models.alliance import Alliance
+from app.models.incident import Incident
+from app.models.source import Source
+from app.crud.version import get_versions
+
+
+# Word prefixes up to this length are indexed directly
+PREFIX_LENGTH = 3
+
+# Most candidates scored per query; keeps very common queries fast
+MAX_SCAN = 2000
+
+# Table behind each entry type, whose version the index tracks
+ENTRY_TABLES = {
+    "member": "members",
+    "set": "sets",
+    "alliance": "alliances",
+    "incident": "incidents",
+    "source": "sources",
+}
+TYPEAHEAD_TABLES = tuple(ENTRY_TABLES.values())
+
+# Detail page path for each entry type
+ENTRY_URLS = {
+    "member": "/members/{}",
+    "set": "/sets/{}",
+    "alliance": "/alliances/{}",
+    "incident": "/incidents/{}",
+    "source": "/sources/{}",
+}
+
+
+class Entry(NamedTuple):
+    """An indexed entity: what is shown and what is matched."""
+    type: str
+    id: str
+    label: str
+    terms: Tuple[str, ...]
+
+
+def normalize(value: str) -> str:
+    """Lowercase, strip accents and collapse punctuation to single spaces."""
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return " ".join(re.findall(r"\w+", value.lower()))
+
+
+def _trigrams(value: str) -> set:
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+def _prefixes(value: str) -> set:
+    return {word[:length] for word in value.split() for length in range(1, min(len(word), PREFIX_LENGTH) + 1)}
+
+
+def make_entry(obj) -> Optional[Entry]:
+    """Build the index entry for a model instance, or None if it has nothing to match."""
+    if isinstance(obj, Member):
+        names = list(obj.nicknames or [])
+        if obj.real_name:
+            names.append(obj.real_name)
+        return Entry("member", obj.id, obj.display_name, tuple(names))
+    if isinstance(obj, Set):
+        return Entry("set", obj.id, obj.primary_name, (obj.primary_name, *(obj.names or [])))
+    if isinstance(obj, Alliance):
+        return Entry("alliance", obj.id, obj.name, (obj.name,))
+    if isinstance(obj, Incident):
+        if not obj.location:
+            return None
+        return Entry("incident", obj.id, f"{obj.type.value} – {obj.location}", (obj.location,))
+    if isinstance(obj, Source):
+        if not obj.title:
+            return None
+        return Entry("source", obj.id, obj.title, (obj.title,))
+    raise TypeError(f"Cannot index {type(obj).__name__}")
+
+
+class TypeaheadIndex:
+    """
+    Prefix/trigram index mapping normalized names to entries.
+    
+    Entries are numbered in order of label length when the index is built
+    (later additions are appended), and postings are lists of those numbers
+    in ascending order. A query walks its rarest posting shortest-name-first
+    and verifies each candidate, stopping after MAX_SCAN candidates, so even
+    very common queries do bounded work. Replaced or removed entries leave
+    stale numbers behind until the index is compacted by a rebuild.
+    
+    `versions` holds the TYPEAHEAD_TABLES versions the index reflects. A
+    local write that is the very next version of its tables advances them;
+    any other change leaves them behind what get_versions reports, which
+    triggers a rebuild.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.built = False
+        self.versions: Dict[str, int] = {}
+        self._entries: List[Optional[Tuple[Entry, Tuple[str, ...]]]] = []
+        self._ordinals: Dict[Tuple[str, str], int] = {}
+        self._prefixes: Dict[str, List[int]] = defaultdict(list)
+        self._trigrams: Dict[str, List[int]] = defaultdict(list)
+    
+    def ensure_built(self, db: Session) -> None:
+        """Build the index on first use or after writes it missed, and compact it once mostly stale."""
+        versions = get_versions(db, *TYPEAHEAD_TABLES)
+        if (self.built and versions == self.versions
+                and len(self._entries) <= 2 * len(self._ordinals) + 1000):
+            return
+        self.build(db, versions)
+    
+    def build(self, db: Session, versions: Optional[Dict[str, int]] = None) -> None:
+        """
+        (Re)build the whole index from the database.
+        
+        The queries run without the lock, which is never held across a
+        database call: through the async CRUD wrappers they yield to the
+        event loop, and a search arriving meanwhile on the same thread
+        would wait on the lock forever.
+        """
+        if versions is None:
+            versions = get_versions(db, *TYPEAHEAD_TABLES)
+        queries = [
+            db.query(Member).options(load_only(
+                Member.first_name, Member.last_name, Member.nicknames, Member.nickname_unknown
+            )),
+            db.query(Set).options(load_only(Set.primary_name, Set.names)),
+            db.query(Alliance).options(load_only(Alliance.name)),
+            db.query(Incident).options(load_only(Incident.type, Incident.location)),
+            db.query(Source).options(load_only(Source.title)),
+        ]
+        entries = [
+            entry for query in queries for entry in map(make_entry, query.yield_per(1000)) if entry
+        ]
+        entries.sort(key=lambda entry: len(entry.label))
+        with self._lock:
+            self._entries = []
+            self._ordinals = {}
+            self._prefixes = defaultdict(list)
+            self._trigrams = defaultdict(list)
+            for entry in entries:
+                self._add(entry)
+            self.versions = dict(versions)
+            self.built = True
+    
+    def _add(self, entry: Entry) -> None:
+        ordinal = len(self._entries)
+        terms = tuple(term for term in (normalize(term) for term in entry.terms) if term)
+        self._entries.append((entry, terms))
+        self._ordinals[(entry.type, entry.id)] = ordinal
+        prefixes, trigrams = set(), set()
+        for term in terms:
+            prefixes |= _prefixes(term)
+            trigrams |= _trigrams(term)
+        for prefix in prefixes:
+            self._prefixes[prefix].append(ordinal)
+        for trigram in trigrams:
+            self._trigrams[trigram].append(ordinal)
+    
+    def _discard(self, key: Tuple[str, str]) -> None:
+        ordinal = self._ordinals.pop(key, None)
+        if ordinal is not None:
+            self._entries[ordinal] = None
+    
+    def _advance(self, entry_type: str, versions: Dict[str, int]) -> bool:
+        """
+        Record a committed write's versions (from bump_version); False if
+        the index already reflects it. Call with the lock held.
+        """
+        version = versions.get(ENTRY_TABLES[entry_type])
+        if version is not None and version <= self.versions.get(ENTRY_TABLES[entry_type], 0):
+            return False
+        for table, new in versions.items():
+            if table in self.versions and new == self.versions[table] + 1:
+                self.versions[table] = new
+        return True
+    
+    def update_entry(self, obj, versions: Dict[str, int]) -> None:
+        """Add or replace the entry for a model instance written at the given table versions."""
+        if not self.built:
+            return  # The first search builds from the database anyway
+        entry = make_entry(obj)
+        entry_type = ENTRY_TYPES[type(obj)]
+        with self._lock:
+            if self._advance(entry_type, versions):
+                self._discard((entry_type, obj.id))
+                if entry:
+                    self._add(entry)
+    
+    def invalidate(self) -> None:
+        """Drop the index so the next search rebuilds it, e.g. after a bulk import."""
+        with self._lock:
+            self.built = False
+    
+    def remove_entry(self, entry_type: str, entry_id: str, versions: Dict[str, int]) -> None:
+        """Drop an entry after its entity was deleted at the given table versions."""
+        with self._lock:
+            if self._advance(entry_type, versions):
+                self._discard((entry_type, entry_id))
+    
+    def _rarest_posting(self, query: str) -> List[int]:
+        # Short words are looked up as word prefixes, longer ones by trigram
+        postings = []
+        for word in query.split():
+            if len(word) <= PREFIX_LENGTH:
+                postings.append(self._prefixes.get(word, []))
+            else:
+                postings.extend(self._trigrams.get(trigram, []) for trigram in _trigrams(word))
+        return min(postings, key=len)
+    
+    def search(self, query: str, limit: int = 10, types: Optional[List[str]] = None) -> List[dict]:
+        """Top matches for a query: exact, then prefix, then word prefix, then substring."""
+        query = normalize(query)
+        if not query:
+            return []
+        padded_words = [" " + word for word in query.split()]
+        
+        with self._lock:
+            scored = []
+            for ordinal in self._rarest_posting(query)[:MAX_SCAN]:
+                item = self._entries[ordinal]
+                if item is None:
+                    continue
+                entry, terms = item
+                if types and entry.type not in types:
+                    continue
+                best = None
+                for term in terms:
+                    if term == query:
+                        rank = 0
+                    elif term.startswith(query):
+                        rank = 1
+                    elif all(word in " " + term for word in padded_words):
+                        rank = 2
+                    elif query in term:
+                        rank = 3
+                    else:
+                        continue
+                    if best is None or rank < best:
+                        best = rank
+                if best is not None:
+                    scored.append((best, len(entry.label), ordinal))
+            
+            results = []
+            for rank, _, ordinal in heapq.nsmallest(limit, scored):
+                entry = self._entries[ordinal][0]
+                results.append({
+                    "type": entry.type,
+                    "id": entry.id,
+                    "label": entry.label,
+                    "url": ENTRY_URLS[entry.type].format(entry.id),
+                    "rank": rank,
+                })
+            return results
+
+
+ENTRY_TYPES = {Member: "member", Set: "set", Alliance: "alliance", Incident: "incident", Source: "source"}
+
+typeahead_index = TypeaheadIndex()
+
+
+def search_all(db: Session, query: str, limit: int = 10, types: Optional[List[str]] = None) -> List[dict]:
+    """Ranked typeahead hits across every entity type."""
+    typeahead_index.ensure_built(db)
+    return typeahead_index.search(query, limit, types)
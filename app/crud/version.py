@@ -0,0 +1,54 @@
+"""Per-table version counters used to invalidate cached data."""
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import Dict, NamedTuple, Optional
+from app.database import upsert
+from app.models.version import TableVersion
+
+
+class TableStamp(NamedTuple):
+    """A table's version and when it was last bumped (None if never)."""
+    version: int
+    updated_at: Optional[datetime]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def bump_version(db: Session, *table_names: str) -> Dict[str, int]:
+    """
+    Increment the version of each table inside the caller's transaction and
+    return the new versions.
+    
+    One upsert, so two transactions writing a table for the first time
+    cannot both try to insert its row.
+    """
+    if not table_names:
+        return {}
+    now = _utcnow()
+    table = TableVersion.__table__
+    statement = upsert(db, table).values([
+        {"table_name": table_name, "version": 1, "updated_at": now} for table_name in dict.fromkeys(table_names)
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.table_name],
+        set_={"version": table.c.version + 1, "updated_at": statement.excluded.updated_at}
+    ).returning(table.c.table_name, table.c.version)
+    return dict(db.execute(statement).all())
+
+
+def get_versions(db: Session, *table_names: str) -> Dict[str, int]:
+    """Get the current version of each table (0 if it was never written)."""
+    return {table_name: stamp.version for table_name, stamp in get_stamps(db, *table_names).items()}
+
+
+def get_stamps(db: Session, *table_names: str) -> Dict[str, TableStamp]:
+    """Get the version and last-bump time of each table in one query."""
+    rows = {
+        table_name: TableStamp(version, updated_at)
+        for table_name, version, updated_at in db.query(
+            TableVersion.table_name, TableVersion.version, TableVersion.updated_at
+        ).filter(TableVersion.table_name.in_(table_names))
+    }
+    return {table_name: rows.get(table_name, TableStamp(0, None)) for table_name in table_names}
@@ -1,26 +1,216 @@
 """Database setup and session management."""
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from fastapi import Request
+from sqlalchemy import Table, create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import math
+import time
 from app.config import settings
 
 # Import Base from models.base
 from app.models.base import Base
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=True  # Set to False in production
+# Requests that never write, served from read-only connections
+READ_METHODS = {"GET", "HEAD"}
+
+# Async drivers used in place of the sync ones in DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# INSERT constructs with on_conflict_do_update, per dialect
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def sqlite_pragmas() -> Dict[str, object]:
+    """PRAGMAs applied to every new SQLite connection, from the performance profile in settings."""
+    if not settings.SQLITE_PERFORMANCE_PROFILE:
+        return {}
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+    }
+
+
+def _apply_pragmas_on_connect(engine: Engine, pragmas: Optional[Dict[str, object]], read_only: bool) -> None:
+    """Run the PRAGMAs (and query_only when read_only) on each new SQLite connection."""
+    if not (pragmas or read_only):
+        return
+    
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in (pragmas or {}).items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+
+def create_db_engine(url: str, echo: bool = False, pragmas: Optional[Dict[str, object]] = None,
+                     read_only: bool = False) -> Engine:
+    """Create an engine; SQLite connections get the given PRAGMAs, and query_only when read_only."""
+    is_sqlite = url.startswith("sqlite")
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        echo=echo
+    )
+    if is_sqlite:
+        _apply_pragmas_on_connect(engine, pragmas, read_only)
+    return engine
+
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its async counterpart."""
+    scheme, rest = url.split(":", 1)
+    backend = scheme.split("+", 1)[0]
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return f"{ASYNC_DRIVERS[backend]}:{rest}"
+
+
+def create_async_db_engine(url: str, echo: bool = False, pragmas: Optional[Dict[str, object]] = None,
+                           read_only: bool = False) -> AsyncEngine:
+    """Async counterpart of create_db_engine, for the same sync database URL."""
+    engine = create_async_engine(async_database_url(url), echo=echo)
+    if url.startswith("sqlite"):
+        _apply_pragmas_on_connect(engine.sync_engine, pragmas, read_only)
+    return engine
+
+
+def upsert(db: Session, table: Table):
+    """INSERT into table for the session's dialect, supporting on_conflict_do_update."""
+    dialect = db.get_bind().dialect.name
+    if dialect not in UPSERT_INSERTS:
+        raise ValueError(f"No upsert configured for {dialect} databases")
+    return UPSERT_INSERTS[dialect](table)
+
+
+def _is_memory_database(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+# Reads go to DATABASE_REPLICA_URL when one is configured. Otherwise GET
+# traffic gets a second pool of query_only connections on the primary;
+# in-memory databases are private to one connection, so they share the
+# main engine.
+READ_DATABASE_URL = settings.DATABASE_REPLICA_URL or settings.DATABASE_URL
+_separate_read_pool = bool(settings.DATABASE_REPLICA_URL) or (
+    settings.DATABASE_READ_ONLY_GETS and settings.DATABASE_URL.startswith("sqlite")
+    and not _is_memory_database(settings.DATABASE_URL)
 )
 
-# Session factory
+# Sync engine, for scripts, migrations, startup and streaming responses
+engine = create_db_engine(settings.DATABASE_URL, echo=settings.DATABASE_ECHO, pragmas=sqlite_pragmas())
+read_engine = (create_db_engine(READ_DATABASE_URL, echo=settings.DATABASE_ECHO,
+                                pragmas=sqlite_pragmas(), read_only=True)
+               if _separate_read_pool else engine)
+
+# Async engine, for request handlers
+async_engine = create_async_db_engine(settings.DATABASE_URL, echo=settings.DATABASE_ECHO, pragmas=sqlite_pragmas())
+async_read_engine = (create_async_db_engine(READ_DATABASE_URL, echo=settings.DATABASE_ECHO,
+                                            pragmas=sqlite_pragmas(), read_only=True)
+                     if _separate_read_pool else async_engine)
+
+# Session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
 
 
-def get_db():
-    """Dependency to get database session."""
-    db = SessionLocal()
-    try:
+# Read-your-writes: a client that just committed reads from the primary
+# until the replica has had DATABASE_REPLICA_LAG_SECONDS to catch up.
+PRIMARY_READS_COOKIE = "db_primary_until"
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+
+@event.listens_for(Session, "after_commit")
+def _record_commit(session):
+    session.info["committed"] = True
+
+
+def read_session_factory() -> async_sessionmaker:
+    """Session factory for reads: the replica, or the primary right after this client wrote."""
+    return AsyncSessionLocal if _primary_reads.get() else AsyncReadSessionLocal
+
+
+@asynccontextmanager
+async def _request_session(request: Request, write: bool):
+    if not write:
+        async with read_session_factory()() as db:
+            yield db
+        return
+    async with AsyncSessionLocal() as db:
         yield db
+        if db.info.get("committed"):
+            request.state.database_wrote = True
+
+
+async def get_read_db(request: Request):
+    """Dependency for handlers that only read; uses the replica / read-only pool."""
+    async with _request_session(request, write=False) as db:
+        yield db
+
+
+async def get_write_db(request: Request):
+    """Dependency for handlers that write; always uses the primary."""
+    async with _request_session(request, write=True) as db:
+        yield db
+
+
+async def get_db(request: Request):
+    """Dependency to get an async database session, routed by method: GET/HEAD read, the rest write."""
+    async with _request_session(request, write=request.method not in READ_METHODS) as db:
+        yield db
+
+
+async def read_your_writes(request: Request, call_next):
+    """
+    Middleware that sends a client's reads to the primary for a short window
+    after one of its requests committed, so a redirect to the page it just
+    changed never shows stale replica data.
+    """
+    try:
+        primary_until = float(request.cookies.get(PRIMARY_READS_COOKIE, 0))
+    except ValueError:
+        primary_until = 0
+    token = _primary_reads.set(time.time() < primary_until)
+    try:
+        response = await call_next(request)
     finally:
-        db.close()
+        _primary_reads.reset(token)
+    if getattr(request.state, "database_wrote", False):
+        lag = settings.DATABASE_REPLICA_LAG_SECONDS
+        response.set_cookie(PRIMARY_READS_COOKIE, f"{time.time() + lag:.3f}", max_age=math.ceil(lag),
+                            httponly=True, samesite="lax")
+    return response
+
+
+async def run_concurrently(*operations: Callable[[AsyncSession], Awaitable[Any]]) -> List[Any]:
+    """
+    Run independent read operations at the same time, each on its own
+    read session (one session cannot run two queries at once).
+    """
+    factory = read_session_factory()
+    
+    async def run(operation):
+        async with factory() as db:
+            return await operation(db)
+    
+    return await asyncio.gather(*(run(operation) for operation in operations))
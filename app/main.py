@@ -3,10 +3,14 @@ from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import RedirectResponse
-from app.database import engine, Base
+from app.database import engine, Base, SessionLocal, read_your_writes
 from app.config import settings
+from app.auth import SessionAuthMiddleware, get_hashed_admin_password
+from app.crud.fulltext import create_search_index
+from app.crud.summary import get_summary_counts
+from app.crud.rollup import ensure_incident_rollups
 from app.routes import pages
-from app.routes import api_members, api_sets, api_alliances, api_incidents, api_sources, api_graph
+from app.routes import api_members, api_sets, api_alliances, api_incidents, api_sources, api_graph, api_search, api_bulk, api_export, api_cache
 import os
 
 # Create FastAPI app
@@ -20,6 +24,13 @@ os.makedirs("app/templates", exist_ok=True)
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
+# Send reads to the primary right after a client writes, while the replica catches up
+if settings.DATABASE_REPLICA_URL:
+    app.middleware("http")(read_your_writes)
+
+# Check the session once per request; added last so it runs first
+app.add_middleware(SessionAuthMiddleware)
+
 # Setup Jinja2 templates
 templates = Jinja2Templates(directory="app/templates")
 
@@ -31,12 +42,23 @@ app.include_router(api_alliances.router)
 app.include_router(api_incidents.router)
 app.include_router(api_sources.router)
 app.include_router(api_graph.router)
+app.include_router(api_search.router)
+app.include_router(api_bulk.router)
+app.include_router(api_export.router)
+app.include_router(api_cache.router)
 
 # Create database tables
 @app.on_event("startup")
 async def startup_event():
-    """Create database tables on startup."""
+    """Create database tables, the full-text index, summary counters and rollups on startup."""
+    # Hash the admin password now rather than on the first login
+    get_hashed_admin_password()
     Base.metadata.create_all(bind=engine)
+    create_search_index(engine)
+    # GET requests use read-only connections, so initialise counters here
+    with SessionLocal() as db:
+        get_summary_counts(db)
+        ensure_incident_rollups(db)
 
 
 @app.get("/")
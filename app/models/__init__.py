@@ -5,6 +5,10 @@ from app.models.alliance import Alliance, AllianceStatus
 from app.models.set import Set, SetStatus
 from app.models.member import Member, MemberStatus, AffiliationType
 from app.models.incident import Incident, IncidentParticipant, IncidentType, ParticipantRole, VictimOutcome
+from app.models.summary import SummaryCounter
+from app.models.member_stats import MemberStats
+from app.models.incident_rollup import IncidentRollup
+from app.models.version import TableVersion
 
 __all__ = [
     "Base",
@@ -23,4 +27,8 @@ __all__ = [
     "IncidentType",
     "ParticipantRole",
     "VictimOutcome",
+    "SummaryCounter",
+    "MemberStats",
+    "IncidentRollup",
+    "TableVersion",
 ]
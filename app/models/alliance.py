@@ -1,7 +1,7 @@
 """Alliance model."""
-from sqlalchemy import Column, String, Integer, Text, Enum as SQLEnum
-from sqlalchemy.orm import relationship
-from app.models.base import Base
+from sqlalchemy import Column, String, Integer, Text, Enum as SQLEnum, Index
+from sqlalchemy.orm import composite, relationship, query_expression
+from app.models.base import Base, FuzzyDate, precision_column, sort_key_column
 from app.models.associations import alliance_sources
 import uuid
 import enum
@@ -17,6 +17,9 @@ class AllianceStatus(str, enum.Enum):
 class Alliance(Base):
     """Gang alliance."""
     __tablename__ = "alliances"
+    __table_args__ = (
+        Index("ix_alliances_founded_sort", "founded_sort", "id"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False, unique=True)
@@ -27,12 +30,19 @@ class Alliance(Base):
     founded_year = Column(Integer, nullable=True)
     founded_month = Column(Integer, nullable=True)
     founded_day = Column(Integer, nullable=True)
+    founded_sort = Column(Integer, sort_key_column("founded"), nullable=True)
+    founded_precision = Column(Integer, precision_column("founded"), nullable=True)
+    founded = composite(FuzzyDate._from_columns, founded_year, founded_month, founded_day)
     
     # Relationships
-    sets = relationship("Set", back_populates="alliance", lazy="selectin")
+    sets = relationship("Set", back_populates="alliance")
     direct_members = relationship("Member", back_populates="alliance_direct", 
-                                  foreign_keys="Member.alliance_id", lazy="selectin")
-    sources = relationship("Source", secondary=alliance_sources, lazy="selectin")
+                                  foreign_keys="Member.alliance_id")
+    sources = relationship("Source", secondary=alliance_sources)
+    
+    # Filled by list views with COUNT subqueries instead of loading collections
+    set_count = query_expression()
+    direct_member_count = query_expression()
     
     def __repr__(self):
         return f"<Alliance {self.name}>"
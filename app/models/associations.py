@@ -1,5 +1,5 @@
 """Association tables for many-to-many relationships."""
-from sqlalchemy import Table, Column, ForeignKey, Integer, String, CheckConstraint
+from sqlalchemy import Table, Column, ForeignKey, Integer, String, CheckConstraint, Index
 from app.models.base import Base
 import uuid
 
@@ -13,7 +13,9 @@ set_allies = Table(
     Column("since_year", Integer, nullable=True),
     Column("since_month", Integer, nullable=True),
     Column("since_day", Integer, nullable=True),
-    CheckConstraint("set_a_id < set_b_id", name="set_allies_order_check")
+    CheckConstraint("set_a_id < set_b_id", name="set_allies_order_check"),
+    # The primary key covers lookups by set_a_id; this covers the reverse side
+    Index("ix_set_allies_set_b_id", "set_b_id", "set_a_id")
 )
 
 # Set enemies (self-referential M2M)
@@ -25,7 +27,8 @@ set_enemies = Table(
     Column("since_year", Integer, nullable=True),
     Column("since_month", Integer, nullable=True),
     Column("since_day", Integer, nullable=True),
-    CheckConstraint("set_a_id < set_b_id", name="set_enemies_order_check")
+    CheckConstraint("set_a_id < set_b_id", name="set_enemies_order_check"),
+    Index("ix_set_enemies_set_b_id", "set_b_id", "set_a_id")
 )
 
 # Member-Source M2M
@@ -33,7 +36,8 @@ member_sources = Table(
     "member_sources",
     Base.metadata,
     Column("member_id", String, ForeignKey("members.id"), primary_key=True),
-    Column("source_id", String, ForeignKey("sources.id"), primary_key=True)
+    Column("source_id", String, ForeignKey("sources.id"), primary_key=True),
+    Index("ix_member_sources_source_id", "source_id", "member_id")
 )
 
 # Set-Source M2M
@@ -41,7 +45,8 @@ set_sources = Table(
     "set_sources",
     Base.metadata,
     Column("set_id", String, ForeignKey("sets.id"), primary_key=True),
-    Column("source_id", String, ForeignKey("sources.id"), primary_key=True)
+    Column("source_id", String, ForeignKey("sources.id"), primary_key=True),
+    Index("ix_set_sources_source_id", "source_id", "set_id")
 )
 
 # Alliance-Source M2M
@@ -49,7 +54,8 @@ alliance_sources = Table(
     "alliance_sources",
     Base.metadata,
     Column("alliance_id", String, ForeignKey("alliances.id"), primary_key=True),
-    Column("source_id", String, ForeignKey("sources.id"), primary_key=True)
+    Column("source_id", String, ForeignKey("sources.id"), primary_key=True),
+    Index("ix_alliance_sources_source_id", "source_id", "alliance_id")
 )
 
 # Incident-Source M2M
@@ -57,5 +63,6 @@ incident_sources = Table(
     "incident_sources",
     Base.metadata,
     Column("incident_id", String, ForeignKey("incidents.id"), primary_key=True),
-    Column("source_id", String, ForeignKey("sources.id"), primary_key=True)
+    Column("source_id", String, ForeignKey("sources.id"), primary_key=True),
+    Index("ix_incident_sources_source_id", "source_id", "incident_id")
 )
@@ -1,8 +1,11 @@
 """Base model and FuzzyDate composite type."""
-from typing import Optional
+from typing import Dict, Optional, Tuple
+from sqlalchemy import Computed, inspect
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.ext.hybrid import Comparator
 import calendar
+import enum
+import re
 
 
 class Base(DeclarativeBase):
@@ -10,6 +13,44 @@ class Base(DeclarativeBase):
     pass
 
 
+class DatePrecision(enum.IntEnum):
+    """How much of a FuzzyDate is known, as stored in the *_precision columns."""
+    YEAR = 1
+    MONTH = 2
+    DAY = 3
+
+
+def fuzzy_sort_key(year: Optional[int], month: Optional[int] = None, day: Optional[int] = None) -> Optional[int]:
+    """YYYYMMDD as an integer with unknown parts as 00, so less precise dates sort first."""
+    if year is None:
+        return None
+    return year * 10000 + (month or 0) * 100 + (day or 0)
+
+
+def sort_key_column(prefix: str) -> Computed:
+    """Generated column computing fuzzy_sort_key from the <prefix>_year/_month/_day columns."""
+    return Computed(f"{prefix}_year * 10000 + coalesce({prefix}_month, 0) * 100 + coalesce({prefix}_day, 0)")
+
+
+def precision_column(prefix: str) -> Computed:
+    """Generated column holding the DatePrecision of the <prefix>_* date (NULL if unknown)."""
+    return Computed(
+        f"CASE WHEN {prefix}_day IS NOT NULL THEN {DatePrecision.DAY:d} "
+        f"WHEN {prefix}_month IS NOT NULL THEN {DatePrecision.MONTH:d} "
+        f"WHEN {prefix}_year IS NOT NULL THEN {DatePrecision.YEAR:d} END"
+    )
+
+
+MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+
+_LONG_MONTHS = frozenset((1, 3, 5, 7, 8, 10, 12))
+
+_ISO_PARTIAL = re.compile(r"^(\d{4})(?:-(\d{1,2})(?:-(\d{1,2}))?)?$")
+
+
 class FuzzyDate:
     """
     A date with flexible precision: year-only, year-month, or full date.
@@ -18,83 +59,148 @@ class FuzzyDate:
     - year is required if any date info exists
     - month can only be set if year is set
     - day can only be set if month is set
+    
+    Instances are immutable and interned: equal dates are the same object,
+    validated once, and their formatted strings are computed once. The
+    packed form, int(date), is YYYYMMDD with unknown parts as 00 (0 for an
+    unknown date) and matches the *_sort columns.
     """
     
-    def __init__(self, year: Optional[int] = None, month: Optional[int] = None, day: Optional[int] = None):
-        """Initialize FuzzyDate with validation."""
-        if month is not None and year is None:
-            raise ValueError("Cannot set month without year")
-        if day is not None and month is None:
-            raise ValueError("Cannot set day without month")
-        
-        if month is not None and not (1 <= month <= 12):
-            raise ValueError(f"Month must be between 1 and 12, got {month}")
+    __slots__ = ("year", "month", "day", "_key", "_text", "_numeric")
+    
+    def __new__(cls, year: Optional[int] = None, month: Optional[int] = None, day: Optional[int] = None):
+        """Return the (validated, shared) instance for these parts."""
+        parts = (year, month, day)
+        self = _interned.get(parts)
+        if self is not None:
+            return self
         
-        if day is not None:
-            if month is None:
-                raise ValueError("Cannot validate day without month")
-            max_day = calendar.monthrange(year or 2000, month)[1]
-            if not (1 <= day <= max_day):
-                raise ValueError(f"Day must be between 1 and {max_day} for month {month}, got {day}")
+        validate_date_parts(year, month, day)
+        self = cls._build(year, month, day)
+        if len(_interned) < INTERN_LIMIT:
+            _interned[parts] = self
+        return self
+    
+    @classmethod
+    def _build(cls, year: Optional[int], month: Optional[int], day: Optional[int]) -> "FuzzyDate":
+        self = object.__new__(cls)
+        init = object.__setattr__
+        init(self, "year", year)
+        init(self, "month", month)
+        init(self, "day", day)
+        init(self, "_key", fuzzy_sort_key(year, month, day) or 0)
+        init(self, "_text", None)
+        init(self, "_numeric", None)
+        return self
+    
+    @classmethod
+    def _from_columns(cls, year: Optional[int] = None, month: Optional[int] = None,
+                      day: Optional[int] = None) -> "FuzzyDate":
+        """
+        Composite constructor for values loaded from the database.
         
-        self.year = year
-        self.month = month
-        self.day = day
+        Never raises: a row stored with an impossible date (e.g. before the
+        schemas checked them) still loads, so it can be shown, fixed or
+        deleted. Such dates are not interned.
+        """
+        try:
+            return cls(year, month, day)
+        except ValueError:
+            return cls._build(year, month, day)
+    
+    @classmethod
+    def parse(cls, text: str) -> "FuzzyDate":
+        """Parse YYYY, YYYY-MM or YYYY-MM-DD; raises ValueError otherwise."""
+        match = _ISO_PARTIAL.match(text.strip())
+        if not match:
+            raise ValueError(f"Expected YYYY, YYYY-MM or YYYY-MM-DD, got {text!r}")
+        return cls(*(int(part) if part else None for part in match.groups()))
+    
+    @classmethod
+    def from_int(cls, key: int) -> "FuzzyDate":
+        """Unpack int(date) back into a FuzzyDate."""
+        if not key:
+            return cls()
+        return cls(key // 10000, (key // 100) % 100 or None, key % 100 or None)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("FuzzyDate is immutable; assign a new FuzzyDate instead")
+    
+    def __reduce__(self):
+        return FuzzyDate._from_columns, (self.year, self.month, self.day)
     
     def __composite_values__(self):
         """Return values for SQLAlchemy composite."""
         return self.year, self.month, self.day
     
+    def __int__(self) -> int:
+        return self._key
+    
+    def __bool__(self) -> bool:
+        return self.year is not None
+    
     def __str__(self) -> str:
-        """Human-readable string representation."""
-        if self.year is None:
-            return "Unknown"
-        if self.month is None:
-            return str(self.year)
-        
-        month_names = [
-            "January", "February", "March", "April", "May", "June",
-            "July", "August", "September", "October", "November", "December"
-        ]
-        month_str = month_names[self.month - 1]
-        
-        if self.day is None:
-            return f"{month_str} {self.year}"
-        return f"{month_str} {self.day}, {self.year}"
+        """Human-readable string, e.g. "March 15, 2019" (cached)."""
+        text = self._text
+        if text is None:
+            if self.year is None:
+                text = "Unknown"
+            elif self.month is None:
+                text = str(self.year)
+            elif not 1 <= self.month <= 12:
+                text = self.numeric
+            elif self.day is None:
+                text = f"{MONTH_NAMES[self.month - 1]} {self.year}"
+            else:
+                text = f"{MONTH_NAMES[self.month - 1]} {self.day}, {self.year}"
+            object.__setattr__(self, "_text", text)
+        return text
+    
+    @property
+    def numeric(self) -> str:
+        """Short numeric form used in tables, e.g. 15/03/2019, 03/2019 or 2019 (cached)."""
+        text = self._numeric
+        if text is None:
+            if self.year is None:
+                text = ""
+            elif self.month is None:
+                text = str(self.year)
+            elif self.day is None:
+                text = f"{self.month:02d}/{self.year}"
+            else:
+                text = f"{self.day:02d}/{self.month:02d}/{self.year}"
+            object.__setattr__(self, "_numeric", text)
+        return text
     
     def __repr__(self) -> str:
         """Developer representation."""
         return f"FuzzyDate(year={self.year}, month={self.month}, day={self.day})"
     
+    def __hash__(self) -> int:
+        return hash(self._key)
+    
     def __eq__(self, other) -> bool:
         """Equality comparison."""
+        if self is other:
+            return True
         if not isinstance(other, FuzzyDate):
             return False
-        return (self.year, self.month, self.day) == (other.year, other.month, other.day)
+        return self._key == other._key
     
     def __lt__(self, other) -> bool:
         """Less than comparison at lowest common precision."""
         if not isinstance(other, FuzzyDate):
             return NotImplemented
-        
         if self.year is None or other.year is None:
             return False
-        
-        if self.year != other.year:
-            return self.year < other.year
-        
-        # Years are equal, check month if both have it
+        # Drop the parts that either date lacks; equal at that precision is not less
         if self.month is None or other.month is None:
-            return False  # Can't determine at year-only precision
-        
-        if self.month != other.month:
-            return self.month < other.month
-        
-        # Months are equal, check day if both have it
-        if self.day is None or other.day is None:
-            return False  # Can't determine at month precision
-        
-        return self.day < other.day
+            scale = 10000
+        elif self.day is None or other.day is None:
+            scale = 100
+        else:
+            scale = 1
+        return self._key // scale < other._key // scale
     
     def __le__(self, other) -> bool:
         """Less than or equal."""
@@ -114,3 +220,65 @@ class FuzzyDate:
     def is_empty(self) -> bool:
         """Check if date is completely empty."""
         return self.year is None
+    
+    @property
+    def precision(self) -> Optional[DatePrecision]:
+        """How much of the date is known (None if nothing)."""
+        if self.year is None:
+            return None
+        if self.month is None:
+            return DatePrecision.YEAR
+        return DatePrecision.MONTH if self.day is None else DatePrecision.DAY
+    
+    @property
+    def sort_key(self) -> Optional[int]:
+        """Sort key of the first day the date could be, matching the *_sort columns."""
+        return self._key or None
+    
+    @property
+    def end_key(self) -> Optional[int]:
+        """Largest sort key of any date within this one, e.g. 20210699 for June 2021."""
+        if self.year is None:
+            return None
+        return fuzzy_sort_key(self.year, self.month or 99, self.day or 99)
+
+
+def validate_date_parts(year: Optional[int], month: Optional[int], day: Optional[int]) -> None:
+    """Raise ValueError unless year/month/day form a valid FuzzyDate."""
+    if month is not None and year is None:
+        raise ValueError("Cannot set month without year")
+    if day is not None and month is None:
+        raise ValueError("Cannot set day without month")
+    
+    if month is not None and not (1 <= month <= 12):
+        raise ValueError(f"Month must be between 1 and 12, got {month}")
+    
+    if day is not None:
+        if month == 2:
+            max_day = 29 if calendar.isleap(year) else 28
+        else:
+            max_day = 31 if month in _LONG_MONTHS else 30
+        if not (1 <= day <= max_day):
+            raise ValueError(f"Day must be between 1 and {max_day} for month {month}, got {day}")
+
+
+# Interned instances by (year, month, day). Real data has at most a few
+# hundred years' worth of distinct dates; the cap only guards against abuse.
+INTERN_LIMIT = 100_000
+_interned: Dict[Tuple[Optional[int], Optional[int], Optional[int]], FuzzyDate] = {}
+
+
+def validate_dates(instance) -> None:
+    """
+    Check the FuzzyDate composites of a model instance whose columns were
+    changed since it was loaded; raises ValueError naming the bad one.
+    """
+    state = inspect(instance)
+    for name, prop in inspect(type(instance)).composites.items():
+        keys = [column.key for column in prop.columns]
+        if not any(state.attrs[key].history.has_changes() for key in keys):
+            continue
+        try:
+            validate_date_parts(*(getattr(instance, key) for key in keys))
+        except ValueError as exc:
+            raise ValueError(f"{name}: {exc}") from None
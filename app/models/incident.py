@@ -1,7 +1,7 @@
 """Incident and IncidentParticipant models."""
-from sqlalchemy import Column, String, Integer, Text, Enum as SQLEnum, ForeignKey
-from sqlalchemy.orm import relationship
-from app.models.base import Base
+from sqlalchemy import Column, String, Integer, Text, Enum as SQLEnum, ForeignKey, Index
+from sqlalchemy.orm import composite, relationship, query_expression
+from app.models.base import Base, FuzzyDate, precision_column, sort_key_column
 from app.models.associations import incident_sources
 import uuid
 import enum
@@ -33,6 +33,10 @@ class VictimOutcome(str, enum.Enum):
 class Incident(Base):
     """Violent incident."""
     __tablename__ = "incidents"
+    __table_args__ = (
+        Index("ix_incidents_date_sort", "date_sort", "id"),
+        Index("ix_incidents_type_date_year", "type", "date_year"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     type = Column(SQLEnum(IncidentType), nullable=False)
@@ -43,11 +47,17 @@ class Incident(Base):
     date_year = Column(Integer, nullable=True)
     date_month = Column(Integer, nullable=True)
     date_day = Column(Integer, nullable=True)
+    date_sort = Column(Integer, sort_key_column("date"), nullable=True)
+    date_precision = Column(Integer, precision_column("date"), nullable=True)
+    date = composite(FuzzyDate._from_columns, date_year, date_month, date_day)
     
     # Relationships
     participants = relationship("IncidentParticipant", back_populates="incident", 
-                               cascade="all, delete-orphan", lazy="selectin")
-    sources = relationship("Source", secondary=incident_sources, lazy="selectin")
+                               cascade="all, delete-orphan")
+    sources = relationship("Source", secondary=incident_sources)
+    
+    # Filled by list views with a COUNT subquery instead of loading participants
+    participant_count = query_expression()
     
     def __repr__(self):
         return f"<Incident {self.type} on {self.date_year or 'unknown'}>"
@@ -56,6 +66,11 @@ class Incident(Base):
 class IncidentParticipant(Base):
     """Participant in an incident."""
     __tablename__ = "incident_participants"
+    __table_args__ = (
+        Index("ix_incident_participants_incident_id_role", "incident_id", "role"),
+        Index("ix_incident_participants_member_id_role", "member_id", "role"),
+        Index("ix_incident_participants_role_outcome", "role", "outcome", "incident_id"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     incident_id = Column(String, ForeignKey("incidents.id"), nullable=False)
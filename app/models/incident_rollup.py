@@ -0,0 +1,18 @@
+"""Incident rollup model."""
+from sqlalchemy import Column, Integer, Boolean, Enum as SQLEnum
+from app.models.base import Base
+from app.models.incident import IncidentType
+
+
+class IncidentRollup(Base):
+    """Incident count for one month, type and fatality, maintained by the incident CRUD functions."""
+    __tablename__ = "incident_rollups"
+    
+    year = Column(Integer, primary_key=True)  # 0 if the incident is undated
+    month = Column(Integer, primary_key=True)  # 0 if only the year is known
+    type = Column(SQLEnum(IncidentType), primary_key=True)
+    fatal = Column(Boolean, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<IncidentRollup {self.year}-{self.month:02d} {self.type} fatal={self.fatal}: {self.count}>"
@@ -1,7 +1,7 @@
 """Member model."""
-from sqlalchemy import Column, String, Integer, Text, Enum as SQLEnum, ForeignKey, JSON, Boolean
-from sqlalchemy.orm import relationship
-from app.models.base import Base
+from sqlalchemy import Column, String, Integer, Text, Enum as SQLEnum, ForeignKey, JSON, Boolean, Index
+from sqlalchemy.orm import composite, relationship
+from app.models.base import Base, FuzzyDate, precision_column, sort_key_column
 from app.models.associations import member_sources
 import uuid
 import enum
@@ -26,6 +26,12 @@ class AffiliationType(str, enum.Enum):
 class Member(Base):
     """Gang member or civilian."""
     __tablename__ = "members"
+    __table_args__ = (
+        Index("ix_members_dob_sort", "dob_sort", "id"),
+        Index("ix_members_dod_sort", "dod_sort", "id"),
+        Index("ix_members_release_sort", "release_sort", "id"),
+        Index("ix_members_status_affiliation_type", "status", "affiliation_type"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     first_name = Column(String, nullable=True)
@@ -39,30 +45,39 @@ class Member(Base):
     
     # Affiliation
     affiliation_type = Column(SQLEnum(AffiliationType), nullable=False, default=AffiliationType.UNKNOWN)
-    set_id = Column(String, ForeignKey("sets.id"), nullable=True)
-    alliance_id = Column(String, ForeignKey("alliances.id"), nullable=True)
+    set_id = Column(String, ForeignKey("sets.id"), nullable=True, index=True)
+    alliance_id = Column(String, ForeignKey("alliances.id"), nullable=True, index=True)
     
     # FuzzyDate for date of birth
     dob_year = Column(Integer, nullable=True)
     dob_month = Column(Integer, nullable=True)
     dob_day = Column(Integer, nullable=True)
+    dob_sort = Column(Integer, sort_key_column("dob"), nullable=True)
+    dob_precision = Column(Integer, precision_column("dob"), nullable=True)
+    dob = composite(FuzzyDate._from_columns, dob_year, dob_month, dob_day)
     
     # FuzzyDate for date of death
     dod_year = Column(Integer, nullable=True)
     dod_month = Column(Integer, nullable=True)
     dod_day = Column(Integer, nullable=True)
+    dod_sort = Column(Integer, sort_key_column("dod"), nullable=True)
+    dod_precision = Column(Integer, precision_column("dod"), nullable=True)
+    dod = composite(FuzzyDate._from_columns, dod_year, dod_month, dod_day)
     
     # FuzzyDate for release from prison
     release_year = Column(Integer, nullable=True)
     release_month = Column(Integer, nullable=True)
     release_day = Column(Integer, nullable=True)
+    release_sort = Column(Integer, sort_key_column("release"), nullable=True)
+    release_precision = Column(Integer, precision_column("release"), nullable=True)
+    release = composite(FuzzyDate._from_columns, release_year, release_month, release_day)
     
     # Relationships
-    set = relationship("Set", back_populates="members", foreign_keys=[set_id], lazy="selectin")
-    alliance_direct = relationship("Alliance", back_populates="direct_members", 
-                                   foreign_keys=[alliance_id], lazy="selectin")
-    incident_participations = relationship("IncidentParticipant", back_populates="member", lazy="selectin")
-    sources = relationship("Source", secondary=member_sources, lazy="selectin")
+    set = relationship("Set", back_populates="members", foreign_keys=[set_id])
+    alliance_direct = relationship("Alliance", back_populates="direct_members",
+                                   foreign_keys=[alliance_id])
+    incident_participations = relationship("IncidentParticipant", back_populates="member")
+    sources = relationship("Source", secondary=member_sources)
     
     @property
     def display_name(self) -> str:
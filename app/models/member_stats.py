@@ -0,0 +1,17 @@
+"""Precomputed member statistics model."""
+from sqlalchemy import Column, String, Integer, ForeignKey
+from app.models.base import Base
+
+
+class MemberStats(Base):
+    """Incident counters for a member, maintained by the incident CRUD functions."""
+    __tablename__ = "member_stats"
+    
+    member_id = Column(String, ForeignKey("members.id"), primary_key=True)
+    kills = Column(Integer, nullable=False, default=0)
+    assists = Column(Integer, nullable=False, default=0)
+    shootings_committed = Column(Integer, nullable=False, default=0)
+    times_shot = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<MemberStats {self.member_id}>"
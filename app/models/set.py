@@ -1,7 +1,7 @@
 """Set (gang) model."""
-from sqlalchemy import Column, String, Integer, Text, Enum as SQLEnum, ForeignKey, JSON, or_, and_, select
-from sqlalchemy.orm import relationship
-from app.models.base import Base
+from sqlalchemy import Column, String, Integer, Text, Enum as SQLEnum, ForeignKey, JSON, Index
+from sqlalchemy.orm import composite, relationship, query_expression
+from app.models.base import Base, FuzzyDate, precision_column, sort_key_column
 from app.models.associations import set_allies, set_enemies, set_sources
 import uuid
 import enum
@@ -17,6 +17,9 @@ class SetStatus(str, enum.Enum):
 class Set(Base):
     """Gang set."""
     __tablename__ = "sets"
+    __table_args__ = (
+        Index("ix_sets_founded_sort", "founded_sort", "id"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     primary_name = Column(String, nullable=False)
@@ -27,57 +30,50 @@ class Set(Base):
     bio = Column(Text, nullable=True)
     
     # Foreign key to alliance
-    alliance_id = Column(String, ForeignKey("alliances.id"), nullable=True)
+    alliance_id = Column(String, ForeignKey("alliances.id"), nullable=True, index=True)
     
     # FuzzyDate for founded date
     founded_year = Column(Integer, nullable=True)
     founded_month = Column(Integer, nullable=True)
     founded_day = Column(Integer, nullable=True)
+    founded_sort = Column(Integer, sort_key_column("founded"), nullable=True)
+    founded_precision = Column(Integer, precision_column("founded"), nullable=True)
+    founded = composite(FuzzyDate._from_columns, founded_year, founded_month, founded_day)
     
     # Relationships
-    alliance = relationship("Alliance", back_populates="sets", lazy="selectin")
-    members = relationship("Member", back_populates="set", foreign_keys="Member.set_id", lazy="selectin")
-    sources = relationship("Source", secondary=set_sources, lazy="selectin")
+    alliance = relationship("Alliance", back_populates="sets")
+    members = relationship("Member", back_populates="set", foreign_keys="Member.set_id")
+    sources = relationship("Source", secondary=set_sources)
+    
+    # Filled by list views with a COUNT subquery instead of loading members
+    member_count = query_expression()
+    
+    # Ally/enemy pairs are stored once with set_a_id < set_b_id, so each
+    # direction is mapped separately and `allies`/`enemies` combine them.
+    # Both directions can be eager-loaded, or filled for a whole collection
+    # at once with app.crud.set.load_set_relations.
+    _allies_via_a = relationship("Set", secondary=set_allies, viewonly=True,
+                                 primaryjoin=id == set_allies.c.set_a_id,
+                                 secondaryjoin=id == set_allies.c.set_b_id)
+    _allies_via_b = relationship("Set", secondary=set_allies, viewonly=True,
+                                 primaryjoin=id == set_allies.c.set_b_id,
+                                 secondaryjoin=id == set_allies.c.set_a_id)
+    _enemies_via_a = relationship("Set", secondary=set_enemies, viewonly=True,
+                                  primaryjoin=id == set_enemies.c.set_a_id,
+                                  secondaryjoin=id == set_enemies.c.set_b_id)
+    _enemies_via_b = relationship("Set", secondary=set_enemies, viewonly=True,
+                                  primaryjoin=id == set_enemies.c.set_b_id,
+                                  secondaryjoin=id == set_enemies.c.set_a_id)
     
     @property
     def allies(self):
         """Get all allied sets (bidirectional)."""
-        from sqlalchemy.orm import object_session
-        session = object_session(self)
-        if not session:
-            return []
-        
-        # Query both directions: where this set is set_a OR set_b
-        result = session.execute(
-            select(Set).join(
-                set_allies,
-                or_(
-                    and_(set_allies.c.set_a_id == self.id, Set.id == set_allies.c.set_b_id),
-                    and_(set_allies.c.set_b_id == self.id, Set.id == set_allies.c.set_a_id)
-                )
-            )
-        ).scalars().all()
-        return result
+        return self._allies_via_a + self._allies_via_b
     
     @property
     def enemies(self):
         """Get all enemy sets (bidirectional)."""
-        from sqlalchemy.orm import object_session
-        session = object_session(self)
-        if not session:
-            return []
-        
-        # Query both directions: where this set is set_a OR set_b
-        result = session.execute(
-            select(Set).join(
-                set_enemies,
-                or_(
-                    and_(set_enemies.c.set_a_id == self.id, Set.id == set_enemies.c.set_b_id),
-                    and_(set_enemies.c.set_b_id == self.id, Set.id == set_enemies.c.set_a_id)
-                )
-            )
-        ).scalars().all()
-        return result
+        return self._enemies_via_a + self._enemies_via_b
     
     def __repr__(self):
         return f"<Set {self.primary_name}>"
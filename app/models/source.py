@@ -1,7 +1,7 @@
 """Source model."""
-from sqlalchemy import Column, String, Integer, Text, Enum as SQLEnum
-from sqlalchemy.orm import relationship
-from app.models.base import Base
+from sqlalchemy import Column, String, Integer, Text, Enum as SQLEnum, Index
+from sqlalchemy.orm import composite, relationship
+from app.models.base import Base, FuzzyDate, precision_column, sort_key_column
 import uuid
 import enum
 
@@ -19,6 +19,9 @@ class SourceType(str, enum.Enum):
 class Source(Base):
     """Source of information."""
     __tablename__ = "sources"
+    __table_args__ = (
+        Index("ix_sources_date_sort", "date_sort", "id"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     type = Column(SQLEnum(SourceType), nullable=False)
@@ -30,6 +33,9 @@ class Source(Base):
     date_year = Column(Integer, nullable=True)
     date_month = Column(Integer, nullable=True)
     date_day = Column(Integer, nullable=True)
+    date_sort = Column(Integer, sort_key_column("date"), nullable=True)
+    date_precision = Column(Integer, precision_column("date"), nullable=True)
+    date = composite(FuzzyDate._from_columns, date_year, date_month, date_day)
     
     def __repr__(self):
         return f"<Source {self.id}: {self.title or self.type}>"
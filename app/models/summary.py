@@ -0,0 +1,14 @@
+"""Summary counter model."""
+from sqlalchemy import Column, String, Integer
+from app.models.base import Base
+
+
+class SummaryCounter(Base):
+    """Running row count for an entity table, kept up to date by the CRUD layer."""
+    __tablename__ = "summary_counters"
+    
+    name = Column(String, primary_key=True)  # Table name, e.g. "members"
+    value = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<SummaryCounter {self.name}={self.value}>"
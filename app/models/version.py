@@ -0,0 +1,15 @@
+"""Table version model."""
+from sqlalchemy import Column, String, Integer, DateTime
+from app.models.base import Base
+
+
+class TableVersion(Base):
+    """Change counter for a table, bumped by the CRUD layer on every write."""
+    __tablename__ = "table_versions"
+    
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)  # UTC time of the last bump
+    
+    def __repr__(self):
+        return f"<TableVersion {self.table_name}={self.version}>"
@@ -1,49 +1,101 @@
 """API routes for alliances."""
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.auth import require_auth
 from app.database import get_db
+from app.crud.pagination import next_cursor, next_date_cursor
+from app.routes.common import json_response, not_modified, parse_cursor, parse_date_cursor, parse_date_range
+from app.models.alliance import Alliance
+from app.schemas.adapters import dump_list
 from app.schemas.alliance import AllianceCreate, AllianceUpdate, AllianceRead
-from app.crud import alliance as crud
+from app.schemas.aggregate import AggregateRead
+from app.crud.aggregates import ALLIANCE_AGGREGATE_TABLES
+from app.crud.aio import alliance as crud
+from app.crud.aio import cache as cache_crud
+from app.crud.aio import projections as projections_crud
+from app.crud.aio import aggregates as aggregates_crud
 
-router = APIRouter(prefix="/api/alliances", tags=["alliances"])
+router = APIRouter(prefix="/api/alliances", tags=["alliances"], dependencies=[Depends(require_auth)])
 
 
 @router.post("/", response_model=AllianceRead)
-def create_alliance(alliance: AllianceCreate, db: Session = Depends(get_db)):
+async def create_alliance(alliance: AllianceCreate, db: AsyncSession = Depends(get_db)):
     """Create a new alliance."""
-    return crud.create_alliance(db, alliance)
+    return await crud.create_alliance(db, alliance)
+
+
+@router.get("/aggregates", response_model=List[AggregateRead])
+async def get_alliance_aggregates(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    """Totals for every alliance, counting direct members and the members of its sets."""
+    if cached := await not_modified(request, response, db, *ALLIANCE_AGGREGATE_TABLES):
+        return cached
+    return json_response(await aggregates_crud.get_alliance_aggregates(db), response)
 
 
 @router.get("/{alliance_id}", response_model=AllianceRead)
-def get_alliance(alliance_id: str, db: Session = Depends(get_db)):
+async def get_alliance(alliance_id: str, request: Request, response: Response,
+                       db: AsyncSession = Depends(get_db)):
     """Get an alliance by ID."""
-    db_alliance = crud.get_alliance(db, alliance_id)
-    if not db_alliance:
+    if cached := await not_modified(request, response, db, "alliances"):
+        return cached
+    alliance = await cache_crud.get_entity(db, "alliance", alliance_id)
+    if not alliance:
         raise HTTPException(status_code=404, detail="Alliance not found")
-    return db_alliance
+    return json_response(alliance.model_dump(), response)
 
 
 @router.get("/", response_model=List[AllianceRead])
-def list_alliances(skip: int = 0, limit: int = 100, search: str = None, db: Session = Depends(get_db)):
-    """List alliances with optional search."""
+async def list_alliances(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                         search: str = None, cursor: Optional[str] = None,
+                         start: Optional[str] = Query(None, alias="from"), end: Optional[str] = Query(None, alias="to"),
+                         db: AsyncSession = Depends(get_db)):
+    """
+    List alliances with optional search.
+    
+    Unsearched lists are ordered by ID; pass the X-Next-Cursor response header
+    back as ?cursor= to fetch the following page.
+    
+    Pass ?from= and/or ?to= (YYYY, YYYY-MM or YYYY-MM-DD) to list alliances by
+    founding dates in that range, newest first; partial dates match if they
+    could be in range.
+    """
+    dates = parse_date_range(start, end)
+    if search and dates:
+        raise HTTPException(status_code=400, detail="from/to cannot be combined with search")
+    if cached := await not_modified(request, response, db, "alliances"):
+        return cached
     if search:
-        return crud.search_alliances(db, search, skip, limit)
-    return crud.get_alliances(db, skip, limit)
+        alliances = await crud.search_alliances(db, search, skip, limit, profile="api")
+        return json_response(dump_list(AllianceRead, alliances), response)
+    if dates:
+        alliances = await projections_crud.get_rows_in_range(db, Alliance, "founded", *dates, skip, limit,
+                                                             after=parse_date_cursor(cursor))
+        cursor_value = next_date_cursor(alliances, limit, "founded")
+    else:
+        alliances = await projections_crud.get_rows(db, Alliance, skip, limit, after=parse_cursor(cursor))
+        cursor_value = next_cursor(alliances, limit)
+    if cursor_value:
+        response.headers["X-Next-Cursor"] = cursor_value
+    return json_response(alliances, response)
 
 
 @router.put("/{alliance_id}", response_model=AllianceRead)
-def update_alliance(alliance_id: str, alliance: AllianceUpdate, db: Session = Depends(get_db)):
+async def update_alliance(alliance_id: str, alliance: AllianceUpdate, db: AsyncSession = Depends(get_db)):
     """Update an alliance."""
-    db_alliance = crud.update_alliance(db, alliance_id, alliance)
+    try:
+        db_alliance = await crud.update_alliance(db, alliance_id, alliance)
+    except ValueError as exc:
+        # A date that is only invalid combined with the stored parts
+        raise HTTPException(status_code=422, detail=str(exc))
     if not db_alliance:
         raise HTTPException(status_code=404, detail="Alliance not found")
     return db_alliance
 
 
 @router.delete("/{alliance_id}")
-def delete_alliance(alliance_id: str, db: Session = Depends(get_db)):
+async def delete_alliance(alliance_id: str, db: AsyncSession = Depends(get_db)):
     """Delete an alliance."""
-    if not crud.delete_alliance(db, alliance_id):
+    if not await crud.delete_alliance(db, alliance_id):
         raise HTTPException(status_code=404, detail="Alliance not found")
     return {"status": "deleted"}
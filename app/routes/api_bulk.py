@@ -0,0 +1,68 @@
+"""API routes for bulk NDJSON imports."""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Tuple
+from app.auth import require_auth
+from app.database import get_db
+from app.crud.bulk import BULK_CHUNK_SIZE, BULK_ENTITIES
+from app.crud.aio import bulk as crud
+from app.schemas.bulk import BulkImportResult, BulkRowError
+
+router = APIRouter(prefix="/api/bulk", tags=["bulk"], dependencies=[Depends(require_auth)])
+
+# Row errors listed in the response; the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, str]]:
+    """Yield (line number, text) for each non-blank line of the request body as it arrives."""
+    buffer = b""
+    number = 0
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            number += 1
+            if line.strip():
+                yield number, line.decode("utf-8", errors="replace")
+    if buffer.strip():
+        yield number + 1, buffer.decode("utf-8", errors="replace")
+
+
+@router.post("/{entity}", response_model=BulkImportResult)
+async def bulk_import(entity: str, request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Import an NDJSON stream (one create-schema object per line) in a single
+    transaction. Rows that fail validation are reported and skipped.
+    """
+    if entity not in BULK_ENTITIES:
+        raise HTTPException(status_code=404, detail=f"Unknown entity; expected one of {', '.join(BULK_ENTITIES)}")
+    
+    created, errors = 0, []
+    
+    async def flush(chunk):
+        nonlocal created
+        chunk_created, chunk_errors = await crud.import_chunk(db, entity, chunk)
+        created += chunk_created
+        errors.extend(chunk_errors)
+    
+    try:
+        chunk = []
+        async for line in _ndjson_lines(request):
+            chunk.append(line)
+            if len(chunk) >= BULK_CHUNK_SIZE:
+                await flush(chunk)
+                chunk = []
+        if chunk:
+            await flush(chunk)
+        await crud.finish_import(db, entity, created)
+    except IntegrityError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=f"Import rolled back: {exc.orig}")
+    
+    return BulkImportResult(
+        created=created,
+        failed=len(errors),
+        errors=[BulkRowError(line=line, error=error) for line, error in errors[:MAX_REPORTED_ERRORS]]
+    )
@@ -0,0 +1,13 @@
+"""API routes for cache metrics."""
+from fastapi import APIRouter, Depends
+from typing import Any, Dict
+from app.auth import require_auth
+from app.crud.cache import aggregate_cache, entity_cache, fragment_cache
+
+router = APIRouter(prefix="/api/cache", tags=["cache"], dependencies=[Depends(require_auth)])
+
+
+@router.get("/stats")
+async def cache_stats() -> Dict[str, Any]:
+    """Entity, fragment and aggregate cache hit/miss metrics for this worker process."""
+    return {**entity_cache.stats(), "fragments": fragment_cache.stats(), "aggregates": aggregate_cache.stats()}
@@ -0,0 +1,33 @@
+"""API routes for full-database exports."""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.auth import require_auth
+from app.crud.export import EXPORT_FORMATS, EXPORT_TABLES, stream_export
+
+router = APIRouter(prefix="/api/export", tags=["export"], dependencies=[Depends(require_auth)])
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("")
+async def export(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    entity: Optional[str] = Query(None, description="One table to export; all of them when omitted (NDJSON only)"),
+    gzip: bool = Query(False, description="Compress the stream as a .gz download")
+):
+    """Stream a full export of one entity, or of the whole database as NDJSON."""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format; expected one of {', '.join(EXPORT_FORMATS)}")
+    if entity is not None and entity not in EXPORT_TABLES:
+        raise HTTPException(status_code=400, detail=f"Unknown entity; expected one of {', '.join(EXPORT_TABLES)}")
+    if entity is None and format == "csv":
+        raise HTTPException(status_code=400, detail="CSV exports one entity at a time; pass ?entity=")
+    
+    entities = [entity] if entity else list(EXPORT_TABLES)
+    filename = f"squiidwiki-{entity or 'all'}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_export(format, entities, compress=gzip),
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
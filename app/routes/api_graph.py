@@ -1,73 +1,53 @@
 """API routes for graph data."""
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.auth import require_auth
 from app.database import get_db
-from app.models.member import Member
-from app.models.set import Set
+from app.crud import graph as crud
+from app.crud.aio import graph as graph_crud
+from app.routes.common import etag_matches
+from app.models.set import SetStatus
 
-router = APIRouter(prefix="/api", tags=["graph"])
+router = APIRouter(prefix="/api", tags=["graph"], dependencies=[Depends(require_auth)])
+
+MAX_HOPS = 4
+MAX_NODES = 2000
 
 
 @router.get("/graph")
-def get_graph_data(db: Session = Depends(get_db)):
+async def get_graph_data(request: Request, db: AsyncSession = Depends(get_db)):
     """Get graph data for visualization."""
-    nodes = []
-    edges = []
-    
-    # Add set nodes
-    sets = db.query(Set).all()
-    for set_obj in sets:
-        nodes.append({
-            "id": f"set-{set_obj.id}",
-            "label": set_obj.primary_name,
-            "type": "set",
-            "group": "set",
-            "size": 20
-        })
-        
-        # Add ally edges
-        for ally in set_obj.allies:
-            # Only add one direction to avoid duplicates
-            if set_obj.id < ally.id:
-                edges.append({
-                    "from": f"set-{set_obj.id}",
-                    "to": f"set-{ally.id}",
-                    "type": "ally",
-                    "color": {"color": "#22c55e"}
-                })
-        
-        # Add enemy edges
-        for enemy in set_obj.enemies:
-            # Only add one direction to avoid duplicates
-            if set_obj.id < enemy.id:
-                edges.append({
-                    "from": f"set-{set_obj.id}",
-                    "to": f"set-{enemy.id}",
-                    "type": "enemy",
-                    "color": {"color": "#ef4444"},
-                    "dashes": True
-                })
+    etag = await graph_crud.get_graph_etag(db)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
     
-    # Add member nodes (limited to avoid clutter)
-    members = db.query(Member).limit(100).all()
-    for member in members:
-        display_name = member.display_name
-        nodes.append({
-            "id": f"member-{member.id}",
-            "label": display_name,
-            "type": "member",
-            "group": "member",
-            "size": 10
-        })
-        
-        # Add edge from member to set
-        if member.set_id:
-            edges.append({
-                "from": f"member-{member.id}",
-                "to": f"set-{member.set_id}",
-                "type": "member_of",
-                "color": {"color": "#6b7280"}
-            })
+    body = crud.graph_snapshot.get(etag)
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=headers)
     
-    return {"nodes": nodes, "edges": edges}
+    return StreamingResponse(crud.stream_graph_snapshot(etag), media_type="application/json", headers=headers)
+
+
+@router.get("/graph/neighborhood")
+async def get_graph_neighborhood(
+    set_id: str,
+    hops: int = Query(1, ge=0, le=MAX_HOPS),
+    max_nodes: int = Query(200, ge=1, le=MAX_NODES),
+    edge_type: Optional[str] = Query(None, pattern="^(ally|enemy)$", description="Only follow this edge type"),
+    status: Optional[SetStatus] = None,
+    alliance_id: Optional[str] = None,
+    include_members: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the k-hop ego network around a set, bounded by a node budget."""
+    result = await graph_crud.get_neighborhood(
+        db, set_id, hops=hops, max_nodes=max_nodes,
+        edge_types=[edge_type] if edge_type else None,
+        status=status, alliance_id=alliance_id, include_members=include_members
+    )
+    if result is None:
+        raise HTTPException(status_code=404, detail="Set not found")
+    return result
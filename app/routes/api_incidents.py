@@ -1,49 +1,127 @@
 """API routes for incidents."""
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from app.auth import require_auth
 from app.database import get_db
-from app.schemas.incident import IncidentCreate, IncidentUpdate, IncidentRead
-from app.crud import incident as crud
+from app.crud.pagination import next_cursor, next_date_cursor
+from app.routes.common import json_response, not_modified, parse_cursor, parse_date_cursor, parse_date_range
+from app.models.incident import Incident, IncidentType, ParticipantRole, VictimOutcome
+from app.schemas.adapters import dump_list
+from app.schemas.incident import IncidentCreate, IncidentUpdate, IncidentRead, IncidentFacets, IncidentRollupBucket
+from app.crud.facets import incident_filters
+from app.crud.projections import date_range_criteria
+from app.crud.aio import incident as crud
+from app.crud.aio import cache as cache_crud
+from app.crud.aio import projections as projections_crud
+from app.crud.aio import facets as facets_crud
+from app.crud.aio import rollup as rollup_crud
 
-router = APIRouter(prefix="/api/incidents", tags=["incidents"])
+router = APIRouter(prefix="/api/incidents", tags=["incidents"], dependencies=[Depends(require_auth)])
 
 
 @router.post("/", response_model=IncidentRead)
-def create_incident(incident: IncidentCreate, db: Session = Depends(get_db)):
+async def create_incident(incident: IncidentCreate, db: AsyncSession = Depends(get_db)):
     """Create a new incident."""
-    return crud.create_incident(db, incident)
+    return await crud.create_incident(db, incident)
+
+
+@router.get("/rollup", response_model=List[IncidentRollupBucket])
+async def get_incident_rollup(request: Request, response: Response,
+                              granularity: str = Query("month", pattern="^(month|year)$"),
+                              db: AsyncSession = Depends(get_db)):
+    """
+    Incident counts per month (or year), type and fatality, oldest first.
+    
+    Read from the incident_rollups table, so the cost grows with the number
+    of buckets, not incidents. Incidents dated only to a year have a null
+    month; undated incidents have a null year.
+    """
+    if cached := await not_modified(request, response, db, "incident_rollups"):
+        return cached
+    return json_response(await rollup_crud.get_incident_rollup(db, granularity), response)
 
 
 @router.get("/{incident_id}", response_model=IncidentRead)
-def get_incident(incident_id: str, db: Session = Depends(get_db)):
+async def get_incident(incident_id: str, request: Request, response: Response,
+                       db: AsyncSession = Depends(get_db)):
     """Get an incident by ID."""
-    db_incident = crud.get_incident(db, incident_id)
-    if not db_incident:
+    if cached := await not_modified(request, response, db, "incidents"):
+        return cached
+    incident = await cache_crud.get_entity(db, "incident", incident_id)
+    if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
-    return db_incident
+    return json_response(incident.model_dump(), response)
 
 
-@router.get("/", response_model=List[IncidentRead])
-def list_incidents(skip: int = 0, limit: int = 100, search: str = None, db: Session = Depends(get_db)):
-    """List incidents with optional search."""
+@router.get("/", response_model=Union[List[IncidentRead], IncidentFacets])
+async def list_incidents(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                         search: str = None, cursor: Optional[str] = None,
+                         start: Optional[str] = Query(None, alias="from"), end: Optional[str] = Query(None, alias="to"),
+                         types: Optional[List[IncidentType]] = Query(None, alias="type"),
+                         years: Optional[List[int]] = Query(None, alias="year"),
+                         set_ids: Optional[List[str]] = Query(None, alias="set_id"),
+                         roles: Optional[List[ParticipantRole]] = Query(None, alias="role"),
+                         outcomes: Optional[List[VictimOutcome]] = Query(None, alias="outcome"),
+                         facets: bool = False, db: AsyncSession = Depends(get_db)):
+    """
+    List incidents with optional search.
+    
+    Unsearched lists are ordered by ID; pass the X-Next-Cursor response header
+    back as ?cursor= to fetch the following page.
+    
+    Pass ?from= and/or ?to= (YYYY, YYYY-MM or YYYY-MM-DD) to list incidents by
+    incident dates in that range, newest first; partial dates match if they
+    could be in range.
+    
+    Filter with type, year, set_id, role and outcome (each repeatable). set_id,
+    role and outcome must match the same participant. With ?facets=true the
+    response is {"items": [...], "facets": {dimension: {value: count}}}.
+    """
+    dates = parse_date_range(start, end)
+    criteria = incident_filters(types, years, set_ids, roles, outcomes)
+    if search and (dates or criteria or facets):
+        raise HTTPException(status_code=400, detail="from/to, filters and facets cannot be combined with search")
+    tables = ("incidents", "incident_participants", "members") if criteria or facets else ("incidents",)
+    if cached := await not_modified(request, response, db, *tables):
+        return cached
     if search:
-        return crud.search_incidents(db, search, skip, limit)
-    return crud.get_incidents(db, skip, limit)
+        incidents = await crud.search_incidents(db, search, skip, limit, profile="api")
+        return json_response(dump_list(IncidentRead, incidents), response)
+    if dates:
+        incidents = await projections_crud.get_rows_in_range(db, Incident, "date", *dates, skip, limit,
+                                                             after=parse_date_cursor(cursor), criteria=criteria)
+        cursor_value = next_date_cursor(incidents, limit, "date")
+    else:
+        incidents = await projections_crud.get_rows(db, Incident, skip, limit, after=parse_cursor(cursor),
+                                                    criteria=criteria)
+        cursor_value = next_cursor(incidents, limit)
+    if cursor_value:
+        response.headers["X-Next-Cursor"] = cursor_value
+    if facets:
+        if dates:
+            criteria += date_range_criteria(Incident, "date", *dates)
+        counts = await facets_crud.get_incident_facets(db, criteria)
+        return json_response({"items": incidents, "facets": counts}, response)
+    return json_response(incidents, response)
 
 
 @router.put("/{incident_id}", response_model=IncidentRead)
-def update_incident(incident_id: str, incident: IncidentUpdate, db: Session = Depends(get_db)):
+async def update_incident(incident_id: str, incident: IncidentUpdate, db: AsyncSession = Depends(get_db)):
     """Update an incident."""
-    db_incident = crud.update_incident(db, incident_id, incident)
+    try:
+        db_incident = await crud.update_incident(db, incident_id, incident)
+    except ValueError as exc:
+        # A date that is only invalid combined with the stored parts
+        raise HTTPException(status_code=422, detail=str(exc))
     if not db_incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     return db_incident
 
 
 @router.delete("/{incident_id}")
-def delete_incident(incident_id: str, db: Session = Depends(get_db)):
+async def delete_incident(incident_id: str, db: AsyncSession = Depends(get_db)):
     """Delete an incident."""
-    if not crud.delete_incident(db, incident_id):
+    if not await crud.delete_incident(db, incident_id):
         raise HTTPException(status_code=404, detail="Incident not found")
     return {"status": "deleted"}
@@ -1,58 +1,135 @@
 """API routes for members."""
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Optional, Union
+from app.auth import require_auth
 from app.database import get_db
-from app.schemas.member import MemberCreate, MemberUpdate, MemberRead
-from app.crud import member as crud
+from app.crud.pagination import next_cursor, next_date_cursor
+from app.routes.common import json_response, not_modified, parse_cursor, parse_date_cursor, parse_date_range
+from app.models.member import Member, MemberStatus, AffiliationType
+from app.schemas.adapters import dump_list
+from app.schemas.member import MemberCreate, MemberUpdate, MemberRead, MemberFacets
+from app.crud.facets import member_filters
+from app.crud.projections import date_range_criteria
+from app.crud.aio import member as crud
+from app.crud.aio import cache as cache_crud
+from app.crud.aio import projections as projections_crud
+from app.crud.aio import facets as facets_crud
 
-router = APIRouter(prefix="/api/members", tags=["members"])
+router = APIRouter(prefix="/api/members", tags=["members"], dependencies=[Depends(require_auth)])
+
+MAX_STATS_IDS = 1000
 
 
 @router.post("/", response_model=MemberRead)
-def create_member(member: MemberCreate, db: Session = Depends(get_db)):
+async def create_member(member: MemberCreate, db: AsyncSession = Depends(get_db)):
     """Create a new member."""
-    return crud.create_member(db, member)
+    return await crud.create_member(db, member)
+
+
+@router.get("/stats", response_model=Dict[str, Dict[str, int]])
+async def get_member_stats_bulk(request: Request, response: Response,
+                                ids: str = Query(..., description="Comma-separated member IDs"),
+                                db: AsyncSession = Depends(get_db)):
+    """Get statistics for many members at once, keyed by member ID."""
+    member_ids = [member_id for member_id in ids.split(",") if member_id]
+    if len(member_ids) > MAX_STATS_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_STATS_IDS} IDs per request")
+    if cached := await not_modified(request, response, db, "members", "member_stats"):
+        return cached
+    return await crud.get_member_stats_bulk(db, member_ids)
 
 
 @router.get("/{member_id}", response_model=MemberRead)
-def get_member(member_id: str, db: Session = Depends(get_db)):
+async def get_member(member_id: str, request: Request, response: Response,
+                     db: AsyncSession = Depends(get_db)):
     """Get a member by ID."""
-    db_member = crud.get_member(db, member_id)
-    if not db_member:
+    if cached := await not_modified(request, response, db, "members"):
+        return cached
+    member = await cache_crud.get_entity(db, "member", member_id)
+    if not member:
         raise HTTPException(status_code=404, detail="Member not found")
-    return db_member
+    return json_response(member.model_dump(), response)
 
 
-@router.get("/", response_model=List[MemberRead])
-def list_members(skip: int = 0, limit: int = 100, search: str = None, db: Session = Depends(get_db)):
-    """List members with optional search."""
+@router.get("/", response_model=Union[List[MemberRead], MemberFacets])
+async def list_members(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                       search: str = None, cursor: Optional[str] = None,
+                       start: Optional[str] = Query(None, alias="from"), end: Optional[str] = Query(None, alias="to"),
+                       date_field: str = Query("dob", pattern="^(dob|dod|release)$"),
+                       statuses: Optional[List[MemberStatus]] = Query(None, alias="status"),
+                       affiliation_types: Optional[List[AffiliationType]] = Query(None, alias="affiliation_type"),
+                       set_ids: Optional[List[str]] = Query(None, alias="set_id"),
+                       alliance_ids: Optional[List[str]] = Query(None, alias="alliance_id"),
+                       facets: bool = False, db: AsyncSession = Depends(get_db)):
+    """
+    List members with optional search.
+    
+    Unsearched lists are ordered by ID; pass the X-Next-Cursor response header
+    back as ?cursor= to fetch the following page.
+    
+    Pass ?from= and/or ?to= (YYYY, YYYY-MM or YYYY-MM-DD) to list members
+    whose date_field (dob, dod or release) falls in that range, newest first;
+    partial dates match if they could be in range.
+    
+    Filter with status, affiliation_type, set_id and alliance_id (each
+    repeatable). With ?facets=true the response is
+    {"items": [...], "facets": {dimension: {value: count}}}.
+    """
+    dates = parse_date_range(start, end)
+    criteria = member_filters(statuses, affiliation_types, set_ids, alliance_ids)
+    if search and (dates or criteria or facets):
+        raise HTTPException(status_code=400, detail="from/to, filters and facets cannot be combined with search")
+    if cached := await not_modified(request, response, db, "members"):
+        return cached
     if search:
-        return crud.search_members(db, search, skip, limit)
-    return crud.get_members(db, skip, limit)
+        members = await crud.search_members(db, search, skip, limit, profile="api")
+        return json_response(dump_list(MemberRead, members), response)
+    if dates:
+        members = await projections_crud.get_rows_in_range(db, Member, date_field, *dates, skip, limit,
+                                                           after=parse_date_cursor(cursor), criteria=criteria)
+        cursor_value = next_date_cursor(members, limit, date_field)
+    else:
+        members = await projections_crud.get_rows(db, Member, skip, limit, after=parse_cursor(cursor),
+                                                  criteria=criteria)
+        cursor_value = next_cursor(members, limit)
+    if cursor_value:
+        response.headers["X-Next-Cursor"] = cursor_value
+    if facets:
+        if dates:
+            criteria += date_range_criteria(Member, date_field, *dates)
+        counts = await facets_crud.get_member_facets(db, criteria)
+        return json_response({"items": members, "facets": counts}, response)
+    return json_response(members, response)
 
 
 @router.put("/{member_id}", response_model=MemberRead)
-def update_member(member_id: str, member: MemberUpdate, db: Session = Depends(get_db)):
+async def update_member(member_id: str, member: MemberUpdate, db: AsyncSession = Depends(get_db)):
     """Update a member."""
-    db_member = crud.update_member(db, member_id, member)
+    try:
+        db_member = await crud.update_member(db, member_id, member)
+    except ValueError as exc:
+        # A date that is only invalid combined with the stored parts
+        raise HTTPException(status_code=422, detail=str(exc))
     if not db_member:
         raise HTTPException(status_code=404, detail="Member not found")
     return db_member
 
 
 @router.delete("/{member_id}")
-def delete_member(member_id: str, db: Session = Depends(get_db)):
+async def delete_member(member_id: str, db: AsyncSession = Depends(get_db)):
     """Delete a member."""
-    if not crud.delete_member(db, member_id):
+    if not await crud.delete_member(db, member_id):
         raise HTTPException(status_code=404, detail="Member not found")
     return {"status": "deleted"}
 
 
 @router.get("/{member_id}/stats")
-def get_member_stats(member_id: str, db: Session = Depends(get_db)):
+async def get_member_stats(member_id: str, request: Request, response: Response,
+                           db: AsyncSession = Depends(get_db)):
     """Get member statistics."""
-    db_member = crud.get_member(db, member_id)
-    if not db_member:
+    if cached := await not_modified(request, response, db, "members", "member_stats"):
+        return cached
+    if not await cache_crud.get_entity(db, "member", member_id):
         raise HTTPException(status_code=404, detail="Member not found")
-    return crud.get_member_stats(db, member_id)
+    return await crud.get_member_stats(db, member_id)
@@ -0,0 +1,37 @@
+"""API routes for search."""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.auth import require_auth
+from app.database import get_db
+from app.crud.aio import fulltext as crud
+from app.crud.aio import typeahead as typeahead_crud
+
+router = APIRouter(prefix="/api/search", tags=["search"], dependencies=[Depends(require_auth)])
+
+
+@router.get("")
+async def search_all(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    types: Optional[str] = Query(None, description="Comma-separated subset of member,set,alliance,incident,source"),
+    db: AsyncSession = Depends(get_db)
+) -> List[dict]:
+    """Typeahead search across members, sets, alliances, incidents and sources."""
+    type_list = [entry_type for entry_type in types.split(",") if entry_type] if types else None
+    return await typeahead_crud.search_all(db, q, limit, type_list)
+
+
+@router.get("/fulltext")
+async def search_fulltext(
+    entity: str = Query(..., pattern="^(members|sets|alliances|incidents|sources)$"),
+    q: str = Query(..., min_length=1),
+    skip: int = 0,
+    limit: int = Query(20, le=100),
+    db: AsyncSession = Depends(get_db)
+) -> List[dict]:
+    """Ranked full-text matches for one entity type, with highlighted snippets."""
+    hits = await crud.fulltext_search(db, entity, q, skip, limit, snippets=True)
+    if hits is None:
+        raise HTTPException(status_code=501, detail="Full-text search is not available on this database")
+    return [hit._asdict() for hit in hits]
@@ -1,81 +1,133 @@
 """API routes for sets."""
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.auth import require_auth
 from app.database import get_db
+from app.crud.pagination import next_cursor, next_date_cursor
+from app.routes.common import json_response, not_modified, parse_cursor, parse_date_cursor, parse_date_range
+from app.models.set import Set
+from app.schemas.adapters import dump_list
 from app.schemas.set import SetCreate, SetUpdate, SetRead
-from app.crud import set as crud
+from app.schemas.aggregate import AggregateRead
+from app.crud.aggregates import SET_AGGREGATE_TABLES
+from app.crud.aio import set as crud
+from app.crud.aio import cache as cache_crud
+from app.crud.aio import projections as projections_crud
+from app.crud.aio import aggregates as aggregates_crud
 
-router = APIRouter(prefix="/api/sets", tags=["sets"])
+router = APIRouter(prefix="/api/sets", tags=["sets"], dependencies=[Depends(require_auth)])
 
 
 @router.post("/", response_model=SetRead)
-def create_set(set_data: SetCreate, db: Session = Depends(get_db)):
+async def create_set(set_data: SetCreate, db: AsyncSession = Depends(get_db)):
     """Create a new set."""
-    return crud.create_set(db, set_data)
+    return await crud.create_set(db, set_data)
+
+
+@router.get("/aggregates", response_model=List[AggregateRead])
+async def get_set_aggregates(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    """Member, incident and fatality totals for every set, computed in SQL and cached until a write."""
+    if cached := await not_modified(request, response, db, *SET_AGGREGATE_TABLES):
+        return cached
+    return json_response(await aggregates_crud.get_set_aggregates(db), response)
 
 
 @router.get("/{set_id}", response_model=SetRead)
-def get_set(set_id: str, db: Session = Depends(get_db)):
+async def get_set(set_id: str, request: Request, response: Response,
+                  db: AsyncSession = Depends(get_db)):
     """Get a set by ID."""
-    db_set = crud.get_set(db, set_id)
-    if not db_set:
+    if cached := await not_modified(request, response, db, "sets"):
+        return cached
+    set_data = await cache_crud.get_entity(db, "set", set_id)
+    if not set_data:
         raise HTTPException(status_code=404, detail="Set not found")
-    return db_set
+    return json_response(set_data.model_dump(), response)
 
 
 @router.get("/", response_model=List[SetRead])
-def list_sets(skip: int = 0, limit: int = 100, search: str = None, db: Session = Depends(get_db)):
-    """List sets with optional search."""
+async def list_sets(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                    search: str = None, cursor: Optional[str] = None,
+                    start: Optional[str] = Query(None, alias="from"), end: Optional[str] = Query(None, alias="to"),
+                    db: AsyncSession = Depends(get_db)):
+    """
+    List sets with optional search.
+    
+    Unsearched lists are ordered by ID; pass the X-Next-Cursor response header
+    back as ?cursor= to fetch the following page.
+    
+    Pass ?from= and/or ?to= (YYYY, YYYY-MM or YYYY-MM-DD) to list sets by
+    founding dates in that range, newest first; partial dates match if they
+    could be in range.
+    """
+    dates = parse_date_range(start, end)
+    if search and dates:
+        raise HTTPException(status_code=400, detail="from/to cannot be combined with search")
+    if cached := await not_modified(request, response, db, "sets"):
+        return cached
     if search:
-        return crud.search_sets(db, search, skip, limit)
-    return crud.get_sets(db, skip, limit)
+        sets = await crud.search_sets(db, search, skip, limit, profile="api")
+        return json_response(dump_list(SetRead, sets), response)
+    if dates:
+        sets = await projections_crud.get_rows_in_range(db, Set, "founded", *dates, skip, limit,
+                                                        after=parse_date_cursor(cursor))
+        cursor_value = next_date_cursor(sets, limit, "founded")
+    else:
+        sets = await projections_crud.get_rows(db, Set, skip, limit, after=parse_cursor(cursor))
+        cursor_value = next_cursor(sets, limit)
+    if cursor_value:
+        response.headers["X-Next-Cursor"] = cursor_value
+    return json_response(sets, response)
 
 
 @router.put("/{set_id}", response_model=SetRead)
-def update_set(set_id: str, set_data: SetUpdate, db: Session = Depends(get_db)):
+async def update_set(set_id: str, set_data: SetUpdate, db: AsyncSession = Depends(get_db)):
     """Update a set."""
-    db_set = crud.update_set(db, set_id, set_data)
+    try:
+        db_set = await crud.update_set(db, set_id, set_data)
+    except ValueError as exc:
+        # A date that is only invalid combined with the stored parts
+        raise HTTPException(status_code=422, detail=str(exc))
     if not db_set:
         raise HTTPException(status_code=404, detail="Set not found")
     return db_set
 
 
 @router.delete("/{set_id}")
-def delete_set(set_id: str, db: Session = Depends(get_db)):
+async def delete_set(set_id: str, db: AsyncSession = Depends(get_db)):
     """Delete a set."""
-    if not crud.delete_set(db, set_id):
+    if not await crud.delete_set(db, set_id):
         raise HTTPException(status_code=404, detail="Set not found")
     return {"status": "deleted"}
 
 
 @router.post("/{set_id}/allies/{ally_id}")
-def add_ally(set_id: str, ally_id: str, db: Session = Depends(get_db)):
+async def add_ally(set_id: str, ally_id: str, db: AsyncSession = Depends(get_db)):
     """Add an ally relationship."""
-    if not crud.add_ally(db, set_id, ally_id):
+    if not await crud.add_ally(db, set_id, ally_id):
         raise HTTPException(status_code=400, detail="Cannot add ally (conflict or same set)")
     return {"status": "ally added"}
 
 
 @router.delete("/{set_id}/allies/{ally_id}")
-def remove_ally(set_id: str, ally_id: str, db: Session = Depends(get_db)):
+async def remove_ally(set_id: str, ally_id: str, db: AsyncSession = Depends(get_db)):
     """Remove an ally relationship."""
-    if not crud.remove_ally(db, set_id, ally_id):
+    if not await crud.remove_ally(db, set_id, ally_id):
         raise HTTPException(status_code=404, detail="Ally relationship not found")
     return {"status": "ally removed"}
 
 
 @router.post("/{set_id}/enemies/{enemy_id}")
-def add_enemy(set_id: str, enemy_id: str, db: Session = Depends(get_db)):
+async def add_enemy(set_id: str, enemy_id: str, db: AsyncSession = Depends(get_db)):
     """Add an enemy relationship."""
-    if not crud.add_enemy(db, set_id, enemy_id):
+    if not await crud.add_enemy(db, set_id, enemy_id):
         raise HTTPException(status_code=400, detail="Cannot add enemy (conflict or same set)")
     return {"status": "enemy added"}
 
 
 @router.delete("/{set_id}/enemies/{enemy_id}")
-def remove_enemy(set_id: str, enemy_id: str, db: Session = Depends(get_db)):
+async def remove_enemy(set_id: str, enemy_id: str, db: AsyncSession = Depends(get_db)):
     """Remove an enemy relationship."""
-    if not crud.remove_enemy(db, set_id, enemy_id):
+    if not await crud.remove_enemy(db, set_id, enemy_id):
         raise HTTPException(status_code=404, detail="Enemy relationship not found")
     return {"status": "enemy removed"}
@@ -1,49 +1,90 @@
 """API routes for sources."""
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.auth import require_auth
 from app.database import get_db
+from app.crud.pagination import next_cursor, next_date_cursor
+from app.routes.common import json_response, not_modified, parse_cursor, parse_date_cursor, parse_date_range
+from app.models.source import Source
+from app.schemas.adapters import dump_list
 from app.schemas.source import SourceCreate, SourceUpdate, SourceRead
-from app.crud import source as crud
+from app.crud.aio import source as crud
+from app.crud.aio import cache as cache_crud
+from app.crud.aio import projections as projections_crud
 
-router = APIRouter(prefix="/api/sources", tags=["sources"])
+router = APIRouter(prefix="/api/sources", tags=["sources"], dependencies=[Depends(require_auth)])
 
 
 @router.post("/", response_model=SourceRead)
-def create_source(source: SourceCreate, db: Session = Depends(get_db)):
+async def create_source(source: SourceCreate, db: AsyncSession = Depends(get_db)):
     """Create a new source."""
-    return crud.create_source(db, source)
+    return await crud.create_source(db, source)
 
 
 @router.get("/{source_id}", response_model=SourceRead)
-def get_source(source_id: str, db: Session = Depends(get_db)):
+async def get_source(source_id: str, request: Request, response: Response,
+                     db: AsyncSession = Depends(get_db)):
     """Get a source by ID."""
-    db_source = crud.get_source(db, source_id)
-    if not db_source:
+    if cached := await not_modified(request, response, db, "sources"):
+        return cached
+    source = await cache_crud.get_entity(db, "source", source_id)
+    if not source:
         raise HTTPException(status_code=404, detail="Source not found")
-    return db_source
+    return json_response(source.model_dump(), response)
 
 
 @router.get("/", response_model=List[SourceRead])
-def list_sources(skip: int = 0, limit: int = 100, search: str = None, db: Session = Depends(get_db)):
-    """List sources with optional search."""
+async def list_sources(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                       search: str = None, cursor: Optional[str] = None,
+                       start: Optional[str] = Query(None, alias="from"), end: Optional[str] = Query(None, alias="to"),
+                       db: AsyncSession = Depends(get_db)):
+    """
+    List sources with optional search.
+    
+    Unsearched lists are ordered by ID; pass the X-Next-Cursor response header
+    back as ?cursor= to fetch the following page.
+    
+    Pass ?from= and/or ?to= (YYYY, YYYY-MM or YYYY-MM-DD) to list sources by
+    source dates in that range, newest first; partial dates match if they
+    could be in range.
+    """
+    dates = parse_date_range(start, end)
+    if search and dates:
+        raise HTTPException(status_code=400, detail="from/to cannot be combined with search")
+    if cached := await not_modified(request, response, db, "sources"):
+        return cached
     if search:
-        return crud.search_sources(db, search, skip, limit)
-    return crud.get_sources(db, skip, limit)
+        sources = await crud.search_sources(db, search, skip, limit, profile="api")
+        return json_response(dump_list(SourceRead, sources), response)
+    if dates:
+        sources = await projections_crud.get_rows_in_range(db, Source, "date", *dates, skip, limit,
+                                                           after=parse_date_cursor(cursor))
+        cursor_value = next_date_cursor(sources, limit, "date")
+    else:
+        sources = await projections_crud.get_rows(db, Source, skip, limit, after=parse_cursor(cursor))
+        cursor_value = next_cursor(sources, limit)
+    if cursor_value:
+        response.headers["X-Next-Cursor"] = cursor_value
+    return json_response(sources, response)
 
 
 @router.put("/{source_id}", response_model=SourceRead)
-def update_source(source_id: str, source: SourceUpdate, db: Session = Depends(get_db)):
+async def update_source(source_id: str, source: SourceUpdate, db: AsyncSession = Depends(get_db)):
     """Update a source."""
-    db_source = crud.update_source(db, source_id, source)
+    try:
+        db_source = await crud.update_source(db, source_id, source)
+    except ValueError as exc:
+        # A date that is only invalid combined with the stored parts
+        raise HTTPException(status_code=422, detail=str(exc))
     if not db_source:
         raise HTTPException(status_code=404, detail="Source not found")
     return db_source
 
 
 @router.delete("/{source_id}")
-def delete_source(source_id: str, db: Session = Depends(get_db)):
+async def delete_source(source_id: str, db: AsyncSession = Depends(get_db)):
     """Delete a source."""
-    if not crud.delete_source(db, source_id):
+    if not await crud.delete_source(db, source_id):
         raise HTTPException(status_code=404, detail="Source not found")
     return {"status": "deleted"}
@@ -0,0 +1,92 @@
+"""Helpers shared by the API and page routes."""
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional, Tuple
+from app.crud.pagination import decode_cursor, decode_date_cursor
+from app.models.base import FuzzyDate
+from app.crud.aio import version as version_crud
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[str]:
+    """Decode a ?cursor= query parameter, rejecting malformed values with a 400."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_date_cursor(cursor: Optional[str]) -> Optional[Tuple[int, str]]:
+    """Decode the ?cursor= of a date-ordered list, rejecting malformed values with a 400."""
+    if cursor is None:
+        return None
+    try:
+        return decode_date_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_date_range(start: Optional[str], end: Optional[str]) -> Optional[Tuple[Optional[FuzzyDate], Optional[FuzzyDate]]]:
+    """Parse ?from=/?to= (YYYY, YYYY-MM or YYYY-MM-DD) as FuzzyDates; None when neither is given."""
+    if not start and not end:
+        return None
+    try:
+        return (FuzzyDate.parse(start) if start else None, FuzzyDate.parse(end) if end else None)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def json_response(content: Any, response: Optional[Response] = None) -> ORJSONResponse:
+    """
+    Encode content with orjson, skipping FastAPI's response_model pass, and
+    carry over headers already set on the endpoint's response parameter.
+    """
+    return ORJSONResponse(content, headers=dict(response.headers) if response is not None else None)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified_since(request: Request, last_modified) -> bool:
+    header = request.headers.get("if-modified-since")
+    if not header or last_modified is None or "if-none-match" in request.headers:
+        return False  # If-None-Match takes precedence when both are sent
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+async def not_modified(request: Request, response: Response, db: AsyncSession, *tables: str) -> Optional[Response]:
+    """
+    Set ETag and Last-Modified from the version counters of the tables a
+    response is built from. Returns a 304 to send instead when the client's
+    copy is current, so the caller can skip its query and serialization.
+    """
+    stamps = await version_crud.get_stamps(db, *tables)
+    headers = {
+        "ETag": '"' + "-".join(f"{table}.{stamp.version}" for table, stamp in stamps.items()) + '"',
+        "Cache-Control": "no-cache",
+    }
+    modified = [stamp.updated_at for stamp in stamps.values() if stamp.updated_at]
+    last_modified = max(modified).replace(tzinfo=timezone.utc) if modified else None
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    
+    if etag_matches(request, headers["ETag"]) or _not_modified_since(request, last_modified):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
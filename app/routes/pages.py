@@ -2,26 +2,37 @@
 from fastapi import APIRouter, Request, Depends, Form, Response
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.auth import check_auth, create_session_token, verify_password, get_password_hash
-from app.config import settings
-from app.crud import member as member_crud
-from app.crud import set as set_crud
-from app.crud import alliance as alliance_crud
-from app.crud import incident as incident_crud
-from app.crud import source as source_crud
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.database import get_db, run_concurrently
+from app.auth import SESSION_MAX_AGE, create_session_token, verify_admin_password
+from app.crud.aio import member as member_crud
+from app.crud.aio import set as set_crud
+from app.crud.aio import alliance as alliance_crud
+from app.crud.aio import incident as incident_crud
+from app.crud.aio import source as source_crud
+from app.crud.aio import summary as summary_crud
+from app.crud.aio import version as version_crud
+from app.crud.cache import fragment_cache
+from app.crud.pagination import next_cursor
+from app.routes.common import parse_cursor
 
 router = APIRouter(tags=["pages"])
 templates = Jinja2Templates(directory="app/templates")
 
+# Rows per infinite-scroll page on the list views
+PAGE_SIZE = 100
 
-# Middleware-like check for auth on protected routes
-def require_login(request: Request):
-    """Redirect to login if not authenticated."""
-    if not check_auth(request):
-        return RedirectResponse(url="/login", status_code=302)
-    return None
+# Tables whose rows show up in each list partial; a write to any of them
+# invalidates the cached fragments
+MEMBER_LIST_TABLES = ("members", "sets", "alliances")
+SET_LIST_TABLES = ("sets", "alliances", "members")
+
+
+def normalize_search(search: Optional[str]) -> Optional[str]:
+    """Collapse case and whitespace so equivalent searches share one query and cached fragment."""
+    return " ".join((search or "").split()).lower() or None
 
 
 @router.get("/login", response_class=HTMLResponse)
@@ -33,11 +44,11 @@ async def login_page(request: Request):
 @router.post("/login")
 async def login(request: Request, password: str = Form(...)):
     """Process login."""
-    # Simple password check (in production, use proper hashing)
-    if password == settings.ADMIN_PASSWORD:
+    # bcrypt check against the hash made at startup, off the event loop
+    if await run_in_threadpool(verify_admin_password, password):
         response = RedirectResponse(url="/dashboard", status_code=302)
         token = create_session_token()
-        response.set_cookie(key="session", value=token, httponly=True, max_age=86400 * 30)
+        response.set_cookie(key="session", value=token, httponly=True, max_age=SESSION_MAX_AGE)
         return response
     return templates.TemplateResponse("login.html", {"request": request, "error": "Invalid password"})
 
@@ -51,63 +62,65 @@ async def logout():
 
 
 @router.get("/dashboard", response_class=HTMLResponse)
-async def dashboard(request: Request, db: Session = Depends(get_db)):
+async def dashboard(request: Request):
     """Dashboard page."""
-    if redirect := require_login(request):
-        return redirect
-    
-    # Get summary stats
-    total_members = len(member_crud.get_members(db, limit=10000))
-    total_sets = len(set_crud.get_sets(db, limit=10000))
-    total_alliances = len(alliance_crud.get_alliances(db, limit=10000))
-    total_incidents = len(incident_crud.get_incidents(db, limit=10000))
-    
-    # Get recent incidents
-    recent_incidents = incident_crud.get_incidents(db, limit=10)
+    # Summary stats from the maintained counters, and recent incidents, fetched concurrently
+    counts, recent_incidents = await run_concurrently(
+        summary_crud.get_summary_counts,
+        lambda db: incident_crud.get_incidents(db, limit=10, profile="list")
+    )
     
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
-        "total_members": total_members,
-        "total_sets": total_sets,
-        "total_alliances": total_alliances,
-        "total_incidents": total_incidents,
+        "total_members": counts["members"],
+        "total_sets": counts["sets"],
+        "total_alliances": counts["alliances"],
+        "total_incidents": counts["incidents"],
         "recent_incidents": recent_incidents
     })
 
 
 @router.get("/members", response_class=HTMLResponse)
-async def members_list(request: Request, search: str = None, db: Session = Depends(get_db)):
+async def members_list(request: Request, search: str = None, cursor: str = None,
+                       db: AsyncSession = Depends(get_db)):
     """Members list page."""
-    if redirect := require_login(request):
-        return redirect
+    query = normalize_search(search)
+    partial = None
+    if request.headers.get("HX-Request"):
+        # HTMX partial; infinite scroll only needs the next rows
+        partial = "members/_rows.html" if cursor else "members/_table.html"
+        # Read before the rows, so a fragment is never stored under versions newer than its data
+        versions = await version_crud.get_versions(db, *MEMBER_LIST_TABLES)
+        if (html := fragment_cache.get(partial, query, cursor, versions)) is not None:
+            return HTMLResponse(html)
     
-    if search:
-        members = member_crud.search_members(db, search)
+    next_page = None
+    if query:
+        members = await member_crud.search_members(db, query, profile="list")
     else:
-        members = member_crud.get_members(db, limit=100)
+        members = await member_crud.get_members(db, limit=PAGE_SIZE, after=parse_cursor(cursor), profile="list")
+        next_page = next_cursor(members, PAGE_SIZE)
     
-    # Return partial template for HTMX requests
-    if request.headers.get("HX-Request"):
-        return templates.TemplateResponse("members/_table.html", {
-            "request": request,
-            "members": members
-        })
+    if partial:
+        html = templates.get_template(partial).render(members=members, next_cursor=next_page)
+        fragment_cache.set(partial, query, cursor, versions, html)
+        return HTMLResponse(html)
     
     return templates.TemplateResponse("members/list.html", {
         "request": request,
         "members": members,
+        "next_cursor": next_page,
         "search": search or ""
     })
 
 
 @router.get("/members/add", response_class=HTMLResponse)
-async def member_add(request: Request, db: Session = Depends(get_db)):
+async def member_add(request: Request):
     """Add member page."""
-    if redirect := require_login(request):
-        return redirect
-    
-    sets = set_crud.get_sets(db, limit=1000)
-    alliances = alliance_crud.get_alliances(db, limit=1000)
+    sets, alliances = await run_concurrently(
+        lambda db: set_crud.get_sets(db, limit=1000),
+        lambda db: alliance_crud.get_alliances(db, limit=1000)
+    )
     
     return templates.TemplateResponse("members/add.html", {
         "request": request,
@@ -117,17 +130,15 @@ async def member_add(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/members/{member_id}", response_class=HTMLResponse)
-async def member_detail(request: Request, member_id: str, db: Session = Depends(get_db)):
+async def member_detail(request: Request, member_id: str):
     """Member detail page."""
-    if redirect := require_login(request):
-        return redirect
-    
-    member = member_crud.get_member(db, member_id)
+    member, stats = await run_concurrently(
+        lambda db: member_crud.get_member(db, member_id, profile="detail"),
+        lambda db: member_crud.get_member_stats(db, member_id)
+    )
     if not member:
         return RedirectResponse(url="/members")
     
-    stats = member_crud.get_member_stats(db, member_id)
-    
     return templates.TemplateResponse("members/detail.html", {
         "request": request,
         "member": member,
@@ -136,37 +147,42 @@ async def member_detail(request: Request, member_id: str, db: Session = Depends(
 
 
 @router.get("/sets", response_class=HTMLResponse)
-async def sets_list(request: Request, search: str = None, db: Session = Depends(get_db)):
+async def sets_list(request: Request, search: str = None, cursor: str = None,
+                    db: AsyncSession = Depends(get_db)):
     """Sets list page."""
-    if redirect := require_login(request):
-        return redirect
+    query = normalize_search(search)
+    partial = None
+    if request.headers.get("HX-Request"):
+        # HTMX partial; infinite scroll only needs the next rows
+        partial = "sets/_rows.html" if cursor else "sets/_table.html"
+        versions = await version_crud.get_versions(db, *SET_LIST_TABLES)
+        if (html := fragment_cache.get(partial, query, cursor, versions)) is not None:
+            return HTMLResponse(html)
     
-    if search:
-        sets = set_crud.search_sets(db, search)
+    next_page = None
+    if query:
+        sets = await set_crud.search_sets(db, query, profile="list")
     else:
-        sets = set_crud.get_sets(db, limit=100)
+        sets = await set_crud.get_sets(db, limit=PAGE_SIZE, after=parse_cursor(cursor), profile="list")
+        next_page = next_cursor(sets, PAGE_SIZE)
     
-    # Return partial template for HTMX requests
-    if request.headers.get("HX-Request"):
-        return templates.TemplateResponse("sets/_table.html", {
-            "request": request,
-            "sets": sets
-        })
+    if partial:
+        html = templates.get_template(partial).render(sets=sets, next_cursor=next_page)
+        fragment_cache.set(partial, query, cursor, versions, html)
+        return HTMLResponse(html)
     
     return templates.TemplateResponse("sets/list.html", {
         "request": request,
         "sets": sets,
+        "next_cursor": next_page,
         "search": search or ""
     })
 
 
 @router.get("/sets/add", response_class=HTMLResponse)
-async def set_add(request: Request, db: Session = Depends(get_db)):
+async def set_add(request: Request, db: AsyncSession = Depends(get_db)):
     """Add set page."""
-    if redirect := require_login(request):
-        return redirect
-    
-    alliances = alliance_crud.get_alliances(db, limit=1000)
+    alliances = await alliance_crud.get_alliances(db, limit=1000)
     
     return templates.TemplateResponse("sets/add.html", {
         "request": request,
@@ -175,14 +191,12 @@ async def set_add(request: Request, db: Session = Depends(get_db)):
 
 
 @router.get("/sets/{set_id}", response_class=HTMLResponse)
-async def set_detail(request: Request, set_id: str, db: Session = Depends(get_db)):
+async def set_detail(request: Request, set_id: str, db: AsyncSession = Depends(get_db)):
     """Set detail page."""
-    if redirect := require_login(request):
-        return redirect
-    
-    set_obj = set_crud.get_set(db, set_id)
+    set_obj = await set_crud.get_set(db, set_id, profile="detail")
     if not set_obj:
         return RedirectResponse(url="/sets")
+    await set_crud.load_set_relations(db, [set_obj], profile="list")
     
     return templates.TemplateResponse("sets/detail.html", {
         "request": request,
@@ -191,15 +205,12 @@ async def set_detail(request: Request, set_id: str, db: Session = Depends(get_db
 
 
 @router.get("/alliances", response_class=HTMLResponse)
-async def alliances_list(request: Request, search: str = None, db: Session = Depends(get_db)):
+async def alliances_list(request: Request, search: str = None, db: AsyncSession = Depends(get_db)):
     """Alliances list page."""
-    if redirect := require_login(request):
-        return redirect
-    
     if search:
-        alliances = alliance_crud.search_alliances(db, search)
+        alliances = await alliance_crud.search_alliances(db, search, profile="list")
     else:
-        alliances = alliance_crud.get_alliances(db, limit=100)
+        alliances = await alliance_crud.get_alliances(db, limit=PAGE_SIZE, profile="list")
     
     return templates.TemplateResponse("alliances/list.html", {
         "request": request,
@@ -209,12 +220,9 @@ async def alliances_list(request: Request, search: str = None, db: Session = Dep
 
 
 @router.get("/alliances/{alliance_id}", response_class=HTMLResponse)
-async def alliance_detail(request: Request, alliance_id: str, db: Session = Depends(get_db)):
+async def alliance_detail(request: Request, alliance_id: str, db: AsyncSession = Depends(get_db)):
     """Alliance detail page."""
-    if redirect := require_login(request):
-        return redirect
-    
-    alliance = alliance_crud.get_alliance(db, alliance_id)
+    alliance = await alliance_crud.get_alliance(db, alliance_id, profile="detail")
     if not alliance:
         return RedirectResponse(url="/alliances")
     
@@ -225,15 +233,12 @@ async def alliance_detail(request: Request, alliance_id: str, db: Session = Depe
 
 
 @router.get("/incidents", response_class=HTMLResponse)
-async def incidents_list(request: Request, search: str = None, db: Session = Depends(get_db)):
+async def incidents_list(request: Request, search: str = None, db: AsyncSession = Depends(get_db)):
     """Incidents list page."""
-    if redirect := require_login(request):
-        return redirect
-    
     if search:
-        incidents = incident_crud.search_incidents(db, search)
+        incidents = await incident_crud.search_incidents(db, search, profile="list")
     else:
-        incidents = incident_crud.get_incidents(db, limit=100)
+        incidents = await incident_crud.get_incidents(db, limit=PAGE_SIZE, profile="list")
     
     return templates.TemplateResponse("incidents/list.html", {
         "request": request,
@@ -243,12 +248,9 @@ async def incidents_list(request: Request, search: str = None, db: Session = Dep
 
 
 @router.get("/incidents/{incident_id}", response_class=HTMLResponse)
-async def incident_detail(request: Request, incident_id: str, db: Session = Depends(get_db)):
+async def incident_detail(request: Request, incident_id: str, db: AsyncSession = Depends(get_db)):
     """Incident detail page."""
-    if redirect := require_login(request):
-        return redirect
-    
-    incident = incident_crud.get_incident(db, incident_id)
+    incident = await incident_crud.get_incident(db, incident_id, profile="detail")
     if not incident:
         return RedirectResponse(url="/incidents")
     
@@ -259,15 +261,12 @@ async def incident_detail(request: Request, incident_id: str, db: Session = Depe
 
 
 @router.get("/sources", response_class=HTMLResponse)
-async def sources_list(request: Request, search: str = None, db: Session = Depends(get_db)):
+async def sources_list(request: Request, search: str = None, db: AsyncSession = Depends(get_db)):
     """Sources list page."""
-    if redirect := require_login(request):
-        return redirect
-    
     if search:
-        sources = source_crud.search_sources(db, search)
+        sources = await source_crud.search_sources(db, search, profile="list")
     else:
-        sources = source_crud.get_sources(db, limit=100)
+        sources = await source_crud.get_sources(db, limit=PAGE_SIZE, profile="list")
     
     return templates.TemplateResponse("sources/list.html", {
         "request": request,
@@ -277,12 +276,9 @@ async def sources_list(request: Request, search: str = None, db: Session = Depen
 
 
 @router.get("/sources/{source_id}", response_class=HTMLResponse)
-async def source_detail(request: Request, source_id: str, db: Session = Depends(get_db)):
+async def source_detail(request: Request, source_id: str, db: AsyncSession = Depends(get_db)):
     """Source detail page."""
-    if redirect := require_login(request):
-        return redirect
-    
-    source = source_crud.get_source(db, source_id)
+    source = await source_crud.get_source(db, source_id, profile="detail")
     if not source:
         return RedirectResponse(url="/sources")
     
@@ -295,7 +291,4 @@ async def source_detail(request: Request, source_id: str, db: Session = Depends(
 @router.get("/graph", response_class=HTMLResponse)
 async def graph_page(request: Request):
     """Network graph visualization page."""
-    if redirect := require_login(request):
-        return redirect
-    
     return templates.TemplateResponse("graph.html", {"request": request})
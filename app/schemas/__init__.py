@@ -3,18 +3,23 @@ from app.schemas.fuzzy_date import FuzzyDateSchema
 from app.schemas.source import SourceCreate, SourceUpdate, SourceRead
 from app.schemas.alliance import AllianceCreate, AllianceUpdate, AllianceRead
 from app.schemas.set import SetCreate, SetUpdate, SetRead
-from app.schemas.member import MemberCreate, MemberUpdate, MemberRead
+from app.schemas.member import MemberCreate, MemberUpdate, MemberRead, MemberFacets
 from app.schemas.incident import (
     IncidentParticipantCreate, IncidentParticipantRead,
-    IncidentCreate, IncidentUpdate, IncidentRead
+    IncidentCreate, IncidentUpdate, IncidentRead, IncidentFacets,
+    IncidentRollupBucket
 )
+from app.schemas.bulk import BulkRowError, BulkImportResult
+from app.schemas.aggregate import AggregateRead
 
 __all__ = [
     "FuzzyDateSchema",
     "SourceCreate", "SourceUpdate", "SourceRead",
     "AllianceCreate", "AllianceUpdate", "AllianceRead",
     "SetCreate", "SetUpdate", "SetRead",
-    "MemberCreate", "MemberUpdate", "MemberRead",
+    "MemberCreate", "MemberUpdate", "MemberRead", "MemberFacets",
     "IncidentParticipantCreate", "IncidentParticipantRead",
-    "IncidentCreate", "IncidentUpdate", "IncidentRead",
+    "IncidentCreate", "IncidentUpdate", "IncidentRead", "IncidentFacets", "IncidentRollupBucket",
+    "BulkRowError", "BulkImportResult",
+    "AggregateRead",
 ]
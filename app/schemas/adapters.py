@@ -0,0 +1,21 @@
+"""Precompiled TypeAdapters for serializing lists of ORM objects through the Read schemas."""
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, Dict, List, Type
+from app.schemas.member import MemberRead
+from app.schemas.set import SetRead
+from app.schemas.alliance import AllianceRead
+from app.schemas.incident import IncidentRead
+from app.schemas.source import SourceRead
+
+
+# Built once at import, so a response pays for validation only, not schema compilation
+READ_LIST_ADAPTERS: Dict[Type[BaseModel], TypeAdapter] = {
+    schema: TypeAdapter(List[schema])
+    for schema in (MemberRead, SetRead, AllianceRead, IncidentRead, SourceRead)
+}
+
+
+def dump_list(schema: Type[BaseModel], objects) -> List[Dict[str, Any]]:
+    """Validate ORM objects against a Read schema in one call and dump them to plain dicts."""
+    adapter = READ_LIST_ADAPTERS[schema]
+    return adapter.dump_python(adapter.validate_python(list(objects), from_attributes=True))
@@ -0,0 +1,12 @@
+"""Scoreboard schemas."""
+from pydantic import BaseModel
+
+
+class AggregateRead(BaseModel):
+    """Totals for one set or alliance."""
+    id: str
+    name: str
+    members: int
+    incidents: int  # Incidents any member took part in
+    fatalities_attributed: int  # Victims killed in incidents a member perpetrated or assisted
+    victims_lost: int  # Members killed as victims
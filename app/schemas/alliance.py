@@ -1,7 +1,8 @@
 """Alliance schemas."""
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from typing import Optional, List
 from app.models.alliance import AllianceStatus
+from app.schemas.fuzzy_date import check_date_fields
 
 
 class AllianceBase(BaseModel):
@@ -16,6 +17,11 @@ class AllianceCreate(AllianceBase):
     founded_year: Optional[int] = None
     founded_month: Optional[int] = None
     founded_day: Optional[int] = None
+    
+    @model_validator(mode='after')
+    def validate_dates(self):
+        """Validate the founding date parts."""
+        return check_date_fields(self, "founded")
 
 
 class AllianceUpdate(BaseModel):
@@ -26,6 +32,11 @@ class AllianceUpdate(BaseModel):
     founded_year: Optional[int] = None
     founded_month: Optional[int] = None
     founded_day: Optional[int] = None
+    
+    @model_validator(mode='after')
+    def validate_dates(self):
+        """Validate the founding date parts."""
+        return check_date_fields(self, "founded", partial=True)
 
 
 class AllianceRead(AllianceBase):
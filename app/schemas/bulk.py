@@ -0,0 +1,16 @@
+"""Bulk import schemas."""
+from pydantic import BaseModel
+from typing import List
+
+
+class BulkRowError(BaseModel):
+    """A row that was rejected, by its 1-based line number in the upload."""
+    line: int
+    error: str
+
+
+class BulkImportResult(BaseModel):
+    """Outcome of a bulk import."""
+    created: int
+    failed: int
+    errors: List[BulkRowError] = []  # The first MAX_REPORTED_ERRORS failures
@@ -2,6 +2,7 @@
 from pydantic import BaseModel, field_validator
 from typing import Optional
 import calendar
+from app.models.base import FuzzyDate, validate_date_parts
 
 
 class FuzzyDateSchema(BaseModel):
@@ -37,20 +38,30 @@ class FuzzyDateSchema(BaseModel):
     
     def to_string(self) -> str:
         """Convert to human-readable string."""
-        if self.year is None:
-            return "Unknown"
-        if self.month is None:
-            return str(self.year)
-        
-        month_names = [
-            "January", "February", "March", "April", "May", "June",
-            "July", "August", "September", "October", "November", "December"
-        ]
-        month_str = month_names[self.month - 1]
-        
-        if self.day is None:
-            return f"{month_str} {self.year}"
-        return f"{month_str} {self.day}, {self.year}"
+        return str(FuzzyDate(self.year, self.month, self.day))
     
     class Config:
         from_attributes = True
+
+
+def check_date_fields(schema: BaseModel, *prefixes: str, partial: bool = False) -> BaseModel:
+    """
+    Validate each <prefix>_year/_month/_day group of a create or update schema.
+    
+    With partial=True (update schemas) a group is only checked in full when
+    all three parts are sent; otherwise the given month and day are range
+    checked and the CRUD update validates the merged row.
+    """
+    for prefix in prefixes:
+        names = [f"{prefix}_{part}" for part in ("year", "month", "day")]
+        year, month, day = (getattr(schema, name) for name in names)
+        try:
+            if not partial or schema.model_fields_set.issuperset(names):
+                validate_date_parts(year, month, day)
+            elif month is not None and not 1 <= month <= 12:
+                raise ValueError(f"Month must be between 1 and 12, got {month}")
+            elif day is not None and not 1 <= day <= 31:
+                raise ValueError(f"Day must be between 1 and 31, got {day}")
+        except ValueError as exc:
+            raise ValueError(f"{prefix}: {exc}") from None
+    return schema
@@ -1,7 +1,8 @@
 """Incident schemas."""
-from pydantic import BaseModel, field_validator
-from typing import Optional, List
+from pydantic import BaseModel, field_validator, model_validator
+from typing import Optional, List, Dict
 from app.models.incident import IncidentType, ParticipantRole, VictimOutcome
+from app.schemas.fuzzy_date import check_date_fields
 
 
 class IncidentParticipantBase(BaseModel):
@@ -50,6 +51,11 @@ class IncidentCreate(IncidentBase):
     date_month: Optional[int] = None
     date_day: Optional[int] = None
     participants: List[IncidentParticipantCreate] = []
+    
+    @model_validator(mode='after')
+    def validate_dates(self):
+        """Validate the date parts."""
+        return check_date_fields(self, "date")
 
 
 class IncidentUpdate(BaseModel):
@@ -60,6 +66,12 @@ class IncidentUpdate(BaseModel):
     date_year: Optional[int] = None
     date_month: Optional[int] = None
     date_day: Optional[int] = None
+    participants: Optional[List[IncidentParticipantCreate]] = None  # Replaces all participants when set
+    
+    @model_validator(mode='after')
+    def validate_dates(self):
+        """Validate the date parts."""
+        return check_date_fields(self, "date", partial=True)
 
 
 class IncidentRead(IncidentBase):
@@ -71,3 +83,18 @@ class IncidentRead(IncidentBase):
     
     class Config:
         from_attributes = True
+
+
+class IncidentFacets(BaseModel):
+    """A page of incidents with per-value counts for every filter dimension (?facets=true)."""
+    items: List[IncidentRead]
+    facets: Dict[str, Dict[str, int]]
+
+
+class IncidentRollupBucket(BaseModel):
+    """Incident count for one period, type and fatality; year and month are null when unknown."""
+    year: Optional[int] = None
+    month: Optional[int] = None  # Omitted for granularity=year
+    type: IncidentType
+    fatal: bool
+    count: int
@@ -2,6 +2,7 @@
 from pydantic import BaseModel, model_validator
 from typing import Optional, List, Dict
 from app.models.member import MemberStatus, AffiliationType
+from app.schemas.fuzzy_date import check_date_fields
 
 
 class MemberBase(BaseModel):
@@ -39,6 +40,11 @@ class MemberCreate(MemberBase):
     release_year: Optional[int] = None
     release_month: Optional[int] = None
     release_day: Optional[int] = None
+    
+    @model_validator(mode='after')
+    def validate_dates(self):
+        """Validate the dob, dod and release date parts."""
+        return check_date_fields(self, "dob", "dod", "release")
 
 
 class MemberUpdate(BaseModel):
@@ -63,6 +69,11 @@ class MemberUpdate(BaseModel):
     release_year: Optional[int] = None
     release_month: Optional[int] = None
     release_day: Optional[int] = None
+    
+    @model_validator(mode='after')
+    def validate_dates(self):
+        """Validate the dob, dod and release date parts."""
+        return check_date_fields(self, "dob", "dod", "release", partial=True)
 
 
 class MemberRead(MemberBase):
@@ -81,3 +92,9 @@ class MemberRead(MemberBase):
     
     class Config:
         from_attributes = True
+
+
+class MemberFacets(BaseModel):
+    """A page of members with per-value counts for every filter dimension (?facets=true)."""
+    items: List[MemberRead]
+    facets: Dict[str, Dict[str, int]]
@@ -1,7 +1,8 @@
 """Set schemas."""
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from typing import Optional, List
 from app.models.set import SetStatus
+from app.schemas.fuzzy_date import check_date_fields
 
 
 class SetBase(BaseModel):
@@ -20,6 +21,11 @@ class SetCreate(SetBase):
     founded_year: Optional[int] = None
     founded_month: Optional[int] = None
     founded_day: Optional[int] = None
+    
+    @model_validator(mode='after')
+    def validate_dates(self):
+        """Validate the founding date parts."""
+        return check_date_fields(self, "founded")
 
 
 class SetUpdate(BaseModel):
@@ -34,6 +40,11 @@ class SetUpdate(BaseModel):
     founded_year: Optional[int] = None
     founded_month: Optional[int] = None
     founded_day: Optional[int] = None
+    
+    @model_validator(mode='after')
+    def validate_dates(self):
+        """Validate the founding date parts."""
+        return check_date_fields(self, "founded", partial=True)
 
 
 class SetRead(SetBase):
@@ -1,8 +1,8 @@
 """Source schemas."""
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from typing import Optional
 from app.models.source import SourceType
-from app.schemas.fuzzy_date import FuzzyDateSchema
+from app.schemas.fuzzy_date import FuzzyDateSchema, check_date_fields
 
 
 class SourceBase(BaseModel):
@@ -18,6 +18,11 @@ class SourceCreate(SourceBase):
     date_year: Optional[int] = None
     date_month: Optional[int] = None
     date_day: Optional[int] = None
+    
+    @model_validator(mode='after')
+    def validate_dates(self):
+        """Validate the date parts."""
+        return check_date_fields(self, "date")
 
 
 class SourceUpdate(SourceBase):
@@ -26,6 +31,11 @@ class SourceUpdate(SourceBase):
     date_year: Optional[int] = None
     date_month: Optional[int] = None
     date_day: Optional[int] = None
+    
+    @model_validator(mode='after')
+    def validate_dates(self):
+        """Validate the date parts."""
+        return check_date_fields(self, "date", partial=True)
 
 
 class SourceRead(SourceBase):
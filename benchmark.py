@@ -0,0 +1,362 @@
+"""
+Performance benchmarks.
+
+Each subcommand builds its own throwaway dataset and prints a comparison
+table; nothing touches the configured database.
+
+Usage:
+    python benchmark.py sqlite [--scale 0.5] [--seconds 5] [--threads 8]
+    python benchmark.py serialize [--rows 1000] [--rounds 20]
+    python benchmark.py fuzzydate [--rows 10000] [--rounds 20]
+    python benchmark.py typeahead [--scale 1.0] [--queries 2000]
+"""
+import argparse
+import asyncio
+import calendar
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import threading
+import statistics
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+# Keep the app's own engine off the real database while benchmarks import it
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmpdir.name, 'app.db')}")
+
+from sqlalchemy.orm import sessionmaker
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.database import Base, create_db_engine, sqlite_pragmas
+from app.crud import member as member_crud, incident as incident_crud, set as set_crud, projections
+from app.crud.fulltext import create_search_index
+from app.crud.typeahead import TypeaheadIndex
+from jinja2 import Environment
+from app.models import IncidentType, ParticipantRole, Member, Set, Incident, FuzzyDate
+from app.schemas.member import MemberUpdate
+from app.schemas.incident import IncidentCreate, IncidentParticipantCreate
+from check_query_plans import populate
+
+
+def _run_threads(worker: Callable[[random.Random], None], threads: int, seconds: float) -> float:
+    """Run worker in a loop on several threads; return completed operations per second."""
+    deadline = time.perf_counter() + seconds
+    counts = [0] * threads
+    errors = []
+    
+    def loop(index: int):
+        rng = random.Random(index)
+        try:
+            while time.perf_counter() < deadline:
+                worker(rng)
+                counts[index] += 1
+        except Exception as exc:  # surface the first failure instead of a silent low score
+            errors.append(exc)
+    
+    pool = [threading.Thread(target=loop, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return sum(counts) / (time.perf_counter() - started)
+
+
+def bench_sqlite(args) -> None:
+    """Throughput of the old engine defaults against the SQLite performance profile."""
+    profiles = {
+        # What app/database.py used to do: echo on, no PRAGMAs, one pool
+        "defaults": {"echo": True, "pragmas": {}, "read_only_gets": False},
+        "profile": {"echo": False, "pragmas": sqlite_pragmas(), "read_only_gets": True},
+    }
+    results: Dict[str, Dict[str, float]] = {}
+    
+    for name, profile in profiles.items():
+        url = f"sqlite:///{os.path.join(_tmpdir.name, f'bench-{name}.db')}"
+        log = open(os.path.join(_tmpdir.name, f"echo-{name}.log"), "w")
+        # echo=True binds its log handler to sys.stdout at engine creation
+        with contextlib.redirect_stdout(log):
+            write_engine = create_db_engine(url, echo=profile["echo"], pragmas=profile["pragmas"])
+            read_engine = (create_db_engine(url, echo=profile["echo"], pragmas=profile["pragmas"], read_only=True)
+                           if profile["read_only_gets"] else write_engine)
+        Write = sessionmaker(bind=write_engine, autoflush=False)
+        Read = sessionmaker(bind=read_engine, autoflush=False)
+        
+        Base.metadata.create_all(bind=write_engine)
+        create_search_index(write_engine)
+        with Write() as db:
+            ids = populate(db, args.scale)
+        members = ids["members"]
+        
+        def read(rng: random.Random):
+            with Read() as db:
+                member_crud.get_member(db, rng.choice(members), profile="detail")
+                set_crud.get_sets(db, limit=50, profile="list")
+                member_crud.get_member_stats(db, rng.choice(members))
+        
+        def write(rng: random.Random):
+            with Write() as db:
+                if rng.random() < 0.5:
+                    member_crud.update_member(db, rng.choice(members), MemberUpdate(bio=f"Note {rng.random()}"))
+                else:
+                    incident_crud.create_incident(db, IncidentCreate(type=IncidentType.SHOOTING, participants=[
+                        IncidentParticipantCreate(member_id=rng.choice(members), role=ParticipantRole.PERPETRATOR),
+                        IncidentParticipantCreate(member_id=rng.choice(members), role=ParticipantRole.VICTIM),
+                    ]))
+        
+        def mixed(rng: random.Random):
+            (write if rng.random() < 0.1 else read)(rng)
+        
+        results[name] = {}
+        for workload, worker in (("read", read), ("write", write), ("90/10 mixed", mixed)):
+            with contextlib.redirect_stdout(log):
+                results[name][workload] = _run_threads(worker, args.threads, args.seconds)
+        write_engine.dispose()
+        read_engine.dispose()
+        log.close()
+    
+    print(f"\nSQLite throughput, {args.threads} threads, {args.seconds:g}s per workload (ops/s)")
+    print(f"{'workload':<14}{'defaults':>12}{'profile':>12}{'speedup':>10}")
+    for workload in results["defaults"]:
+        before, after = results["defaults"][workload], results["profile"][workload]
+        print(f"{workload:<14}{before:>12.1f}{after:>12.1f}{after / before:>9.2f}x")
+
+
+def _median_ms(func: Callable[[], object], rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def bench_serialize(args) -> None:
+    """Fetch and serialization time of one API list page: ORM + response_model against projections + orjson."""
+    engine = create_db_engine(f"sqlite:///{os.path.join(_tmpdir.name, 'bench-serialize.db')}", pragmas=sqlite_pragmas())
+    Session = sessionmaker(bind=engine, autoflush=False)
+    Base.metadata.create_all(bind=engine)
+    with Session() as db:
+        # Scale so the smallest of the benchmarked tables (sets) has a full page
+        populate(db, max(0.5, args.rows / 2000))
+    
+    loop = asyncio.new_event_loop()
+    pages = {
+        "members": (Member, member_crud.get_members),
+        "sets": (Set, set_crud.get_sets),
+        "incidents": (Incident, incident_crud.get_incidents),
+    }
+    print(f"\nOne {args.rows}-row page, median of {args.rounds} rounds (ms)")
+    print(f"{'entity':<11}{'':<11}{'fetch':>9}{'serialize':>11}{'total':>9}")
+    for entity, (model, get_page) in pages.items():
+        field = create_response_field(name=f"Response_{entity}", type_=List[projections.READ_SCHEMAS[model]])
+        with Session() as db:
+            objects = get_page(db, limit=args.rows, profile="api")
+            rows = projections.get_rows(db, model, limit=args.rows)
+            
+            # What the routes did before: ORM objects through FastAPI's response_model pass
+            def orm_fetch():
+                db.expunge_all()
+                get_page(db, limit=args.rows, profile="api")
+            
+            def orm_serialize():
+                content = loop.run_until_complete(serialize_response(field=field, response_content=objects))
+                JSONResponse(content).body
+            
+            timings = {
+                "orm": (_median_ms(orm_fetch, args.rounds), _median_ms(orm_serialize, args.rounds)),
+                "projection": (
+                    _median_ms(lambda: projections.get_rows(db, model, limit=args.rows), args.rounds),
+                    _median_ms(lambda: ORJSONResponse(rows).body, args.rounds),
+                ),
+            }
+        for name, (fetch, serialize) in timings.items():
+            print(f"{entity:<11}{name:<11}{fetch:>9.2f}{serialize:>11.2f}{fetch + serialize:>9.2f}")
+        before, after = (sum(timings[name]) for name in ("orm", "projection"))
+        print(f"{'':<11}{'speedup':<11}{'':>20}{before / after:>8.2f}x")
+    loop.close()
+    engine.dispose()
+
+
+class _DictFuzzyDate:
+    """What FuzzyDate used to be: a __dict__ object, validated and formatted from scratch every time."""
+    
+    def __init__(self, year: Optional[int] = None, month: Optional[int] = None, day: Optional[int] = None):
+        if day is not None:
+            max_day = calendar.monthrange(year or 2000, month)[1]
+            if not (1 <= day <= max_day):
+                raise ValueError(day)
+        self.year = year
+        self.month = month
+        self.day = day
+    
+    def __str__(self) -> str:
+        if self.year is None:
+            return "Unknown"
+        if self.month is None:
+            return str(self.year)
+        month_names = [
+            "January", "February", "March", "April", "May", "June",
+            "July", "August", "September", "October", "November", "December"
+        ]
+        if self.day is None:
+            return f"{month_names[self.month - 1]} {self.year}"
+        return f"{month_names[self.month - 1]} {self.day}, {self.year}"
+
+
+# The incident table's date cell before and after FuzzyDate was mapped with composite()
+_HAND_FORMATTED_CELL = (
+    "{% for row in rows %}<tr><td>{% if row.date_year %}"
+    "{% if row.date_day %}{{ '%02d'|format(row.date_day) }}/{% endif %}"
+    "{% if row.date_month %}{{ '%02d'|format(row.date_month) }}/{% endif %}{{ row.date_year }}"
+    "{% else %}Unknown{% endif %}</td></tr>{% endfor %}"
+)
+_COMPOSITE_CELL = (
+    "{% for row in rows %}<tr><td>{% if row.date %}{{ row.date.numeric }}"
+    "{% else %}Unknown{% endif %}</td></tr>{% endfor %}"
+)
+
+
+def _allocated_kb(func: Callable[[], object]) -> float:
+    """Memory still held by func's result, in KiB."""
+    tracemalloc.start()
+    result = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size / 1024
+
+
+def bench_fuzzydate(args) -> None:
+    """Allocation and formatting cost of the dates in a 10k-row table: old __dict__ FuzzyDate against the slotted, interned one."""
+    rng = random.Random(0)
+    parts = []
+    for _ in range(args.rows):
+        year, month = rng.randint(1990, 2025), rng.choice([None, *range(1, 13)])
+        parts.append((year, month, rng.randint(1, 28) if month and rng.random() < 0.6 else None))
+    
+    env = Environment(autoescape=True)
+    hand, mapped = env.from_string(_HAND_FORMATTED_CELL), env.from_string(_COMPOSITE_CELL)
+    old_rows = [SimpleNamespace(date_year=y, date_month=m, date_day=d) for y, m, d in parts]
+    new_rows = [SimpleNamespace(date=FuzzyDate(y, m, d)) for y, m, d in parts]
+    old_dates = [_DictFuzzyDate(*p) for p in parts]
+    new_dates = [FuzzyDate(*p) for p in parts]
+    
+    results = {
+        "build (ms)": (
+            _median_ms(lambda: [_DictFuzzyDate(*p) for p in parts], args.rounds),
+            _median_ms(lambda: [FuzzyDate(*p) for p in parts], args.rounds),
+        ),
+        "held (KiB)": (
+            _allocated_kb(lambda: [_DictFuzzyDate(*p) for p in parts]),
+            _allocated_kb(lambda: [FuzzyDate(*p) for p in parts]),
+        ),
+        "str() (ms)": (
+            _median_ms(lambda: [str(date) for date in old_dates], args.rounds),
+            _median_ms(lambda: [str(date) for date in new_dates], args.rounds),
+        ),
+        "render (ms)": (
+            _median_ms(lambda: hand.render(rows=old_rows), args.rounds),
+            _median_ms(lambda: mapped.render(rows=new_rows), args.rounds),
+        ),
+    }
+    print(f"\n{args.rows} dates, {len(set(parts))} distinct, median of {args.rounds} rounds")
+    print(f"{'':<13}{'before':>10}{'after':>10}{'ratio':>9}")
+    for name, (before, after) in results.items():
+        print(f"{name:<13}{before:>10.2f}{after:>10.2f}{before / after:>8.1f}x")
+
+
+def _typeahead_queries(labels: List[str], count: int, rng: random.Random) -> Dict[str, List[str]]:
+    """Keystroke-like queries cut from real labels: short prefixes, longer prefixes, inner substrings."""
+    queries = {"1-3 chars": [], "4-8 chars": [], "substring": []}
+    for _ in range(count):
+        label = rng.choice(labels)
+        queries["1-3 chars"].append(label[:rng.randint(1, 3)])
+        queries["4-8 chars"].append(label[:rng.randint(4, 8)])
+        start = rng.randint(1, max(1, len(label) - 4))
+        queries["substring"].append(label[start:start + 4])
+    return queries
+
+
+def _percentiles_ms(timings: List[float]) -> List[float]:
+    cuts = statistics.quantiles(timings, n=100)
+    return [cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000]
+
+
+def bench_typeahead(args) -> None:
+    """Latency of /api/search lookups against the p99 < 10 ms target, with and without the per-search version check."""
+    engine = create_db_engine(f"sqlite:///{os.path.join(_tmpdir.name, 'bench-typeahead.db')}", pragmas=sqlite_pragmas())
+    Session = sessionmaker(bind=engine, autoflush=False)
+    Base.metadata.create_all(bind=engine)
+    with Session() as db:
+        populate(db, args.scale)
+    
+    index = TypeaheadIndex()
+    with Session() as db:
+        started = time.perf_counter()
+        index.ensure_built(db)
+        build_ms = (time.perf_counter() - started) * 1000
+    labels = [item[0].label for item in index._entries if item]
+    queries = _typeahead_queries(labels, args.queries, random.Random(0))
+    
+    print(f"\nIndex of {len(labels)} entries built in {build_ms:.0f} ms; {args.queries} queries per kind (ms)")
+    print(f"{'queries':<12}{'':<16}{'p50':>8}{'p95':>8}{'p99':>8}")
+    with Session() as db:
+        for kind, batch in queries.items():
+            for name, run in (("index", lambda q: index.search(q)),
+                              ("+ version check", lambda q: (index.ensure_built(db), index.search(q)))):
+                timings = []
+                for query in batch:
+                    started = time.perf_counter()
+                    run(query)
+                    timings.append(time.perf_counter() - started)
+                p50, p95, p99 = _percentiles_ms(timings)
+                flag = "" if p99 < 10 else "  over 10 ms"
+                print(f"{kind:<12}{name:<16}{p50:>8.2f}{p95:>8.2f}{p99:>8.2f}{flag}")
+    engine.dispose()
+
+
+BENCHMARKS = {
+    "sqlite": bench_sqlite,
+    "serialize": bench_serialize,
+    "fuzzydate": bench_fuzzydate,
+    "typeahead": bench_typeahead,
+}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="SquiidWiki performance benchmarks")
+    subcommands = parser.add_subparsers(dest="benchmark", required=True)
+    
+    sqlite = subcommands.add_parser("sqlite", help=bench_sqlite.__doc__)
+    sqlite.add_argument("--scale", type=float, default=0.5, help="Dataset size multiplier")
+    sqlite.add_argument("--seconds", type=float, default=5, help="Duration of each workload")
+    sqlite.add_argument("--threads", type=int, default=8, help="Concurrent workers")
+    
+    serialize = subcommands.add_parser("serialize", help=bench_serialize.__doc__)
+    serialize.add_argument("--rows", type=int, default=1000, help="Rows per page")
+    serialize.add_argument("--rounds", type=int, default=20, help="Timed repetitions of each step")
+    
+    fuzzydate = subcommands.add_parser("fuzzydate", help=bench_fuzzydate.__doc__)
+    fuzzydate.add_argument("--rows", type=int, default=10000, help="Table rows (one date each)")
+    fuzzydate.add_argument("--rounds", type=int, default=20, help="Timed repetitions of each step")
+    
+    typeahead = subcommands.add_parser("typeahead", help=bench_typeahead.__doc__)
+    typeahead.add_argument("--scale", type=float, default=1.0, help="Dataset size multiplier")
+    typeahead.add_argument("--queries", type=int, default=2000, help="Timed queries of each kind")
+    
+    args = parser.parse_args(argv)
+    BENCHMARKS[args.benchmark](args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
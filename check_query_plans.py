@@ -0,0 +1,330 @@
+"""
+Query-plan regression check for the CRUD layer.
+
+Builds a scaled dataset in a throwaway SQLite database, runs every CRUD
+operation against it while recording the SQL it issues, and runs
+EXPLAIN QUERY PLAN on each statement. Exits non-zero if any statement
+scans a whole table other than the few that are small by design.
+Operations that read every row on purpose (graph and typeahead index
+builds, the graph export, the scoreboards, the rollup rebuild) are not
+planned at all.
+
+Usage:
+    python check_query_plans.py [--scale 2.0] [--verbose]
+
+tests/test_query_plans.py runs the same check under pytest.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import uuid
+from typing import Callable, List, NamedTuple
+
+# Point the app at a scratch database before anything imports app.database
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir.name, 'plans.db')}"
+
+from sqlalchemy import event, insert, text
+from app.database import engine, SessionLocal, Base
+from app.models.base import FuzzyDate
+from app.models import (
+    Member, Set, Alliance, Incident, IncidentParticipant, Source,
+    MemberStatus, AffiliationType, SetStatus, AllianceStatus, IncidentType,
+    ParticipantRole, VictimOutcome, SourceType,
+)
+from app.models.associations import (
+    set_allies, set_enemies, member_sources, set_sources, alliance_sources, incident_sources
+)
+from app.schemas.member import MemberCreate, MemberUpdate
+from app.schemas.set import SetCreate, SetUpdate
+from app.schemas.alliance import AllianceCreate, AllianceUpdate
+from app.schemas.incident import IncidentCreate, IncidentUpdate, IncidentParticipantCreate
+from app.schemas.source import SourceCreate, SourceUpdate
+from app.crud import (
+    member as member_crud, set as set_crud, alliance as alliance_crud,
+    incident as incident_crud, source as source_crud, summary as summary_crud,
+    graph as graph_crud, fulltext as fulltext_crud, version as version_crud,
+    projections, facets as facets_crud, rollup as rollup_crud,
+)
+from app.crud.fulltext import create_search_index
+
+# Rows per table at --scale 1
+BASE_ROWS = {
+    "alliances": 200,
+    "sets": 2000,
+    "members": 20000,
+    "incidents": 10000,
+    "sources": 2000,
+}
+
+# "SCAN <table>" with no index means a full table scan
+FULL_SCAN = re.compile(r"^SCAN (\S+)$")
+MATERIALIZED = re.compile(r"^(?:MATERIALIZE|CO-ROUTINE) (\S+)$")
+
+PLANNED_PREFIXES = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+# One row per bucket, table or counter, so a scan is the cheapest read
+SMALL_TABLES = frozenset(("incident_rollups", "table_versions", "summary_counters"))
+
+
+class Check(NamedTuple):
+    """One CRUD operation to plan."""
+    name: str
+    run: Callable
+
+
+def _ids(count: int) -> List[str]:
+    return [str(uuid.uuid4()) for _ in range(count)]
+
+
+def populate(db, scale: float) -> dict:
+    """Bulk-insert a random dataset and return the generated IDs."""
+    rng = random.Random(1)
+    rows = {table: max(10, int(count * scale)) for table, count in BASE_ROWS.items()}
+    ids = {table: _ids(count) for table, count in rows.items()}
+    
+    db.execute(insert(Source), [
+        {"id": i, "type": SourceType.NEWS_ARTICLE, "title": f"Report {n}", "url": f"https://example.com/{n}"}
+        for n, i in enumerate(ids["sources"])
+    ])
+    db.execute(insert(Alliance), [
+        {"id": i, "name": f"Alliance {n}", "status": AllianceStatus.ACTIVE}
+        for n, i in enumerate(ids["alliances"])
+    ])
+    db.execute(insert(Set), [
+        {"id": i, "primary_name": f"Set {n}", "names": [f"S{n}"], "status": rng.choice(list(SetStatus)),
+         "territory": f"Block {n % 97}", "alliance_id": rng.choice(ids["alliances"] + [None])}
+        for n, i in enumerate(ids["sets"])
+    ])
+    db.execute(insert(Member), [
+        {"id": i, "nicknames": [f"Member {n}"], "first_name": f"First{n}", "status": rng.choice(list(MemberStatus)),
+         "affiliation_type": AffiliationType.SET, "set_id": rng.choice(ids["sets"]),
+         "alliance_id": rng.choice(ids["alliances"]) if n % 10 == 0 else None}
+        for n, i in enumerate(ids["members"])
+    ])
+    db.execute(insert(Incident), [
+        {"id": i, "type": rng.choice(list(IncidentType)), "location": f"Street {n % 500}",
+         "date_year": rng.randint(1990, 2025), "date_month": rng.randint(1, 12)}
+        for n, i in enumerate(ids["incidents"])
+    ])
+    db.execute(insert(IncidentParticipant), [
+        {"id": str(uuid.uuid4()), "incident_id": incident_id, "member_id": rng.choice(ids["members"]),
+         "role": role, "outcome": VictimOutcome.KILLED if role == ParticipantRole.VICTIM else None}
+        for incident_id in ids["incidents"]
+        for role in (ParticipantRole.PERPETRATOR, ParticipantRole.ACCOMPLICE, ParticipantRole.VICTIM)
+    ])
+    
+    for table in (set_allies, set_enemies):
+        pairs = set()
+        while len(pairs) < rows["sets"]:
+            a, b = sorted(rng.sample(ids["sets"], 2))
+            pairs.add((a, b))
+        if table is set_enemies:
+            pairs -= set(db.execute(set_allies.select().with_only_columns(
+                set_allies.c.set_a_id, set_allies.c.set_b_id)).all())
+        db.execute(insert(table), [{"set_a_id": a, "set_b_id": b} for a, b in pairs])
+    
+    for table, key, owners in ((member_sources, "member_id", "members"), (set_sources, "set_id", "sets"),
+                               (alliance_sources, "alliance_id", "alliances"),
+                               (incident_sources, "incident_id", "incidents")):
+        db.execute(insert(table), [
+            {key: owner, "source_id": rng.choice(ids["sources"])} for owner in ids[owners]
+        ])
+    
+    db.commit()
+    member_crud.rebuild_member_stats(db)
+    db.execute(text("ANALYZE"))
+    db.commit()
+    return ids
+
+
+def build_checks(ids: dict) -> List[Check]:
+    """Every CRUD entry point, called with IDs from the generated dataset."""
+    member_id, other_member_id = ids["members"][:2]
+    set_id = ids["sets"][0]
+    alliance_id = ids["alliances"][0]
+    incident_id = ids["incidents"][0]
+    source_id = ids["sources"][0]
+    cursor = sorted(ids["members"])[len(ids["members"]) // 2]
+    new = {}
+    
+    def participants(member_ids):
+        return [IncidentParticipantCreate(member_id=member_ids[0], role=ParticipantRole.PERPETRATOR),
+                IncidentParticipantCreate(member_id=member_ids[1], role=ParticipantRole.VICTIM,
+                                          outcome=VictimOutcome.KILLED)]
+    
+    def unrelated_sets():
+        a, b = ids["sets"][-2:]
+        for table in (set_allies, set_enemies):
+            db_ = SessionLocal()
+            db_.execute(table.delete().where(table.c.set_a_id == min(a, b), table.c.set_b_id == max(a, b)))
+            db_.commit()
+            db_.close()
+        return a, b
+    
+    checks = []
+    for name, crud, model_id, plural in (
+        ("member", member_crud, member_id, "members"), ("set", set_crud, set_id, "sets"),
+        ("alliance", alliance_crud, alliance_id, "alliances"), ("incident", incident_crud, incident_id, "incidents"),
+        ("source", source_crud, source_id, "sources"),
+    ):
+        get_one, get_many = getattr(crud, f"get_{name}"), getattr(crud, f"get_{plural}")
+        search = getattr(crud, f"search_{plural}")
+        for profile in (None, "list", "detail", "api"):
+            checks.append(Check(f"get_{name} profile={profile}",
+                                lambda db, f=get_one, i=model_id, p=profile: f(db, i, profile=p)))
+        for profile in ("list", "api"):
+            checks.append(Check(f"get_{plural} profile={profile}",
+                                lambda db, f=get_many, p=profile: f(db, limit=100, profile=p)))
+            checks.append(Check(f"get_{plural} after cursor profile={profile}",
+                                lambda db, f=get_many, p=profile: f(db, limit=100, after=cursor, profile=p)))
+            checks.append(Check(f"search_{plural} profile={profile}",
+                                lambda db, f=search, p=profile: f(db, "street", profile=p)))
+    
+    for model, fields in projections.DATE_FIELDS.items():
+        checks.append(Check(f"projections.get_rows {model.__tablename__}",
+                            lambda db, m=model: projections.get_rows(db, m, limit=100, after=cursor)))
+        for field in fields:
+            checks.append(Check(f"projections.get_rows_in_range {model.__tablename__}.{field}",
+                                lambda db, m=model, f=field: projections.get_rows_in_range(
+                                    db, m, f, FuzzyDate(2019, 3, 15), FuzzyDate(2021, 6), limit=100,
+                                    after=(20210600, cursor))))
+    
+    checks += [
+        Check("create_source", lambda db: new.update(source=source_crud.create_source(
+            db, SourceCreate(type=SourceType.OTHER, title="New source")).id)),
+        Check("update_source", lambda db: source_crud.update_source(db, new["source"], SourceUpdate(title="Renamed"))),
+        Check("delete_source", lambda db: source_crud.delete_source(db, new["source"])),
+        Check("create_alliance", lambda db: new.update(alliance=alliance_crud.create_alliance(
+            db, AllianceCreate(name="New alliance")).id)),
+        Check("update_alliance", lambda db: alliance_crud.update_alliance(
+            db, new["alliance"], AllianceUpdate(bio="Updated"))),
+        Check("create_set", lambda db: new.update(set=set_crud.create_set(
+            db, SetCreate(primary_name="New set", alliance_id=new["alliance"])).id)),
+        Check("update_set", lambda db: set_crud.update_set(db, new["set"], SetUpdate(territory="Elsewhere"))),
+        Check("create_member", lambda db: new.update(member=member_crud.create_member(
+            db, MemberCreate(nicknames=["Newcomer"], set_id=new["set"])).id)),
+        Check("update_member", lambda db: member_crud.update_member(
+            db, new["member"], MemberUpdate(bio="Updated"))),
+        Check("create_incident", lambda db: new.update(incident=incident_crud.create_incident(
+            db, IncidentCreate(type=IncidentType.SHOOTING, participants=participants([member_id, other_member_id]))).id)),
+        Check("update_incident", lambda db: incident_crud.update_incident(
+            db, new["incident"], IncidentUpdate(participants=participants([other_member_id, member_id])))),
+        Check("delete_incident", lambda db: incident_crud.delete_incident(db, new["incident"])),
+        Check("delete_member", lambda db: member_crud.delete_member(db, new["member"])),
+        Check("delete_set", lambda db: set_crud.delete_set(db, new["set"])),
+        Check("delete_alliance", lambda db: alliance_crud.delete_alliance(db, new["alliance"])),
+        Check("add/remove ally", lambda db: (set_crud.add_ally(db, *unrelated_sets()),
+                                             set_crud.remove_ally(db, *ids["sets"][-2:]))),
+        Check("add/remove enemy", lambda db: (set_crud.add_enemy(db, *unrelated_sets()),
+                                              set_crud.remove_enemy(db, *ids["sets"][-2:]))),
+        Check("load_set_relations", lambda db: set_crud.load_set_relations(
+            db, set_crud.get_sets(db, limit=50), profile="list")),
+        Check("get_member_stats", lambda db: member_crud.get_member_stats(db, member_id)),
+        Check("get_member_stats_bulk", lambda db: member_crud.get_member_stats_bulk(db, ids["members"][:500])),
+        Check("get_incident_facets type=SHOOTING", lambda db: facets_crud.get_incident_facets(
+            db, facets_crud.incident_filters(types=["SHOOTING"]))),
+        Check("get_incident_facets role=VICTIM", lambda db: facets_crud.get_incident_facets(
+            db, facets_crud.incident_filters(roles=["VICTIM"], outcomes=["KILLED"]))),
+        Check("get_member_facets set_id", lambda db: facets_crud.get_member_facets(
+            db, facets_crud.member_filters(set_ids=[set_id]))),
+        Check("get_incident_rollup month", lambda db: rollup_crud.get_incident_rollup(db, "month")),
+        Check("get_incident_rollup year", lambda db: rollup_crud.get_incident_rollup(db, "year")),
+        Check("get_summary_counts", lambda db: summary_crud.get_summary_counts(db)),
+        Check("fulltext_search", lambda db: fulltext_crud.fulltext_search(db, "members", "member", snippets=True)),
+        Check("get_graph_etag", lambda db: graph_crud.get_graph_etag(db)),
+        Check("get_stamps (conditional GET)", lambda db: version_crud.get_stamps(db, "members", "member_stats")),
+        Check("rebuild_member_stats", lambda db: member_crud.rebuild_member_stats(db)),
+        Check("rebuild_summary_counts", lambda db: summary_crud.rebuild_summary_counts(db)),
+    ]
+    return checks
+
+
+def explain(raw_connection, statement: str, parameters) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines for one recorded statement."""
+    cursor = raw_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[3] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    """Tables the plan reads in full, ignoring scans of materialized subqueries."""
+    materialized = {m.group(1) for line in plan if (m := MATERIALIZED.match(line))}
+    return [m.group(1) for line in plan if (m := FULL_SCAN.match(line)) and m.group(1) not in materialized]
+
+
+def run_checks(scale: float = 1.0, verbose: bool = False) -> int:
+    """Populate the scratch database, plan every check and return the number of offending statements."""
+    Base.metadata.create_all(bind=engine)
+    create_search_index(engine)
+    
+    db = SessionLocal()
+    print(f"Populating dataset (scale {scale})...")
+    ids = populate(db, scale)
+    db.close()
+    
+    recorded = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(PLANNED_PREFIXES):
+            recorded.append((statement, parameters))
+    
+    event.listen(engine, "before_cursor_execute", record)
+    raw_connection = engine.raw_connection()
+    failures = 0
+    
+    for check in build_checks(ids):
+        recorded.clear()
+        db = SessionLocal()
+        try:
+            check.run(db)
+        finally:
+            db.close()
+        
+        statements = list(recorded)
+        bad = []
+        for statement, parameters in statements:
+            plan = explain(raw_connection, statement, parameters)
+            scans = [table for table in full_scans(plan) if table not in SMALL_TABLES]
+            if scans:
+                bad.append((statement, plan, scans))
+            if verbose:
+                print(f"  {' '.join(statement.split())[:160]}")
+                for line in plan:
+                    print(f"      {line}")
+        
+        status = "FAIL" if bad else "ok"
+        print(f"[{status}] {check.name} ({len(statements)} statements)")
+        for statement, plan, scans in bad:
+            failures += 1
+            print(f"    full scan of {', '.join(scans)}:")
+            print(f"      {' '.join(statement.split())}")
+            for line in plan:
+                print(f"        {line}")
+    
+    event.remove(engine, "before_cursor_execute", record)
+    raw_connection.close()
+    
+    if failures:
+        print(f"\n{failures} statement(s) fell back to a full table scan.")
+    else:
+        print("\nNo unexpected full table scans.")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="Dataset size multiplier")
+    parser.add_argument("--verbose", action="store_true", help="Print every statement and its plan")
+    args = parser.parse_args()
+    return 1 if run_checks(args.scale, args.verbose) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Recompute derived tables from the source data in the configured database.
+
+The CRUD layer keeps these up to date as rows are written; run this after
+loading data behind its back (SQL scripts, restored backups) or to backfill
+a table added by a migration.
+
+Usage:
+    python rebuild.py [rollups] [member-stats] [summary] [search]
+
+With no arguments every derived table is rebuilt.
+"""
+import argparse
+import sys
+from typing import Callable, Dict, List
+from app.database import SessionLocal, engine
+from app.crud.member import rebuild_member_stats
+from app.crud.rollup import rebuild_incident_rollups
+from app.crud.summary import rebuild_summary_counts
+from app.crud.fulltext import create_search_index, rebuild_search_index
+
+
+def _with_session(rebuild: Callable) -> Callable[[], object]:
+    def run():
+        with SessionLocal() as db:
+            return rebuild(db)
+    return run
+
+
+def _rebuild_search() -> None:
+    if create_search_index(engine):
+        rebuild_search_index(engine)
+
+
+REBUILDS: Dict[str, Callable[[], object]] = {
+    "rollups": _with_session(rebuild_incident_rollups),
+    "member-stats": _with_session(rebuild_member_stats),
+    "summary": _with_session(rebuild_summary_counts),
+    "search": _rebuild_search,
+}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("tables", nargs="*", metavar="table",
+                        help=f"Any of {', '.join(REBUILDS)} (default: all)")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.tables if name not in REBUILDS]
+    if unknown:
+        parser.error(f"unknown table: {', '.join(unknown)}")
+    
+    for name in args.tables or REBUILDS:
+        result = REBUILDS[name]()
+        print(f"{name}: {result}" if result is not None else f"{name}: done")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
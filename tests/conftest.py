@@ -0,0 +1,6 @@
+"""Point the app at a scratch database before any test imports app.database."""
+import os
+import tempfile
+
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir.name, 'tests.db')}"
@@ -0,0 +1,65 @@
+"""Concurrent cold builds of the in-memory indexes through the async CRUD wrappers."""
+import asyncio
+import threading
+import uuid
+import pytest
+from sqlalchemy import insert
+from app.database import Base, engine, SessionLocal, AsyncSessionLocal
+from app.models import Member, Set, SetStatus, AffiliationType
+from app.crud import graph, typeahead
+from app.crud.aio import graph as graph_crud, typeahead as typeahead_crud
+
+CONCURRENCY = 4
+TIMEOUT_SECONDS = 30
+
+
+@pytest.fixture
+def set_ids():
+    Base.metadata.create_all(bind=engine)
+    ids = [str(uuid.uuid4()) for _ in range(200)]
+    with SessionLocal() as db:
+        db.execute(insert(Set), [
+            {"id": set_id, "primary_name": f"Set {n}", "status": SetStatus.ACTIVE}
+            for n, set_id in enumerate(ids)
+        ])
+        db.execute(insert(Member), [
+            {"id": str(uuid.uuid4()), "nicknames": [f"Member {n}"], "affiliation_type": AffiliationType.SET,
+             "set_id": ids[n % len(ids)]}
+            for n in range(2000)
+        ])
+        db.commit()
+    yield ids
+    Base.metadata.drop_all(bind=engine)
+
+
+def run_concurrently(call) -> list:
+    """
+    Await CONCURRENCY calls at once, each with its own session, on an event
+    loop in another thread so a loop blocked on a lock fails the test
+    instead of hanging it.
+    """
+    async def one():
+        async with AsyncSessionLocal() as db:
+            return await call(db)
+    
+    async def gather():
+        return await asyncio.gather(*(one() for _ in range(CONCURRENCY)))
+    
+    results = []
+    thread = threading.Thread(target=lambda: results.extend(asyncio.run(gather())), daemon=True)
+    thread.start()
+    thread.join(TIMEOUT_SECONDS)
+    assert not thread.is_alive(), "event loop blocked during a concurrent index build"
+    return results
+
+
+def test_cold_neighborhood_calls_do_not_block_the_event_loop(set_ids, monkeypatch):
+    monkeypatch.setattr(graph, "graph_index", graph.GraphIndex())
+    results = run_concurrently(lambda db: graph_crud.get_neighborhood(db, set_ids[0], include_members=True))
+    assert all(result is not None and result["nodes"] for result in results)
+
+
+def test_cold_typeahead_searches_do_not_block_the_event_loop(set_ids, monkeypatch):
+    monkeypatch.setattr(typeahead, "typeahead_index", typeahead.TypeaheadIndex())
+    results = run_concurrently(lambda db: typeahead_crud.search_all(db, "set 1"))
+    assert all(hits and hits[0]["label"] == "Set 1" for hits in results)
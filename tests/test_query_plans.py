@@ -0,0 +1,7 @@
+"""Query-plan regression check (check_query_plans.py) as a pytest test."""
+import check_query_plans
+
+
+def test_no_unexpected_full_table_scans():
+    # The offending statements and their plans are in the captured output
+    assert check_query_plans.run_checks() == 0